@@ -0,0 +1,76 @@
+"""
+Micro-benchmark of the per-parameter cost of binding Decimal and UUID values
+with native ADO types versus the string fallback. Dates and times are always
+sent as strings, so they aren't compared.
+
+Run from a checkout:
+
+    python extras/benchmarks/bind_parameters.py
+
+On Windows with pywin32 installed, real ADODB.Command parameters are used.
+Elsewhere a plain Python stand-in is used, which only measures the Python
+side of the conversion.
+"""
+from __future__ import print_function
+
+import decimal
+import os
+import sys
+import timeit
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from django.conf import settings  # NOQA
+settings.configure()
+
+from sqlserver_ado import dbapi  # NOQA
+
+NUMBER = 20000
+
+VALUES = [
+    decimal.Decimal('12345.6789'),
+    decimal.Decimal('-0.00'),
+    uuid.UUID('12345678-1234-5678-1234-567812345678'),
+]
+
+
+class StandInParameter(object):
+    Name = 'p0'
+    Direction = dbapi.adParamInput
+    Size = 0
+    Value = None
+    Precision = 0
+    NumericScale = 0
+
+    def __init__(self, name, ado_type):
+        self.Type = ado_type
+
+
+def parameter_factory():
+    try:
+        import win32com.client
+    except ImportError:
+        return 'stand-in', StandInParameter
+    cmd = win32com.client.Dispatch('ADODB.Command')
+    return 'ADODB.Command', cmd.CreateParameter
+
+
+def main():
+    kind, create_parameter = parameter_factory()
+    print('Parameters: %s, %d iterations' % (kind, NUMBER))
+    print('%-20s %12s %12s' % ('type', 'string (us)', 'native (us)'))
+    for value in VALUES:
+        timings = []
+        for native in (False, True):
+            def bind():
+                p = create_parameter('p0', dbapi._ado_type(value, native))
+                dbapi._configure_parameter(p, value, native=native)
+
+            seconds = min(timeit.repeat(bind, number=NUMBER, repeat=3))
+            timings.append(seconds / NUMBER * 1e6)
+        print('%-20s %12.2f %12.2f' % (type(value).__name__, timings[0], timings[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark of the peak memory used by Cursor.fetchall() on a large result,
+reading the recordset with a single GetRows call versus in chunks.
+
+Run from a checkout with Python 3:
+
+    python extras/benchmarks/fetchall_memory.py [rows]
+
+A stand-in recordset is used, which creates new Python objects for every
+GetRows call, like the COM layer does. Peak memory is measured with
+tracemalloc and reported next to the size of the rows that fetchall returns.
+"""
+from __future__ import print_function
+
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from django.conf import settings  # NOQA
+settings.configure()
+
+from sqlserver_ado import dbapi  # NOQA
+
+ROWS = 1000000
+
+COLUMNS = [
+    ('id', dbapi.adInteger),
+    ('name', dbapi.adVarWChar),
+    ('amount', dbapi.adNumeric),
+    ('score', dbapi.adDouble),
+]
+
+
+class StandInField(object):
+    ActualSize = 0
+    DefinedSize = 0
+    Precision = 0
+    NumericScale = 0
+    Attributes = dbapi.adFldMayBeNull
+
+    def __init__(self, name, ado_type):
+        self.Name = name
+        self.Type = ado_type
+
+
+class StandInRecordset(object):
+    State = 1
+    BOF = False
+
+    def __init__(self, rows):
+        self.Fields = [StandInField(name, ado_type) for name, ado_type in COLUMNS]
+        self.rows = rows
+        self.position = 0
+
+    @property
+    def EOF(self):
+        return self.position >= self.rows
+
+    def GetRows(self, rows=-1):
+        start = self.position
+        stop = self.rows if rows == -1 else min(self.rows, start + rows)
+        self.position = stop
+        numbers = range(start, stop)
+        return (
+            tuple(numbers),
+            tuple('name %d' % i for i in numbers),
+            tuple('%d.25' % i for i in numbers),
+            tuple(i * 0.5 for i in numbers),
+        )
+
+
+class StandInConnection(object):
+    errorhandler = None
+    fetch_buffer_rows = 0
+
+
+def measure(rows, chunk_rows):
+    dbapi._fetchall_chunk_rows = chunk_rows
+    cursor = dbapi.Cursor(StandInConnection())
+    cursor._description_from_recordset(StandInRecordset(rows))
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.time()
+    results = cursor.fetchall()
+    seconds = time.time() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert len(results) == rows
+    return seconds, current, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else ROWS
+    print('%d rows of %d columns' % (rows, len(COLUMNS)))
+    print('%-16s %10s %14s %14s' % ('GetRows', 'seconds', 'result (MB)', 'peak (MB)'))
+    for label, chunk_rows in (('all rows', None), ('10000 rows', 10000)):
+        seconds, current, peak = measure(rows, chunk_rows)
+        print('%-16s %10.2f %14.1f %14.1f' % (label, seconds, current / 2.0 ** 20, peak / 2.0 ** 20))
+
+
+if __name__ == '__main__':
+    main()
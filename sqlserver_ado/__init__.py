@@ -1,6 +1,6 @@
-from __future__ import absolute_import, unicode_literals
-# following PEP 386
-__version__ = "1.11"
-
-from . import patches  # NOQA
-from . import expressions  # NOQA
+from __future__ import absolute_import, unicode_literals
+# following PEP 386
+__version__ = "1.11"
+
+from . import patches  # NOQA
+from . import expressions  # NOQA
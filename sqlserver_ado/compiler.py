@@ -1,168 +1,467 @@
-from __future__ import absolute_import, unicode_literals
-
-import re
-
-from django.db.models.sql import compiler
-
-# query_class returns the base class to use for Django queries.
-# The custom 'SqlServerQuery' class derives from django.db.models.sql.query.Query
-# which is passed in as "QueryClass" by Django itself.
-#
-# SqlServerQuery overrides:
-# ...insert queries to add "SET IDENTITY_INSERT" if needed.
-# ...select queries to emulate LIMIT/OFFSET for sliced queries.
-
-# Pattern to scan a column data type string and split the data type from any
-# constraints or other included parts of a column definition. Based upon
-# <column_definition> from http://msdn.microsoft.com/en-us/library/ms174979.aspx
-_re_data_type_terminator = re.compile(
-    r'\s*\b(?:' +
-    r'filestream|collate|sparse|not|null|constraint|default|identity|rowguidcol' +
-    r'|primary|unique|clustered|nonclustered|with|on|foreign|references|check' +
-    ')',
-    re.IGNORECASE,
-)
-
-
-_re_constant = re.compile(r'\s*\(?\s*\d+\s*\)?\s*')
-
-
-class SQLCompiler(compiler.SQLCompiler):
-
-    def as_sql(self, with_limits=True, with_col_aliases=False):
-        # Get out of the way if we're not a select query or there's no limiting involved.
-        has_limit_offset = with_limits and (self.query.low_mark or self.query.high_mark is not None)
-        try:
-            if not has_limit_offset:
-                # The ORDER BY clause is invalid in views, inline functions,
-                # derived tables, subqueries, and common table expressions,
-                # unless TOP or FOR XML is also specified.
-                setattr(self.query, '_mssql_ordering_not_allowed', with_col_aliases)
-
-            # let the base do its thing, but we'll handle limit/offset
-            sql, fields = super(SQLCompiler, self).as_sql(
-                with_limits=False,
-                with_col_aliases=with_col_aliases,
-            )
-
-            if has_limit_offset:
-                if ' order by ' not in sql.lower():
-                    # Must have an ORDER BY to slice using OFFSET/FETCH. If
-                    # there is none, use the first column, which is typically a
-                    # PK
-                    sql += ' ORDER BY 1'
-                sql += ' OFFSET %d ROWS' % (self.query.low_mark or 0)
-                if self.query.high_mark is not None:
-                    sql += ' FETCH NEXT %d ROWS ONLY' % (self.query.high_mark - self.query.low_mark)
-        finally:
-            if not has_limit_offset:
-                # remove in case query is ever reused
-                delattr(self.query, '_mssql_ordering_not_allowed')
-
-        return sql, fields
-
-    def get_ordering(self):
-        # The ORDER BY clause is invalid in views, inline functions,
-        # derived tables, subqueries, and common table expressions,
-        # unless TOP or FOR XML is also specified.
-        if getattr(self.query, '_mssql_ordering_not_allowed', False):
-            return (None, [], [])
-        return super(SQLCompiler, self).get_ordering()
-
-    def collapse_group_by(self, expressions, having):
-        expressions = super(SQLCompiler, self).collapse_group_by(expressions, having)
-        # MSSQL doesn't support having constants in the GROUP BY clause. Django
-        # does this for exists() queries that have GROUP BY.
-        return [x for x in expressions if not _re_constant.match(getattr(x, 'sql', ''))]
-
-
-class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
-    # search for after table/column list
-    _re_values_sub = re.compile(
-        r'(?P<prefix>\)|\])(?P<default>\s*|\s*default\s*)values(?P<suffix>\s*|\s+\()?',
-        re.IGNORECASE
-    )
-    # ... and insert the OUTPUT clause between it and the values list (or DEFAULT VALUES).
-    _values_repl = r'\g<prefix> OUTPUT INSERTED.{col} INTO @sqlserver_ado_return_id\g<default>VALUES\g<suffix>'
-
-    def as_sql(self, *args, **kwargs):
-        # Fix for Django ticket #14019
-        if not hasattr(self, 'return_id'):
-            self.return_id = False
-
-        result = super(SQLInsertCompiler, self).as_sql(*args, **kwargs)
-        return [self._fix_insert(x[0], x[1]) for x in result]
-
-    def _fix_insert(self, sql, params):
-        """
-        Wrap the passed SQL with IDENTITY_INSERT statements and apply
-        other necessary fixes.
-        """
-        meta = self.query.get_meta()
-
-        if meta.has_auto_field:
-            if hasattr(self.query, 'fields'):
-                # django 1.4 replaced columns with fields
-                fields = self.query.fields
-                auto_field = meta.auto_field
-            else:
-                # < django 1.4
-                fields = self.query.columns
-                auto_field = meta.auto_field.db_column or meta.auto_field.column
-
-            auto_in_fields = auto_field in fields
-
-            quoted_table = self.connection.ops.quote_name(meta.db_table)
-            if not fields or (auto_in_fields and len(fields) == 1 and not params):
-                # convert format when inserting only the primary key without
-                # specifying a value
-                sql = 'INSERT INTO {0} DEFAULT VALUES'.format(
-                    quoted_table
-                )
-                params = []
-            elif auto_in_fields:
-                # wrap with identity insert
-                sql = 'SET IDENTITY_INSERT {table} ON;{sql};SET IDENTITY_INSERT {table} OFF'.format(
-                    table=quoted_table,
-                    sql=sql,
-                )
-
-        # mangle SQL to return ID from insert
-        # http://msdn.microsoft.com/en-us/library/ms177564.aspx
-        if self.return_id and self.connection.features.can_return_id_from_insert:
-            col = self.connection.ops.quote_name(meta.pk.db_column or meta.pk.get_attname())
-
-            # Determine datatype for use with the table variable that will return the inserted ID
-            pk_db_type = _re_data_type_terminator.split(meta.pk.db_type(self.connection))[0]
-
-            # NOCOUNT ON to prevent additional trigger/stored proc related resultsets
-            sql = 'SET NOCOUNT ON;{declare_table_var};{sql};{select_return_id}'.format(
-                sql=sql,
-                declare_table_var="DECLARE @sqlserver_ado_return_id table ({col_name} {pk_type})".format(
-                    col_name=col,
-                    pk_type=pk_db_type,
-                ),
-                select_return_id="SELECT * FROM @sqlserver_ado_return_id",
-            )
-
-            output = self._values_repl.format(col=col)
-            sql = self._re_values_sub.sub(output, sql)
-
-        return sql, params
-
-
-class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
-    pass
-
-
-class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
-    def as_sql(self):
-        sql, params = super(SQLUpdateCompiler, self).as_sql()
-        if sql:
-            # Need the NOCOUNT OFF so UPDATE returns a count, instead of -1
-            sql = 'SET NOCOUNT OFF; {0}; SET NOCOUNT ON'.format(sql)
-        return sql, params
-
-
-class SQLAggregateCompiler(compiler.SQLAggregateCompiler, SQLCompiler):
-    pass
+from __future__ import absolute_import, unicode_literals
+
+import re
+
+from django.db import DatabaseError
+from django.db.models import AutoField, Value
+from django.db.models.sql import compiler
+from django.db.models.sql.constants import MULTI
+from django.db.models.sql.datastructures import BaseTable, Join
+
+# query_class returns the base class to use for Django queries.
+# The custom 'SqlServerQuery' class derives from django.db.models.sql.query.Query
+# which is passed in as "QueryClass" by Django itself.
+#
+# SqlServerQuery overrides:
+# ...insert queries to add "SET IDENTITY_INSERT" if needed.
+# ...select queries to emulate LIMIT/OFFSET for sliced queries.
+
+# Pattern to scan a column data type string and split the data type from any
+# constraints or other included parts of a column definition. Based upon
+# <column_definition> from http://msdn.microsoft.com/en-us/library/ms174979.aspx
+_re_data_type_terminator = re.compile(
+    r'\s*\b(?:' +
+    r'filestream|collate|sparse|not|null|constraint|default|identity|rowguidcol' +
+    r'|primary|unique|clustered|nonclustered|with|on|foreign|references|check' +
+    ')',
+    re.IGNORECASE,
+)
+
+
+_re_constant = re.compile(r'\s*\(?\s*\d+\s*\)?\s*')
+
+# The start of a SELECT statement, before which TOP goes.
+_re_select = re.compile(r'^SELECT\s+(?:DISTINCT\s+)?', re.IGNORECASE)
+
+
+# Query.context keys of the hints added by SqlServerQuerySet.with_hints().
+# The context is copied when a query is cloned.
+TABLE_HINTS = 'sqlserver_ado_table_hints'
+OPTION_HINTS = 'sqlserver_ado_option_hints'
+
+
+class SQLCompiler(compiler.SQLCompiler):
+    # Set by execute_sql. The OPTION clause is only valid at the end of the
+    # statement, so it is never added to subqueries.
+    _executing = False
+
+    def as_sql(self, with_limits=True, with_col_aliases=False):
+        # Get out of the way if we're not a select query or there's no limiting involved.
+        has_limit_offset = with_limits and (self.query.low_mark or self.query.high_mark is not None)
+        try:
+            if not has_limit_offset:
+                # The ORDER BY clause is invalid in views, inline functions,
+                # derived tables, subqueries, and common table expressions,
+                # unless TOP or FOR XML is also specified.
+                setattr(self.query, '_mssql_ordering_not_allowed', with_col_aliases)
+
+            # let the base do its thing, but we'll handle limit/offset
+            sql, params = super(SQLCompiler, self).as_sql(
+                with_limits=False,
+                with_col_aliases=with_col_aliases,
+            )
+
+            uses_offset = False
+            if self._use_top(sql, with_limits):
+                # Without an ORDER BY, TOP avoids the sort that ORDER BY 1
+                # would add for OFFSET/FETCH. Like those bounds, the limit is
+                # a parameter, which comes before all others in the SELECT.
+                sql = _re_select.sub(lambda m: m.group(0) + 'TOP (%s) ', sql, count=1)
+                params = (self.query.high_mark,) + tuple(params)
+            elif has_limit_offset:
+                uses_offset = True
+                if ' order by ' not in sql.lower():
+                    # Must have an ORDER BY to slice using OFFSET/FETCH. If
+                    # there is none, use the first column, which is typically a
+                    # PK
+                    sql += ' ORDER BY 1'
+                # Pass the bounds as parameters, so that all pages share a plan
+                sql += ' OFFSET %s ROWS'
+                params += (self.query.low_mark or 0,)
+                if self.query.high_mark is not None:
+                    sql += ' FETCH NEXT %s ROWS ONLY'
+                    params += (self.query.high_mark - self.query.low_mark,)
+
+            options = self._option_hints(uses_offset)
+            if options:
+                sql += ' OPTION (%s)' % ', '.join(options)
+        finally:
+            if not has_limit_offset:
+                # remove in case query is ever reused
+                delattr(self.query, '_mssql_ordering_not_allowed')
+
+        return sql, params
+
+    def _option_hints(self, uses_offset):
+        """The query hints of the OPTION clause of the executed statement."""
+        if not self._executing:
+            return []
+        options = list(self.query.context.get(OPTION_HINTS, ()))
+        if (uses_offset and self.connection.optimize_paging_for_unknown and
+                'OPTIMIZE FOR UNKNOWN' not in (o.upper() for o in options)):
+            options.append('OPTIMIZE FOR UNKNOWN')
+        return options
+
+    def compile(self, node, select_format=False):
+        sql, params = super(SQLCompiler, self).compile(node, select_format)
+        if isinstance(node, (BaseTable, Join)):
+            hints = []
+            # Skip a hint that with_hints() repeats, such as UPDLOCK of
+            # dequeue() on a select_for_update() queryset.
+            for hint in self.query.context.get(TABLE_HINTS, {}).get(node.table_name, ()) + self._lock_hints():
+                if hint.upper() not in (h.upper() for h in hints):
+                    hints.append(hint)
+            if hints:
+                # The hints follow the table name and alias
+                table = self.quote_name_unless_alias(node.table_name)
+                if node.table_alias != node.table_name:
+                    table += ' ' + node.table_alias
+                end = sql.index(table) + len(table)
+                sql = '%s WITH (%s)%s' % (sql[:end], ', '.join(hints), sql[end:])
+        return sql, params
+
+    def _lock_hints(self):
+        """The table hints of select_for_update()."""
+        query = self.query
+        if not query.select_for_update:
+            return ()
+        hints = ('UPDLOCK', 'ROWLOCK')
+        if query.select_for_update_skip_locked:
+            hints += ('READPAST',)
+        elif query.select_for_update_nowait:
+            hints += ('NOWAIT',)
+        return hints
+
+    def _use_top(self, sql, with_limits):
+        """
+        Whether the query is limited with TOP instead of OFFSET/FETCH, which
+        is the case for a slice from the first row of a query that isn't
+        ordered.
+        """
+        return bool(
+            with_limits and not self.query.low_mark and self.query.high_mark is not None and
+            not self.query.combinator and ' order by ' not in sql.lower()
+        )
+
+    def execute_sql(self, result_type=MULTI, chunked_fetch=False):
+        self._executing = True
+        if not chunked_fetch:
+            return super(SQLCompiler, self).execute_sql(result_type, chunked_fetch)
+        # Stream with the chunk size given to SqlServerQuerySet.iterator(), if
+        # any. The cursor is created and executed before this returns.
+        self.connection.stream_chunk_size = getattr(self.query, 'stream_chunk_size', None)
+        try:
+            return super(SQLCompiler, self).execute_sql(result_type, chunked_fetch)
+        finally:
+            self.connection.stream_chunk_size = None
+
+    def get_ordering(self):
+        # The ORDER BY clause is invalid in views, inline functions,
+        # derived tables, subqueries, and common table expressions,
+        # unless TOP or FOR XML is also specified.
+        if getattr(self.query, '_mssql_ordering_not_allowed', False):
+            return (None, [], [])
+        return super(SQLCompiler, self).get_ordering()
+
+    def collapse_group_by(self, expressions, having):
+        expressions = super(SQLCompiler, self).collapse_group_by(expressions, having)
+        # MSSQL doesn't support having constants in the GROUP BY clause. Django
+        # does this for exists() queries that have GROUP BY.
+        return [x for x in expressions if not _re_constant.match(getattr(x, 'sql', ''))]
+
+
+class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
+    # search for after table/column list
+    _re_values_sub = re.compile(
+        r'(?P<prefix>\)|\])(?P<default>\s*|\s*default\s*)values(?P<suffix>\s*|\s+\()?',
+        re.IGNORECASE
+    )
+    # ... and insert the OUTPUT clause between it and the values list (or DEFAULT VALUES).
+    _values_repl = r'\g<prefix> OUTPUT INSERTED.{col} INTO @sqlserver_ado_return_id\g<default>VALUES\g<suffix>'
+    # ... or between it and the values list, for tables without triggers.
+    _direct_values_repl = r'\g<prefix> OUTPUT INSERTED.{col}\g<default>VALUES\g<suffix>'
+
+    def as_sql(self, *args, **kwargs):
+        # Fix for Django ticket #14019
+        if not hasattr(self, 'return_id'):
+            self.return_id = False
+
+        if self._returns_ids():
+            return [self._fix_insert(*self._as_merge_sql(), merge=True)]
+
+        result = super(SQLInsertCompiler, self).as_sql(*args, **kwargs)
+        return [self._fix_insert(x[0], x[1]) for x in result]
+
+    def execute_sql(self, return_id=False):
+        try:
+            return super(SQLInsertCompiler, self).execute_sql(return_id)
+        except DatabaseError:
+            if not (return_id and self.connection.ops.triggers_created(self.query.get_meta().db_table)):
+                raise
+        # Retry with OUTPUT INTO a table variable
+        return super(SQLInsertCompiler, self).execute_sql(return_id)
+
+    def as_upsert_sql(self, unique_fields, update_fields, return_id=False):
+        """
+        Create a MERGE statement that updates update_fields of the rows that
+        match an object on unique_fields, and inserts the other objects. With
+        return_id, the primary keys of the updated and inserted rows are
+        selected in the order of the objects. Otherwise the row count is that
+        of the merged rows.
+        """
+        self.return_id = return_id
+        sql, params = self._fix_insert(
+            *self._as_merge_sql(unique_fields, update_fields), merge=True)
+        if not return_id:
+            # Need the NOCOUNT OFF so MERGE returns a count, instead of -1
+            sql = 'SET NOCOUNT OFF; {0}; SET NOCOUNT ON'.format(sql)
+        return sql, params
+
+    def _returns_ids(self):
+        """Whether the primary keys of more than one object are returned."""
+        return bool(self.return_id and len(self.query.objs) > 1 and
+            self.connection.features.can_return_ids_from_bulk_insert)
+
+    def as_update_sql(self):
+        """
+        Create an UPDATE statement that joins the table to the values of the
+        objects on the primary key, which is the first of the fields, and
+        sets the other fields of each row to the object's values.
+        """
+        qn = self.connection.ops.quote_name
+        opts = self.query.get_meta()
+        pk, update_fields = self.query.fields[0], self.query.fields[1:]
+        source, params, source_fields = self._as_values_source([pk])
+        sql = (
+            'UPDATE [sqlserver_ado_target] SET {assignments} '
+            'FROM {table} AS [sqlserver_ado_target] INNER JOIN {source} '
+            'ON [sqlserver_ado_target].{pk} = [sqlserver_ado_source].{pk}'
+        ).format(
+            assignments=', '.join(
+                '{0} = {1}'.format(qn(f.column), self._source_value(f, source_fields))
+                for f in update_fields
+            ),
+            table=qn(opts.db_table),
+            source=source,
+            pk=qn(pk.column),
+        )
+        # Need the NOCOUNT OFF so UPDATE returns a count, instead of -1
+        return 'SET NOCOUNT OFF; {0}; SET NOCOUNT ON'.format(sql), params
+
+    def _as_values_source(self, key_fields, row_numbers=False):
+        """
+        Create a VALUES table constructor of the objects, named
+        [sqlserver_ado_source]. Returns its SQL, the params and the fields
+        that are columns of it. A column of only NULLs would have the int data
+        type, which can't be converted to all data types, so such fields are
+        left out unless they are key_fields. With row_numbers, the position of
+        each object is added as the [sqlserver_ado_row] column.
+        """
+        qn = self.connection.ops.quote_name
+        fields = self.query.fields
+        objs = self.query.objs
+
+        value_rows = [
+            [self.prepare_value(field, self.pre_save_val(field, obj)) for field in fields]
+            for obj in objs
+        ]
+        source = [
+            i for i, field in enumerate(fields)
+            if field in key_fields or any(row[i] is not None for row in value_rows)
+        ]
+        source_fields = [fields[i] for i in source]
+        columns = [qn(f.column) for f in source_fields]
+
+        if source_fields:
+            placeholder_rows, param_rows = self.assemble_as_sql(
+                source_fields, [[row[i] for i in source] for row in value_rows])
+        else:
+            placeholder_rows = param_rows = [[] for obj in objs]
+        if row_numbers:
+            placeholder_rows = [
+                list(placeholders) + [str(i)] for i, placeholders in enumerate(placeholder_rows)
+            ]
+            columns.append('[sqlserver_ado_row]')
+
+        sql = '(VALUES {rows}) AS [sqlserver_ado_source] ({columns})'.format(
+            rows=', '.join('(%s)' % ', '.join(placeholders) for placeholders in placeholder_rows),
+            columns=', '.join(columns),
+        )
+        return sql, tuple(p for ps in param_rows for p in ps), source_fields
+
+    def _source_value(self, field, source_fields):
+        if field in source_fields:
+            return '[sqlserver_ado_source].' + self.connection.ops.quote_name(field.column)
+        return 'NULL'
+
+    def _as_merge_sql(self, unique_fields=(), update_fields=()):
+        """
+        Create a MERGE statement that inserts all of the objects, or only
+        those that don't match a row on unique_fields. Unlike the OUTPUT
+        clause of INSERT, the OUTPUT clause of MERGE can refer to the source
+        rows, so each primary key is output with the position of its object.
+        _fix_insert declares the table variable and selects the keys.
+        """
+        qn = self.connection.ops.quote_name
+        opts = self.query.get_meta()
+        fields = self.query.fields
+        source, params, source_fields = self._as_values_source(unique_fields, row_numbers=True)
+
+        if unique_fields:
+            merge = 'MERGE INTO {table} WITH (HOLDLOCK) AS [sqlserver_ado_target]'
+            condition = ' AND '.join(
+                '[sqlserver_ado_target].{0} = [sqlserver_ado_source].{0}'.format(qn(f.column))
+                for f in unique_fields
+            )
+        else:
+            merge = 'MERGE INTO {table}'
+            condition = '1 = 0'
+
+        sql = [
+            merge.format(table=qn(opts.db_table)),
+            'USING {source} ON {condition}'.format(source=source, condition=condition),
+        ]
+        if update_fields:
+            sql.append('WHEN MATCHED THEN UPDATE SET {0}'.format(', '.join(
+                '{0} = {1}'.format(qn(f.column), self._source_value(f, source_fields))
+                for f in update_fields
+            )))
+        elif unique_fields and self.return_id:
+            # Matched rows are only output when they are updated, so set a
+            # column to its own value to return their keys.
+            noop = [f for f in fields if not isinstance(f, AutoField)][:1]
+            if noop:
+                sql.append('WHEN MATCHED THEN UPDATE SET {0} = [sqlserver_ado_target].{0}'.format(
+                    qn(noop[0].column)))
+        if fields:
+            sql.append('WHEN NOT MATCHED THEN INSERT ({columns}) VALUES ({values})'.format(
+                columns=', '.join(qn(f.column) for f in fields),
+                values=', '.join(self._source_value(f, source_fields) for f in fields),
+            ))
+        else:
+            sql.append('WHEN NOT MATCHED THEN INSERT DEFAULT VALUES')
+        if self.return_id:
+            sql.append(
+                'OUTPUT INSERTED.{pk}, [sqlserver_ado_source].[sqlserver_ado_row] '
+                'INTO @sqlserver_ado_return_id'.format(pk=qn(opts.pk.column))
+            )
+        return ' '.join(sql), params
+
+    def prepare_value(self, field, value):
+        value = super(SQLInsertCompiler, self).prepare_value(field, value)
+        # Bind strings for varchar columns as varchar
+        return self.connection.ops.field_params(field, [value])[0]
+
+    def _fix_insert(self, sql, params, merge=False):
+        """
+        Wrap the passed SQL with IDENTITY_INSERT statements and apply
+        other necessary fixes.
+        """
+        meta = self.query.get_meta()
+
+        if meta.has_auto_field:
+            if hasattr(self.query, 'fields'):
+                # django 1.4 replaced columns with fields
+                fields = self.query.fields
+                auto_field = meta.auto_field
+            else:
+                # < django 1.4
+                fields = self.query.columns
+                auto_field = meta.auto_field.db_column or meta.auto_field.column
+
+            auto_in_fields = auto_field in fields
+
+            quoted_table = self.connection.ops.quote_name(meta.db_table)
+            # MERGE already inserts DEFAULT VALUES for each object
+            if not merge and (not fields or (auto_in_fields and len(fields) == 1 and not params)):
+                # convert format when inserting only the primary key without
+                # specifying a value
+                sql = 'INSERT INTO {0} DEFAULT VALUES'.format(
+                    quoted_table
+                )
+                params = []
+            elif auto_in_fields:
+                # wrap with identity insert
+                sql = 'SET IDENTITY_INSERT {table} ON;{sql};SET IDENTITY_INSERT {table} OFF'.format(
+                    table=quoted_table,
+                    sql=sql,
+                )
+
+        # mangle SQL to return ID from insert
+        # http://msdn.microsoft.com/en-us/library/ms177564.aspx
+        if self.return_id and self.connection.features.can_return_id_from_insert:
+            col = self.connection.ops.quote_name(meta.pk.db_column or meta.pk.get_attname())
+
+            # Determine datatype for use with the table variable that will return the inserted ID
+            pk_db_type = _re_data_type_terminator.split(meta.pk.db_type(self.connection))[0]
+
+            if merge:
+                # The MERGE statement outputs the keys with the position of
+                # their object, to return them in the order of the objects.
+                sql = 'SET NOCOUNT ON;{declare_table_var};{sql};{select_return_id}'.format(
+                    sql=sql,
+                    declare_table_var=(
+                        "DECLARE @sqlserver_ado_return_id table ({col_name} {pk_type}, [sqlserver_ado_row] int)"
+                    ).format(
+                        col_name=col,
+                        pk_type=pk_db_type,
+                    ),
+                    select_return_id=(
+                        "SELECT {col_name} FROM @sqlserver_ado_return_id ORDER BY [sqlserver_ado_row]"
+                    ).format(
+                        col_name=col,
+                    ),
+                )
+                return sql, params
+
+            if not self.connection.ops.has_triggers(meta.db_table):
+                # Return the ID to the client directly, without a table
+                # variable, which triggers would require.
+                output = self._direct_values_repl.format(col=col)
+                return self._re_values_sub.sub(output, sql), params
+
+            # NOCOUNT ON to prevent additional trigger/stored proc related resultsets
+            sql = 'SET NOCOUNT ON;{declare_table_var};{sql};{select_return_id}'.format(
+                sql=sql,
+                declare_table_var="DECLARE @sqlserver_ado_return_id table ({col_name} {pk_type})".format(
+                    col_name=col,
+                    pk_type=pk_db_type,
+                ),
+                select_return_id="SELECT * FROM @sqlserver_ado_return_id",
+            )
+
+            output = self._values_repl.format(col=col)
+            sql = self._re_values_sub.sub(output, sql)
+
+        return sql, params
+
+
+class SQLDeleteCompiler(compiler.SQLDeleteCompiler, SQLCompiler):
+    pass
+
+
+class SQLUpdateCompiler(compiler.SQLUpdateCompiler, SQLCompiler):
+    def as_sql(self):
+        # Bind strings for varchar columns as varchar. The values are
+        # prepared here, so that field_params gets the prepared value as it
+        # does for inserts, and passed on as expressions that aren't prepared
+        # again. NULL is written as a literal.
+        field_params = self.connection.ops.field_params
+        values = []
+        for field, model, val in self.query.values:
+            if not (hasattr(val, 'resolve_expression') or hasattr(val, 'prepare_database_save') or
+                    hasattr(field, 'get_placeholder')):
+                val = field.get_db_prep_save(val, connection=self.connection)
+                if val is not None:
+                    val = Value(field_params(field, [val])[0])
+            values.append((field, model, val))
+        self.query.values = values
+        sql, params = super(SQLUpdateCompiler, self).as_sql()
+        if sql:
+            # Need the NOCOUNT OFF so UPDATE returns a count, instead of -1
+            sql = 'SET NOCOUNT OFF; {0}; SET NOCOUNT ON'.format(sql)
+        return sql, params
+
+
+class SQLAggregateCompiler(compiler.SQLAggregateCompiler, SQLCompiler):
+    pass
@@ -1,874 +1,1708 @@
-"""A DB API 2.0 interface to SQL Server for Django
-
-Forked from: adodbapi v2.1
-Copyright (C) 2002 Henrik Ekelund, version 2.1 by Vernon Cole
-* http://adodbapi.sourceforge.net/
-* http://sourceforge.net/projects/pywin32/
-
-This library is free software; you can redistribute it and/or
-modify it under the terms of the GNU Lesser General Public
-License as published by the Free Software Foundation; either
-version 2.1 of the License, or (at your option) any later version.
-
-This library is distributed in the hope that it will be useful,
-but WITHOUT ANY WARRANTY; without even the implied warranty of
-MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
-Lesser General Public License for more details.
-
-You should have received a copy of the GNU Lesser General Public
-License along with this library; if not, write to the Free Software
-Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
-
-* Version 2.1D by Adam Vandenberg, forked for Django backend use.
-  This module is a db-api 2 interface for ADO, but is Django & SQL Server.
-  It won't work against other ADO sources (like Access.)
-
-DB-API 2.0 specification: http://www.python.org/dev/peps/pep-0249/
-"""
-from __future__ import absolute_import, unicode_literals
-
-import time
-import datetime
-import re
-import uuid
-
-import decimal
-
-from pprint import pformat
-
-from django.conf import settings
-from django.db.utils import (IntegrityError as DjangoIntegrityError,
-    DatabaseError as DjangoDatabaseError)
-
-from django.utils import six
-from django.utils import timezone
-
-from .ado_consts import (adBigInt, adBinary, adBoolean, adBSTR, adChapter,
-    adChar, adCmdStoredProc, adCmdText, adCurrency, adDate, adDBDate, adDBTime,
-    adDBTimeStamp, adDecimal, adDouble, adError, adFileTime, adFldMayBeNull,
-    adGUID, adInteger, adLongVarBinary, adLongVarChar, adLongVarWChar,
-    adNumeric, ado_error_TIMEOUT, ado_type_name, adoErrors, adParamInput,
-    adParamInputOutput, adParamUnknown, adSingle, adSmallInt, adStateClosed,
-    adTinyInt, adTypeNames, adUnsignedBigInt, adUnsignedInt, adUnsignedSmallInt,
-    adUnsignedTinyInt, adUseServer, adVarBinary, adVarChar, adVarNumeric,
-    adVarWChar, adWChar, adXactAbortRetaining, adXactCommitRetaining,
-    adXactReadCommitted)
-
-# DB API default values
-apilevel = '2.0'
-
-# 1: Threads may share the module, but not connections.
-threadsafety = 1
-
-# The underlying ADO library expects parameters as '?', but this wrapper
-# expects '%s' parameters. This wrapper takes care of the conversion.
-paramstyle = 'format'
-
-# Set defaultIsolationLevel on module level before creating the connection.
-# It may be one of "adXact..." consts.
-defaultIsolationLevel = adXactReadCommitted
-
-# Set defaultCursorLocation on module level before creating the connection.
-# It may be one of the "adUse..." consts.
-defaultCursorLocation = adUseServer
-
-# Used for COM to Python date conversions.
-_ordinal_1899_12_31 = datetime.date(1899, 12, 31).toordinal() - 1
-_milliseconds_per_day = 24 * 60 * 60 * 1000
-
-
-class MultiMap(object):
-    def __init__(self, mapping, default=None):
-        """Defines a mapping with multiple keys per value.
-
-        mapping is a dict of: tuple(key, key, key...) => value
-        """
-        self.storage = dict()
-        self.default = default
-
-        for keys, value in six.iteritems(mapping):
-            for key in keys:
-                self.storage[key] = value
-
-    def __getitem__(self, key):
-        return self.storage.get(key, self.default)
-
-
-def standardErrorHandler(connection, cursor, errorclass, errorvalue):
-    err = (errorclass, errorvalue)
-    if connection is not None:
-        connection.messages.append(err)
-    if cursor is not None:
-        cursor.messages.append(err)
-    raise errorclass(errorvalue)
-
-
-class Error(Exception if six.PY3 else StandardError):
-    pass
-
-
-class Warning(Exception if six.PY3 else StandardError):
-    pass
-
-
-class InterfaceError(Error):
-    pass
-
-
-class DatabaseError(DjangoDatabaseError, Error):
-    pass
-
-
-class InternalError(DatabaseError):
-    pass
-
-
-class OperationalError(DatabaseError):
-    pass
-
-
-class ProgrammingError(DatabaseError):
-    pass
-
-
-class IntegrityError(DatabaseError, DjangoIntegrityError):
-    pass
-
-
-class DataError(DatabaseError):
-    pass
-
-
-class NotSupportedError(DatabaseError):
-    pass
-
-
-class FetchFailedError(Error):
-    """
-    Error is used by RawStoredProcedureQuerySet to determine when a fetch
-    failed due to a connection being closed or there is no record set
-    returned.
-    """
-    pass
-
-
-class _DbType(object):
-    def __init__(self, valuesTuple):
-        self.values = valuesTuple
-
-    def __eq__(self, other):
-        return other in self.values
-
-    def __ne__(self, other):
-        return other not in self.values
-
-_re_find_password = re.compile('(pwd|password)=[^;]*;', re.IGNORECASE)
-
-
-def mask_connection_string_password(s, mask='******'):
-    """
-    Look for a connection string password in 's' and mask it.
-    """
-    return re.sub(_re_find_password, '\g<1>=%s;' % mask, s)
-
-
-def connect(connection_string, timeout=30, use_transactions=None):
-    """Connect to a database.
-
-    connection_string -- An ADODB formatted connection string, see:
-        http://www.connectionstrings.com/?carrier=sqlserver2005
-    timeout -- A command timeout value, in seconds (default 30 seconds)
-    """
-    # Inner imports to make this module importable on non-Windows platforms.
-    import pythoncom
-    import win32com.client
-    try:
-        pythoncom.CoInitialize()
-        c = win32com.client.Dispatch('ADODB.Connection')
-        c.CommandTimeout = timeout
-        c.ConnectionString = connection_string
-        c.Open()
-        if use_transactions is None:
-            useTransactions = _use_transactions(c)
-        else:
-            useTransactions = use_transactions
-        return Connection(c, useTransactions)
-    except Exception as e:
-        raise OperationalError(e,
-            "Error opening connection: {0}".format(
-                mask_connection_string_password(connection_string)
-            )
-        )
-
-
-def _use_transactions(c):
-    """Return True if the given ADODB.Connection supports transactions."""
-    for prop in c.Properties:
-        if prop.Name == 'Transaction DDL':
-            return prop.Value > 0
-    return False
-
-
-def format_parameters(parameters, show_value=False):
-    """
-    Format a collection of ADO Command Parameters.
-
-    Used by error reporting in _execute_command.
-    """
-    directions = {
-        0: 'Unknown',
-        1: 'Input',
-        2: 'Output',
-        3: 'In/Out',
-        4: 'Return',
-    }
-
-    if show_value:
-        desc = [
-            "Name: %s, Dir.: %s, Type: %s, Size: %s, Value: \"%s\", Precision: %s, NumericScale: %s" %
-                (p.Name, directions[p.Direction], adTypeNames.get(p.Type, str(p.Type) + ' (unknown type)'),
-                 p.Size, p.Value, p.Precision, p.NumericScale)
-            for p in parameters
-        ]
-    else:
-        desc = [
-            "Name: %s, Dir.: %s, Type: %s, Size: %s, Precision: %s, NumericScale: %s" %
-                (p.Name, directions[p.Direction], adTypeNames.get(p.Type, str(p.Type) + ' (unknown type)'),
-                 p.Size, p.Precision, p.NumericScale)
-            for p in parameters
-        ]
-
-    return pformat(desc)
-    # return '[' + ', '.join(desc) + ']'
-
-
-def format_decimal_as_string(value):
-    """
-    Convert a decimal.Decimal to a fixed point string. Code borrowed from
-    Python's moneyfmt recipe.
-    https://docs.python.org/2/library/decimal.html#recipes
-    """
-    sign, digits, exp = value.as_tuple()
-    if exp > 0:
-        # Handle Decimals like '2.82E+3'
-        return "%d" % value
-    result = []
-    digits = list(map(str, digits))
-    build, next = result.append, digits.pop
-    for i in range(-exp):
-        build(next() if digits else '0')
-    build('.')
-    if not digits:
-        build('0')
-    while digits:
-        build(next())
-    if sign:
-        build('-')
-    return ''.join(reversed(result))
-
-
-def _configure_parameter(p, value):
-    """Configure the given ADO Parameter 'p' with the Python 'value'."""
-    if p.Direction not in [adParamInput, adParamInputOutput, adParamUnknown]:
-        return
-
-    if isinstance(value, six.string_types):
-        p.Value = value
-        p.Size = len(value)
-
-    elif isinstance(value, six.memoryview):
-        p.Size = len(value)
-        p.AppendChunk(value)
-
-    elif isinstance(value, decimal.Decimal):
-        p.Type = adBSTR
-        p.Value = format_decimal_as_string(value)
-
-    elif isinstance(value, datetime.datetime):
-        p.Type = adBSTR
-        if timezone.is_aware(value):
-            value = timezone.make_naive(value, timezone.utc)
-        # Strip '-' so SQL Server parses as YYYYMMDD for all languages/formats
-        s = value.isoformat(' ' if six.PY3 else b' ').replace('-', '')
-        p.Value = s
-        p.Size = len(s)
-
-    elif isinstance(value, (datetime.time, datetime.date)):
-        p.Type = adBSTR
-        s = value.isoformat()
-        p.Value = s
-        p.Size = len(s)
-
-    elif isinstance(value, uuid.UUID):
-        p.Type = adBSTR
-        s = str(value)
-        p.Value = s
-        p.Size = len(s)
-
-    else:
-        # For any other type, set the value and let pythoncom do the right thing.
-        p.Value = value
-
-    # Use -1 instead of 0 for empty strings and buffers
-    if p.Size == 0:
-        p.Size = -1
-
-
-class Connection(object):
-    def __init__(self, adoConn, useTransactions=False):
-        self.adoConn = adoConn
-        self.errorhandler = None
-        self.messages = []
-        self.adoConn.CursorLocation = defaultCursorLocation
-        self.supportsTransactions = useTransactions
-        self.transaction_level = 0 # 0 == Not in a transaction, at the top level
-
-        if self.supportsTransactions:
-            self.adoConn.IsolationLevel = defaultIsolationLevel
-            self.transaction_level = self.adoConn.BeginTrans() # Disables autocommit per DBPAI
-
-    def set_autocommit(self, value):
-        if self.supportsTransactions == (not value):
-            return
-        if self.supportsTransactions:
-            self.transaction_level = self.adoConn.RollbackTrans() # Disables autocommit per DBPAI
-        else:
-            self.adoConn.IsolationLevel = defaultIsolationLevel
-            self.transaction_level = self.adoConn.BeginTrans() # Disables autocommit per DBPAI
-        self.supportsTransactions = not value
-
-    def _raiseConnectionError(self, errorclass, errorvalue):
-        eh = self.errorhandler
-        if eh is None:
-            eh = standardErrorHandler
-        eh(self, None, errorclass, errorvalue)
-
-    def _close_connection(self):
-        """Close the underlying ADO Connection object, rolling back an active transaction if supported."""
-        if self.supportsTransactions:
-            self.transaction_level = self.adoConn.RollbackTrans()
-        self.adoConn.Close()
-
-    def close(self):
-        """Close the database connection."""
-        self.messages = []
-        try:
-            self._close_connection()
-        except Exception as e:
-            self._raiseConnectionError(InternalError, e)
-        self.adoConn = None
-        # Inner import to make this module importable on non-Windows platforms.
-        import pythoncom
-        pythoncom.CoUninitialize()
-
-    def commit(self):
-        """Commit a pending transaction to the database.
-
-        Note that if the database supports an auto-commit feature, this must
-        be initially off.
-        """
-        self.messages = []
-        if not self.supportsTransactions:
-            return
-
-        try:
-            self.transaction_level = self.adoConn.CommitTrans()
-            if not(self.adoConn.Attributes & adXactCommitRetaining):
-                # If attributes has adXactCommitRetaining it performs retaining commits that is,
-                # calling CommitTrans automatically starts a new transaction. Not all providers support this.
-                # If not, we will have to start a new transaction by this command:
-                self.adoConn.BeginTrans()
-        except Exception as e:
-            self._raiseConnectionError(Error, e)
-
-    def rollback(self):
-        """Abort a pending transaction."""
-        self.messages = []
-        with self.cursor() as cursor:
-            cursor.execute("select @@TRANCOUNT")
-            trancount, = cursor.fetchone()
-        if trancount == 0:
-            return
-        self.transaction_level = self.adoConn.RollbackTrans()
-        if not(self.adoConn.Attributes & adXactAbortRetaining):
-            # If attributes has adXactAbortRetaining it performs retaining aborts that is,
-            # calling RollbackTrans automatically starts a new transaction. Not all providers support this.
-            # If not, we will have to start a new transaction by this command:
-            self.transaction_level = self.adoConn.BeginTrans()
-
-    def cursor(self):
-        """Return a new Cursor object using the current connection."""
-        self.messages = []
-        return Cursor(self)
-
-    def printADOerrors(self):
-        print('ADO Errors (%i):' % self.adoConn.Errors.Count)
-        for e in self.adoConn.Errors:
-            print('Description: %s' % e.Description)
-            print('Error: %s %s ' % (e.Number, adoErrors.get(e.Number, "unknown")))
-            if e.Number == ado_error_TIMEOUT:
-                print('Timeout Error: Try using adodbpi.connect(constr,timeout=Nseconds)')
-            print('Source: %s' % e.Source)
-            print('NativeError: %s' % e.NativeError)
-            print('SQL State: %s' % e.SQLState)
-
-    def _suggest_error_class(self):
-        """
-        Introspect the current ADO Errors and determine an appropriate error class.
-
-        Error.SQLState is a SQL-defined error condition, per the SQL specification:
-        http://www.contrib.andrew.cmu.edu/~shadow/sql/sql1992.txt
-
-        The 23000 class of errors are integrity errors.
-        Error 40002 is a transactional integrity error.
-        """
-        if self.adoConn is not None:
-            for e in self.adoConn.Errors:
-                state = str(e.SQLState)
-                if state.startswith('23') or state == '40002':
-                    return IntegrityError
-
-        return DatabaseError
-
-    def __del__(self):
-        try:
-            self._close_connection()
-        except:
-            pass
-        self.adoConn = None
-
-
-class Cursor(object):
-    # This read-only attribute is a sequence of 7-item sequences.
-    # Each of these sequences contains information describing one result column:
-    #     (name, type_code, display_size, internal_size, precision, scale, null_ok).
-    # This attribute will be None for operations that do not return rows or if the
-    # cursor has not had an operation invoked via the executeXXX() method yet.
-    # The type_code can be interpreted by comparing it to the Type Objects specified in the section below.
-    description = None
-
-    # This read-only attribute specifies the number of rows that the last executeXXX() produced
-    # (for DQL statements like select) or affected (for DML statements like update or insert).
-    # The attribute is -1 in case no executeXXX() has been performed on the cursor or
-    # the rowcount of the last operation is not determinable by the interface.[7]
-    # NOTE: -- adodbapi returns "-1" by default for all select statements
-    rowcount = -1
-
-    # Arraysize specifies the number of rows to fetch at a time with fetchmany().
-    arraysize = 1
-
-    def __init__(self, connection):
-        self.messages = []
-        self.connection = connection
-        self.rs = None
-        self.description = None
-        self.errorhandler = connection.errorhandler
-
-    def __iter__(self):
-        return iter(self.fetchone, None)
-
-    def __enter__(self):
-        "Allow database cursors to be used with context managers."
-        return self
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        "Allow database cursors to be used with context managers."
-        self.close()
-
-    def __del__(self):
-        try:
-            self.close()
-        except:
-            pass
-
-    def _raiseCursorError(self, errorclass, errorvalue):
-        eh = self.errorhandler
-        if eh is None:
-            eh = standardErrorHandler
-        eh(self.connection, self, errorclass, errorvalue)
-
-    def _description_from_recordset(self, recordset):
-        # Abort if closed or no recordset.
-        if (recordset is None) or (recordset.State == adStateClosed):
-            self.rs = None
-            self.description = None
-            return
-
-        # Since we use a forward-only cursor, rowcount will always return -1
-        self.rowcount = -1
-        self.rs = recordset
-        desc = list()
-
-        for f in self.rs.Fields:
-            display_size = None
-            if not(self.rs.EOF or self.rs.BOF):
-                display_size = f.ActualSize
-
-            null_ok = bool(f.Attributes & adFldMayBeNull)
-
-            desc.append(
-                (f.Name, f.Type, display_size, f.DefinedSize, f.Precision, f.NumericScale, null_ok)
-            )
-
-        self.description = desc
-
-    def close(self):
-        """Close the cursor."""
-        self.messages = []
-        self.connection = None
-        if self.rs and self.rs.State != adStateClosed:
-            self.rs.Close()
-            self.rs = None
-
-    def _new_command(self, command_type=adCmdText):
-        self.cmd = None
-        self.messages = []
-
-        if self.connection is None:
-            self._raiseCursorError(InterfaceError, None)
-            return
-
-        # Inner import to make this module importable on non-Windows platforms.
-        import win32com.client
-
-        try:
-            self.cmd = win32com.client.Dispatch("ADODB.Command")
-            self.cmd.ActiveConnection = self.connection.adoConn
-            self.cmd.CommandTimeout = self.connection.adoConn.CommandTimeout
-            self.cmd.CommandType = command_type
-        except:
-            self._raiseCursorError(DatabaseError, None)
-
-    def _execute_command(self):
-        # Sprocs may have an integer return value
-        self.return_value = None
-
-        try:
-            recordset = self.cmd.Execute()
-            self.rowcount = recordset[1]
-            self._description_from_recordset(recordset[0])
-        except Exception as e:
-            _message = ""
-            if hasattr(e, 'args'):
-                _message += str(e.args) + "\n"
-            _message += "Command:\n{}\nParameters:\n{}".format(
-                self.cmd.CommandText, format_parameters(self.cmd.Parameters, True)
-            )
-            klass = self.connection._suggest_error_class()
-            self._raiseCursorError(klass, _message)
-
-    def callproc(self, procname, parameters=None):
-        """Call a stored database procedure with the given name.
-
-        The sequence of parameters must contain one entry for each
-        argument that the sproc expects. The result of the
-        call is returned as modified copy of the input
-        sequence. Input parameters are left untouched, output and
-        input/output parameters replaced with possibly new values.
-
-        The sproc may also provide a result set as output,
-        which is available through the standard .fetch*() methods.
-
-        Extension: A "return_value" property may be set on the
-        cursor if the sproc defines an integer return value.
-        """
-        self._new_command(adCmdStoredProc)
-        self.cmd.CommandText = procname
-        self.cmd.Parameters.Refresh()
-
-        try:
-            # Return value is 0th ADO parameter. Skip it.
-            for i, p in enumerate(tuple(self.cmd.Parameters)[1:]):
-                _configure_parameter(p, parameters[i])
-        except:
-            _message = 'Converting Parameter %s: %s, %s\n' %\
-                (p.Name, ado_type_name(p.Type), repr(parameters[i]))
-
-            self._raiseCursorError(DataError, _message)
-
-        self._execute_command()
-
-        p_return_value = self.cmd.Parameters(0)
-        self.return_value = _convert_to_python(p_return_value.Value, p_return_value.Type)
-
-        return [_convert_to_python(p.Value, p.Type)
-            for p in tuple(self.cmd.Parameters)[1:]]
-
-    def execute(self, operation, parameters=None):
-        """Prepare and execute a database operation (query or command).
-
-        Return value is not defined.
-        """
-        self._new_command()
-
-        if parameters is None:
-            parameters = list()
-
-        parameter_replacements = list()
-        for i, value in enumerate(parameters):
-            if value is None:
-                parameter_replacements.append('NULL')
-                continue
-
-            if isinstance(value, six.string_types) and value == "":
-                parameter_replacements.append("''")
-                continue
-
-            # Otherwise, process the non-NULL, non-empty string parameter.
-            parameter_replacements.append('?')
-            try:
-                p = self.cmd.CreateParameter('p%i' % i, _ado_type(value))
-            except KeyError:
-                _message = 'Failed to map python type "%s" to an ADO type' % (value.__class__.__name__,)
-                self._raiseCursorError(DataError, _message)
-            except:
-                _message = 'Creating Parameter p%i, %s' % (i, _ado_type(value))
-                self._raiseCursorError(DataError, _message)
-
-            try:
-                _configure_parameter(p, value)
-                self.cmd.Parameters.Append(p)
-            except Exception:
-                _message = 'Converting Parameter %s: %s, %s\n' %\
-                    (p.Name, ado_type_name(p.Type), repr(value))
-
-                self._raiseCursorError(DataError, _message)
-
-        # Replace params with ? or NULL
-        if parameter_replacements:
-            operation = operation % tuple(parameter_replacements)
-
-        # Django will pass down many '%%' values. Need to convert these back to
-        # a single '%'. This will break raw SQL that includes '%%' as part of an
-        # inlined value. Those queries should use params.
-        operation = operation.replace('%%', '%')
-
-        self.cmd.CommandText = operation
-        self._execute_command()
-
-    def executemany(self, operation, seq_of_parameters):
-        """Execute the given command against all parameter sequences or mappings given in seq_of_parameters."""
-        self.messages = list()
-        total_recordcount = 0
-
-        for params in seq_of_parameters:
-            self.execute(operation, params)
-
-            if self.rowcount == -1:
-                total_recordcount = -1
-
-            if total_recordcount != -1:
-                total_recordcount += self.rowcount
-
-        self.rowcount = total_recordcount
-
-    def _fetch(self, rows=None):
-        """Fetch rows from the current recordset.
-
-        rows -- Number of rows to fetch, or None (default) to fetch all rows.
-        """
-        if self.connection is None or self.rs is None:
-            self._raiseCursorError(FetchFailedError, 'Attempting to fetch from a closed connection or empty record set')
-            return
-
-        if self.rs.State == adStateClosed or self.rs.BOF or self.rs.EOF:
-            if rows == 1: # fetchone returns None
-                return None
-            else: # fetchall and fetchmany return empty lists
-                return list()
-
-        if rows:
-            ado_results = self.rs.GetRows(rows)
-        else:
-            ado_results = self.rs.GetRows()
-
-        py_columns = list()
-        column_types = [column_desc[1] for column_desc in self.description]
-        for ado_type, column in zip(column_types, ado_results):
-            py_columns.append([_convert_to_python(cell, ado_type) for cell in column])
-
-        return tuple(zip(*py_columns))
-
-    def fetchone(self):
-        """
-        Fetch the next row of a query result set, returning a single sequence,
-        or None when no more data is available.
-
-        An Error (or subclass) exception is raised if the previous call to executeXXX()
-        did not produce any result set or no call was issued yet.
-        """
-        self.messages = list()
-        result = self._fetch(1)
-        if result: # return record (not list of records)
-            return result[0]
-        return None
-
-    def fetchmany(self, size=None):
-        """
-        Fetch the next set of rows of a query result, returning a list of
-        tuples. An empty sequence is returned when no more rows are available.
-        """
-        self.messages = list()
-        if size is None:
-            size = self.arraysize
-        return self._fetch(size)
-
-    def fetchall(self):
-        """Fetch all remaining rows of a query result, returning them as a sequence of sequences."""
-        self.messages = list()
-        return self._fetch()
-
-    def nextset(self):
-        """Skip to the next available recordset, discarding any remaining rows from the current recordset.
-
-        If there are no more sets, the method returns None. Otherwise, it returns a true
-        value and subsequent calls to the fetch methods will return rows from the next result set.
-        """
-        self.messages = list()
-        if self.connection is None or self.rs is None:
-            self._raiseCursorError(Error, None)
-            return None
-
-        recordset = self.rs.NextRecordset()[0]
-        if recordset is None:
-            return None
-
-        self._description_from_recordset(recordset)
-        return True
-
-    def setinputsizes(self, sizes):
-        pass
-
-    def setoutputsize(self, size, column=None):
-        pass
-
-# Type specific constructors as required by the DB-API 2 specification.
-Date = datetime.date
-Time = datetime.time
-Timestamp = datetime.datetime
-Binary = six.memoryview
-
-
-def DateFromTicks(ticks):
-    """Construct an object holding a date value from the given # of ticks."""
-    return Date(*time.localtime(ticks)[:3])
-
-
-def TimeFromTicks(ticks):
-    """Construct an object holding a time value from the given # of ticks."""
-    return Time(*time.localtime(ticks)[3:6])
-
-
-def TimestampFromTicks(ticks):
-    """Construct an object holding a timestamp value from the given # of ticks."""
-    return Timestamp(*time.localtime(ticks)[:6])
-
-adoIntegerTypes = (adInteger, adSmallInt, adTinyInt, adUnsignedInt, adUnsignedSmallInt, adUnsignedTinyInt, adError)
-adoRowIdTypes = (adChapter,)
-adoLongTypes = (adBigInt, adUnsignedBigInt, adFileTime)
-adoExactNumericTypes = (adDecimal, adNumeric, adVarNumeric, adCurrency)
-adoApproximateNumericTypes = (adDouble, adSingle)
-adoStringTypes = (adBSTR, adChar, adLongVarChar, adLongVarWChar, adVarChar, adVarWChar, adWChar, adGUID)
-adoBinaryTypes = (adBinary, adLongVarBinary, adVarBinary)
-adoDateTimeTypes = (adDBTime, adDBTimeStamp, adDate, adDBDate)
-
-# Required DBAPI type specifiers
-STRING = _DbType(adoStringTypes)
-BINARY = _DbType(adoBinaryTypes)
-NUMBER = _DbType((adBoolean,) + adoIntegerTypes + adoLongTypes + adoExactNumericTypes + adoApproximateNumericTypes)
-DATETIME = _DbType(adoDateTimeTypes)
-# Not very useful for SQL Server, as normal row ids are usually just integers.
-ROWID = _DbType(adoRowIdTypes)
-
-
-# Mapping ADO data types to Python objects.
-def _convert_to_python(variant, adType):
-    if variant is None:
-        return None
-    return _variantConversions[adType](variant)
-
-
-def _cvtDecimal(variant):
-    return _convertNumberWithCulture(variant, decimal.Decimal)
-
-
-def _cvtFloat(variant):
-    return _convertNumberWithCulture(variant, float)
-
-
-def _convertNumberWithCulture(variant, f):
-    try:
-        return f(variant)
-    except (ValueError, TypeError, decimal.InvalidOperation):
-        try:
-            europeVsUS = str(variant).replace(",", ".")
-            return f(europeVsUS)
-        except (ValueError, TypeError):
-            pass
-
-
-def _cvtComDate(comDate):
-    import pywintypes
-
-    if isinstance(comDate, pywintypes.TimeType):
-        # Django and everything else expects a datetime.datetime, instead of the
-        # invalid pathed com subclassed "pywintypes.datetime"
-        dt = datetime.datetime(
-            year=comDate.year,
-            month=comDate.month,
-            day=comDate.day,
-            hour=comDate.hour,
-            minute=comDate.minute,
-            second=comDate.second,
-            microsecond=comDate.microsecond
-        )
-    elif isinstance(comDate, datetime.datetime):
-        dt = comDate
-    else:
-        date_as_float = float(comDate)
-        day_count = int(date_as_float)
-        fraction_of_day = abs(date_as_float - day_count)
-
-        dt = (datetime.datetime.fromordinal(day_count + _ordinal_1899_12_31) +
-            datetime.timedelta(milliseconds=fraction_of_day * _milliseconds_per_day))
-
-    if getattr(settings, 'USE_TZ', False):
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
-
-_variantConversions = MultiMap(
-    {
-        adoDateTimeTypes: _cvtComDate,
-        adoExactNumericTypes: _cvtDecimal,
-        adoApproximateNumericTypes: _cvtFloat,
-        (adBoolean,): bool,
-        adoLongTypes + adoRowIdTypes: int if six.PY3 else long,
-        adoIntegerTypes: int,
-        adoBinaryTypes: six.memoryview,
-    },
-    lambda x: x)
-
-
-# Mapping Python data types to ADO type codes
-def _ado_type(data):
-    if isinstance(data, six.string_types):
-        return adVarWChar
-    return _map_to_adotype[type(data)]
-
-_map_to_adotype = {
-    six.memoryview: adBinary,
-    float: adDouble,
-    int: adInteger if six.PY2 else adBigInt,
-    bool: adBoolean,
-    decimal.Decimal: adDecimal,
-    datetime.date: adDate,
-    datetime.datetime: adDate,
-    datetime.time: adDate,
-    uuid.UUID: adGUID,
-}
-
-if six.PY3:
-    _map_to_adotype[bytes] = adBinary
-
-if six.PY2:
-    _map_to_adotype[long] = adBigInt
+"""A DB API 2.0 interface to SQL Server for Django
+
+Forked from: adodbapi v2.1
+Copyright (C) 2002 Henrik Ekelund, version 2.1 by Vernon Cole
+* http://adodbapi.sourceforge.net/
+* http://sourceforge.net/projects/pywin32/
+
+This library is free software; you can redistribute it and/or
+modify it under the terms of the GNU Lesser General Public
+License as published by the Free Software Foundation; either
+version 2.1 of the License, or (at your option) any later version.
+
+This library is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+Lesser General Public License for more details.
+
+You should have received a copy of the GNU Lesser General Public
+License along with this library; if not, write to the Free Software
+Foundation, Inc., 59 Temple Place, Suite 330, Boston, MA 02111-1307 USA
+
+* Version 2.1D by Adam Vandenberg, forked for Django backend use.
+  This module is a db-api 2 interface for ADO, but is Django & SQL Server.
+  It won't work against other ADO sources (like Access.)
+
+DB-API 2.0 specification: http://www.python.org/dev/peps/pep-0249/
+"""
+from __future__ import absolute_import, unicode_literals
+
+import array
+import itertools
+import time
+import datetime
+import re
+import uuid
+
+from collections import namedtuple, OrderedDict
+
+import decimal
+
+from pprint import pformat
+
+from django.conf import settings
+from django.db.utils import (IntegrityError as DjangoIntegrityError,
+    DatabaseError as DjangoDatabaseError)
+
+from django.utils import six
+from django.utils import timezone
+
+from .ado_consts import (adBigInt, adBinary, adBoolean, adBSTR, adChapter,
+    adChar, adCmdStoredProc, adCmdText, adCurrency, adDate, adDBDate, adDBTime,
+    adDBTimeStamp, adDecimal, adDouble, adError, adFileTime, adFldMayBeNull,
+    adGUID, adInteger, adLockReadOnly, adLongVarBinary, adLongVarChar,
+    adLongVarWChar, adNumeric, ado_error_TIMEOUT, ado_type_name, adoErrors,
+    adOpenForwardOnly, adParamInput, adParamInputOutput, adParamUnknown,
+    adSingle, adSmallInt, adStateClosed,
+    adTinyInt, adTypeNames, adUnsignedBigInt, adUnsignedInt, adUnsignedSmallInt,
+    adUnsignedTinyInt, adUseServer, adVarBinary, adVarChar, adVarNumeric,
+    adVarWChar, adWChar, adXactAbortRetaining, adXactCommitRetaining,
+    adXactReadCommitted)
+
+# DB API default values
+apilevel = '2.0'
+
+# 1: Threads may share the module, but not connections.
+threadsafety = 1
+
+# The underlying ADO library expects parameters as '?', but this wrapper
+# expects '%s' parameters. This wrapper takes care of the conversion.
+paramstyle = 'format'
+
+# Set defaultIsolationLevel on module level before creating the connection.
+# It may be one of "adXact..." consts.
+defaultIsolationLevel = adXactReadCommitted
+
+# Set defaultCursorLocation on module level before creating the connection.
+# It may be one of the "adUse..." consts.
+defaultCursorLocation = adUseServer
+
+# Parameter size buckets used by typed parameter binding. Strings and
+# binaries up to the largest non-max length share one declared size, longer
+# values are declared as (max).
+_nvarchar_size_limit = 4000
+_nvarchar_max_size = 1073741823
+_varchar_size_limit = 8000
+_varchar_max_size = 2147483647
+_varbinary_size_limit = 8000
+_varbinary_max_size = 2147483647
+
+# Largest precision of the SQL Server numeric data type.
+_numeric_max_precision = 38
+
+# Number of rows fetchall reads from the recordset at a time, so that only
+# one chunk of raw and converted values is alive next to the result rows.
+# None reads all rows with a single GetRows call.
+_fetchall_chunk_rows = 10000
+
+# Largest number of parameters SQL Server accepts in one request.
+_max_parameters = 2100
+
+# Largest number of rows of a table value constructor (INSERT ... VALUES),
+# and of statements executemany sends in one batch.
+_max_batch_rows = 1000
+
+# executemany batches single statement INSERT ... VALUES (...) by repeating
+# the VALUES row, and UPDATE and DELETE by repeating the statement.
+_re_insert_values = re.compile(
+    r'^(?P<insert>\s*INSERT\s[^;]*?\bVALUES\s*)(?P<values>\(.*\))\s*;?\s*$',
+    re.IGNORECASE | re.DOTALL,
+)
+_re_update_delete = re.compile(r'^\s*(?:UPDATE|DELETE)\b', re.IGNORECASE)
+
+# String literals and bracketed names, whose parentheses aren't SQL's.
+_re_quoted = re.compile(r"'(?:[^']|'')*'|\[(?:[^\]]|\]\])*\]")
+
+# Batch of UPDATE or DELETE statements that returns the total row count. The
+# session's NOCOUNT setting is restored afterwards.
+_rowcount_batch = (
+    'DECLARE @sqlserver_ado_nocount int = @@OPTIONS & 512, @sqlserver_ado_rowcount int = 0;'
+    'SET NOCOUNT ON;'
+    '{statements};'
+    'IF @sqlserver_ado_nocount = 0 SET NOCOUNT OFF;'
+    'SELECT @sqlserver_ado_rowcount'
+)
+_rowcount_statement = '{0};SET @sqlserver_ado_rowcount += @@ROWCOUNT'
+
+# A single SELECT statement, which only reads and doesn't need the pending
+# savepoints. Batches of several statements may write, and T-SQL doesn't
+# require a semicolon between them, so any write keyword rules it out.
+_re_read_only = re.compile(
+    r'^\s*SELECT\b'
+    r'(?!.*\b(?:INTO|INSERT|UPDATE|DELETE|MERGE|EXEC|EXECUTE|TRUNCATE|CREATE|ALTER|DROP)\b)'
+    r'[^;]*;?\s*$', re.IGNORECASE | re.DOTALL)
+
+# Used for COM to Python date conversions.
+_ordinal_1899_12_31 = datetime.date(1899, 12, 31).toordinal() - 1
+_milliseconds_per_day = 24 * 60 * 60 * 1000
+
+
+class MultiMap(object):
+    def __init__(self, mapping, default=None):
+        """Defines a mapping with multiple keys per value.
+
+        mapping is a dict of: tuple(key, key, key...) => value
+        """
+        self.storage = dict()
+        self.default = default
+
+        for keys, value in six.iteritems(mapping):
+            for key in keys:
+                self.storage[key] = value
+
+    def __getitem__(self, key):
+        return self.storage.get(key, self.default)
+
+
+class BulkCopyResult(namedtuple('BulkCopyResult', 'rows seconds')):
+    """The number of rows inserted by Cursor.bulk_copy and the time it took."""
+    __slots__ = ()
+
+    @property
+    def rows_per_second(self):
+        if not self.seconds:
+            return float(self.rows)
+        return self.rows / self.seconds
+
+
+class CommandCache(object):
+    def __init__(self, maxsize):
+        """A per-connection LRU of prepared ADO Command objects.
+
+        Commands are checked out while a cursor uses them and checked back in
+        when the cursor moves on, so a Command is never shared by two cursors.
+        """
+        self.maxsize = maxsize
+        self.storage = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.storage)
+
+    def checkout(self, key):
+        """Remove and return the Command cached for key, or None."""
+        cmd = self.storage.pop(key, None)
+        if cmd is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return cmd
+
+    def checkin(self, key, cmd):
+        """Cache cmd under key, evicting the least recently used Command."""
+        if key in self.storage:
+            # Another cursor prepared the same statement in the meantime.
+            del self.storage[key]
+            self.evictions += 1
+        self.storage[key] = cmd
+        while len(self.storage) > self.maxsize:
+            self.storage.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.storage.clear()
+
+    def stats(self):
+        return {
+            'size': len(self.storage),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+
+def standardErrorHandler(connection, cursor, errorclass, errorvalue):
+    err = (errorclass, errorvalue)
+    if connection is not None:
+        connection.messages.append(err)
+    if cursor is not None:
+        cursor.messages.append(err)
+    raise errorclass(errorvalue)
+
+
+class Error(Exception if six.PY3 else StandardError):
+    pass
+
+
+class Warning(Exception if six.PY3 else StandardError):
+    pass
+
+
+class InterfaceError(Error):
+    pass
+
+
+class DatabaseError(DjangoDatabaseError, Error):
+    pass
+
+
+class InternalError(DatabaseError):
+    pass
+
+
+class OperationalError(DatabaseError):
+    pass
+
+
+class ProgrammingError(DatabaseError):
+    pass
+
+
+class IntegrityError(DatabaseError, DjangoIntegrityError):
+    pass
+
+
+class DataError(DatabaseError):
+    pass
+
+
+class NotSupportedError(DatabaseError):
+    pass
+
+
+class FetchFailedError(Error):
+    """
+    Error is used by RawStoredProcedureQuerySet to determine when a fetch
+    failed due to a connection being closed or there is no record set
+    returned.
+    """
+    pass
+
+
+class AnsiString(six.text_type):
+    """
+    A string parameter that is bound as varchar, instead of nvarchar.
+
+    Comparing a varchar column with an nvarchar parameter makes SQL Server
+    convert the column, which turns index seeks into scans.
+    """
+    pass
+
+
+class BinaryNull(object):
+    """
+    A NULL parameter that is bound as varbinary, instead of nvarchar.
+
+    Typed parameter binding sends NULL as an nvarchar parameter, which SQL
+    Server doesn't implicitly convert to varbinary or image.
+    """
+    def __repr__(self):
+        return 'BinaryNull()'
+
+
+class _DbType(object):
+    def __init__(self, valuesTuple):
+        self.values = valuesTuple
+
+    def __eq__(self, other):
+        return other in self.values
+
+    def __ne__(self, other):
+        return other not in self.values
+
+_re_find_password = re.compile('(pwd|password)=[^;]*;', re.IGNORECASE)
+
+
+def mask_connection_string_password(s, mask='******'):
+    """
+    Look for a connection string password in 's' and mask it.
+    """
+    return re.sub(_re_find_password, '\g<1>=%s;' % mask, s)
+
+
+def connect(connection_string, timeout=30, use_transactions=None, com_init=True,
+        command_cache_size=0, typed_parameters=False, track_statement_signatures=False,
+        native_parameters=True, fetch_buffer_rows=100, delayed_durability=False):
+    """Connect to a database.
+
+    connection_string -- An ADODB formatted connection string, see:
+        http://www.connectionstrings.com/?carrier=sqlserver2005
+    timeout -- A command timeout value, in seconds (default 30 seconds)
+    com_init -- Initialize COM for the calling thread. The connection pool
+        manages COM initialization itself and passes False.
+    command_cache_size -- Number of prepared commands to keep per connection
+        (default 0 disables the cache)
+    typed_parameters -- Always send NULL and empty strings as typed parameters
+        and declare string and binary sizes in buckets, so the server sees a
+        stable statement signature (default False)
+    track_statement_signatures -- Record the distinct statement signatures
+        sent on the connection (default False)
+    native_parameters -- Bind Decimal, date, time, datetime and UUID values
+        with their native ADO types, instead of as strings (default True)
+    fetch_buffer_rows -- Number of rows read ahead by fetchone, fetchmany
+        and cursor iteration (default 100, 0 reads only the requested rows)
+    delayed_durability -- Commit transactions with delayed durability
+        (default False)
+    """
+    # Inner imports to make this module importable on non-Windows platforms.
+    import pythoncom
+    import win32com.client
+    try:
+        if com_init:
+            pythoncom.CoInitialize()
+        c = win32com.client.Dispatch('ADODB.Connection')
+        c.CommandTimeout = timeout
+        c.ConnectionString = connection_string
+        c.Open()
+        if use_transactions is None:
+            useTransactions = _use_transactions(c)
+        else:
+            useTransactions = use_transactions
+        conn = Connection(c, useTransactions, command_cache_size)
+        conn._com_initialized = com_init
+        conn.typed_parameters = typed_parameters
+        conn.native_parameters = native_parameters
+        conn.fetch_buffer_rows = fetch_buffer_rows
+        conn.delayed_durability = delayed_durability
+        if track_statement_signatures:
+            conn.statement_signatures = set()
+        return conn
+    except Exception as e:
+        raise OperationalError(e,
+            "Error opening connection: {0}".format(
+                mask_connection_string_password(connection_string)
+            )
+        )
+
+
+def _use_transactions(c):
+    """Return True if the given ADODB.Connection supports transactions."""
+    for prop in c.Properties:
+        if prop.Name == 'Transaction DDL':
+            return prop.Value > 0
+    return False
+
+
+def format_parameters(parameters, show_value=False):
+    """
+    Format a collection of ADO Command Parameters.
+
+    Used by error reporting in _execute_command.
+    """
+    directions = {
+        0: 'Unknown',
+        1: 'Input',
+        2: 'Output',
+        3: 'In/Out',
+        4: 'Return',
+    }
+
+    if show_value:
+        desc = [
+            "Name: %s, Dir.: %s, Type: %s, Size: %s, Value: \"%s\", Precision: %s, NumericScale: %s" %
+                (p.Name, directions[p.Direction], adTypeNames.get(p.Type, str(p.Type) + ' (unknown type)'),
+                 p.Size, p.Value, p.Precision, p.NumericScale)
+            for p in parameters
+        ]
+    else:
+        desc = [
+            "Name: %s, Dir.: %s, Type: %s, Size: %s, Precision: %s, NumericScale: %s" %
+                (p.Name, directions[p.Direction], adTypeNames.get(p.Type, str(p.Type) + ' (unknown type)'),
+                 p.Size, p.Precision, p.NumericScale)
+            for p in parameters
+        ]
+
+    return pformat(desc)
+    # return '[' + ', '.join(desc) + ']'
+
+
+def format_decimal_as_string(value):
+    """
+    Convert a decimal.Decimal to a fixed point string. Code borrowed from
+    Python's moneyfmt recipe.
+    https://docs.python.org/2/library/decimal.html#recipes
+    """
+    sign, digits, exp = value.as_tuple()
+    if exp > 0:
+        # Handle Decimals like '2.82E+3'
+        return "%d" % value
+    result = []
+    digits = list(map(str, digits))
+    build, next = result.append, digits.pop
+    for i in range(-exp):
+        build(next() if digits else '0')
+    build('.')
+    if not digits:
+        build('0')
+    while digits:
+        build(next())
+    if sign:
+        build('-')
+    return ''.join(reversed(result))
+
+
+def _parameter_size(value, bucket_sizes=False):
+    """
+    Return the declared size for a string or binary parameter value, or None
+    for other types. With bucket_sizes, values share a few declared sizes
+    instead of one per length.
+    """
+    if value is None:
+        return _nvarchar_size_limit if bucket_sizes else None
+    if isinstance(value, BinaryNull):
+        return _varbinary_size_limit if bucket_sizes else None
+    if isinstance(value, AnsiString):
+        if not bucket_sizes:
+            return len(value)
+        return _varchar_size_limit if len(value) <= _varchar_size_limit else _varchar_max_size
+    if isinstance(value, six.string_types):
+        if not bucket_sizes:
+            return len(value)
+        return _nvarchar_size_limit if len(value) <= _nvarchar_size_limit else _nvarchar_max_size
+    if isinstance(value, (six.memoryview, six.binary_type)):
+        if not bucket_sizes:
+            return len(value)
+        return _varbinary_size_limit if len(value) <= _varbinary_size_limit else _varbinary_max_size
+    return None
+
+
+def _decimal_precision_scale(value, bucket_sizes=False):
+    """
+    Return the (precision, scale) of a numeric type that can hold the finite
+    decimal.Decimal 'value'. With bucket_sizes, the maximum precision is used
+    so that only the scale varies.
+    """
+    sign, digits, exp = value.as_tuple()
+    if exp >= 0:
+        precision, scale = len(digits) + exp, 0
+    else:
+        scale = -exp
+        precision = max(len(digits), scale)
+    if bucket_sizes:
+        precision = _numeric_max_precision
+    return precision, scale
+
+
+def _configure_native_parameter(p, value, bucket_sizes=False):
+    """
+    Configure the ADO Parameter 'p', created with the type returned by
+    _native_ado_type(value). Values are passed to the provider in a locale
+    independent text form and converted to the parameter's type.
+    """
+    if isinstance(value, decimal.Decimal):
+        p.Precision, p.NumericScale = _decimal_precision_scale(value, bucket_sizes)
+        p.Value = '{0:f}'.format(value)
+
+    else:
+        # uuid.UUID
+        p.Value = '{%s}' % value
+
+
+def _configure_parameter(p, value, bucket_sizes=False, native=False):
+    """Configure the given ADO Parameter 'p' with the Python 'value'."""
+    if p.Direction not in [adParamInput, adParamInputOutput, adParamUnknown]:
+        return
+
+    if isinstance(value, six.string_types):
+        p.Value = value
+        p.Size = _parameter_size(value, bucket_sizes)
+
+    elif isinstance(value, six.memoryview):
+        p.Size = _parameter_size(value, bucket_sizes)
+        p.AppendChunk(value)
+
+    elif (value is None or isinstance(value, BinaryNull)) and bucket_sizes:
+        p.Value = None
+        p.Size = _parameter_size(value, bucket_sizes)
+
+    elif native and p.Type in _native_ado_types:
+        _configure_native_parameter(p, value, bucket_sizes)
+
+    elif isinstance(value, decimal.Decimal):
+        p.Type = adBSTR
+        p.Value = format_decimal_as_string(value)
+
+    elif isinstance(value, datetime.datetime):
+        p.Type = adBSTR
+        if timezone.is_aware(value):
+            value = timezone.make_naive(value, timezone.utc)
+        # Strip '-' so SQL Server parses as YYYYMMDD for all languages/formats
+        s = value.isoformat(' ' if six.PY3 else b' ').replace('-', '')
+        p.Value = s
+        p.Size = len(s)
+
+    elif isinstance(value, (datetime.time, datetime.date)):
+        p.Type = adBSTR
+        s = value.isoformat()
+        p.Value = s
+        p.Size = len(s)
+
+    elif isinstance(value, uuid.UUID):
+        p.Type = adBSTR
+        s = str(value)
+        p.Value = s
+        p.Size = len(s)
+
+    else:
+        # For any other type, set the value and let pythoncom do the right thing.
+        p.Value = value
+
+    # Use -1 instead of 0 for empty strings and buffers
+    if p.Size == 0:
+        p.Size = -1
+
+
+class Connection(object):
+    # The ConnectionPool that owns this connection, if any.
+    _pool = None
+
+    # Whether the connection is borrowed from its pool, not idle in it.
+    _pool_borrowed = False
+
+    # Whether closing the connection should uninitialize COM.
+    _com_initialized = True
+
+    # Send NULL and '' as parameters and bucket parameter sizes.
+    typed_parameters = False
+
+    # Bind Decimal, date, time, datetime and UUID values with native ADO types.
+    native_parameters = True
+
+    # Number of rows cursors read ahead from a result set.
+    fetch_buffer_rows = 0
+
+    # Set of hashes of the distinct statement signatures (SQL text, parameter
+    # types and sizes) sent on this connection, or None when not tracked.
+    statement_signatures = None
+
+    # Whether a transaction was begun on the server. When transactions are
+    # used, one is begun before the first statement that is executed.
+    _in_transaction = False
+
+    # Commit the transactions begun while this is set with delayed
+    # durability, which doesn't wait for the log to be written to disk.
+    delayed_durability = False
+
+    # Whether the active transaction was begun with BEGIN TRANSACTION instead
+    # of ADO, to be committed with delayed durability.
+    _delayed_transaction = False
+
+    def __init__(self, adoConn, useTransactions=False, command_cache_size=0):
+        self.adoConn = adoConn
+        self.errorhandler = None
+        self.messages = []
+        self.command_cache = CommandCache(command_cache_size) if command_cache_size else None
+        self.adoConn.CursorLocation = defaultCursorLocation
+        self.useTransactions = useTransactions
+        self.supportsTransactions = useTransactions # Disables autocommit per DBAPI
+        self.transaction_level = 0 # 0 == Not in a transaction, at the top level
+        # Names of the savepoints to create before the next statement that
+        # may write. See savepoint().
+        self.pending_savepoints = []
+
+    def set_autocommit(self, value):
+        if self.supportsTransactions == (not value):
+            return
+        self.pending_savepoints = []
+        if self._in_transaction:
+            self._rollback_transaction()
+        self.supportsTransactions = not value
+
+    def _begin_transaction(self):
+        """Begin a transaction, unless in autocommit mode or one is active."""
+        if self.supportsTransactions and not self._in_transaction:
+            if self.delayed_durability:
+                # ADO can't commit with delayed durability, and the
+                # provider's transaction can't be committed with T-SQL.
+                self.adoConn.Execute('BEGIN TRANSACTION')
+                self._delayed_transaction = True
+            else:
+                self.adoConn.IsolationLevel = defaultIsolationLevel
+                self.transaction_level = self.adoConn.BeginTrans()
+            self._in_transaction = True
+
+    def _rollback_transaction(self):
+        """Roll back the active transaction, however it was begun."""
+        self._in_transaction = False
+        if self._delayed_transaction:
+            self._delayed_transaction = False
+            self.transaction_level = 0
+            self.adoConn.Execute('IF @@TRANCOUNT > 0 ROLLBACK TRANSACTION')
+        else:
+            self.transaction_level = self.adoConn.RollbackTrans()
+
+    def savepoint(self, name):
+        """
+        Create a savepoint with the (quoted) name. The SAVE TRANSACTION
+        statement is deferred until a statement that may write is executed,
+        so that it is never sent for savepoints that only reads follow.
+        """
+        self.pending_savepoints.append(name)
+
+    def discard_savepoint(self, name):
+        """
+        Forget the savepoint, and those created after it, if SAVE
+        TRANSACTION wasn't executed yet. Returns True if it wasn't, in which
+        case there is nothing to roll back to the savepoint.
+        """
+        if name not in self.pending_savepoints:
+            return False
+        del self.pending_savepoints[self.pending_savepoints.index(name):]
+        return True
+
+    def _create_savepoints(self, operation):
+        """Create the pending savepoints, unless operation only reads."""
+        if not self.pending_savepoints or _re_read_only.match(operation):
+            return
+        names, self.pending_savepoints = self.pending_savepoints, []
+        self.adoConn.Execute(';'.join('SAVE TRANSACTION ' + name for name in names))
+
+    def _trancount(self):
+        """The number of active transactions on the server."""
+        # Not with a cursor, which would begin a transaction.
+        recordset, _ = self.adoConn.Execute('SELECT @@TRANCOUNT')
+        return recordset.Fields(0).Value
+
+    def _raiseConnectionError(self, errorclass, errorvalue):
+        eh = self.errorhandler
+        if eh is None:
+            eh = standardErrorHandler
+        eh(self, None, errorclass, errorvalue)
+
+    def _close_connection(self):
+        """Close the underlying ADO Connection object, rolling back an active transaction if supported."""
+        self.pending_savepoints = []
+        if self._in_transaction:
+            self._rollback_transaction()
+        self.adoConn.Close()
+
+    def reset(self):
+        """
+        Roll back any pending transaction and restore the transaction mode
+        the connection was opened with.
+        """
+        self.messages = []
+        self.pending_savepoints = []
+        if self._in_transaction:
+            self._rollback_transaction()
+        self.supportsTransactions = self.useTransactions
+
+    def close(self):
+        """Close the database connection.
+
+        A connection borrowed from a ConnectionPool is returned to its pool
+        instead of being closed.
+        """
+        self.messages = []
+        if self._pool is not None:
+            self._pool.release(self)
+            return
+        try:
+            self._close_connection()
+        except Exception as e:
+            self._raiseConnectionError(InternalError, e)
+        if self.command_cache is not None:
+            self.command_cache.clear()
+        self.adoConn = None
+        if self._com_initialized:
+            # Inner import to make this module importable on non-Windows platforms.
+            import pythoncom
+            pythoncom.CoUninitialize()
+
+    def commit(self):
+        """Commit a pending transaction to the database.
+
+        Note that if the database supports an auto-commit feature, this must
+        be initially off.
+        """
+        self.messages = []
+        self.pending_savepoints = []
+        if not self._in_transaction:
+            # No statement was executed since the last commit or rollback.
+            return
+
+        if self._delayed_transaction:
+            try:
+                self.adoConn.Execute('COMMIT TRANSACTION WITH (DELAYED_DURABILITY = ON)')
+            except Exception as e:
+                self._raiseConnectionError(Error, e)
+            self._in_transaction = self._delayed_transaction = False
+            self.transaction_level = 0
+            return
+
+        try:
+            self.transaction_level = self.adoConn.CommitTrans()
+            # If attributes has adXactCommitRetaining it performs retaining commits that is,
+            # calling CommitTrans automatically starts a new transaction. Not all providers support this.
+            # If not, a new transaction is begun by the next statement.
+            self._in_transaction = bool(self.adoConn.Attributes & adXactCommitRetaining)
+        except Exception as e:
+            self._raiseConnectionError(Error, e)
+
+    def rollback(self):
+        """Abort a pending transaction."""
+        self.messages = []
+        self.pending_savepoints = []
+        if not self._in_transaction:
+            return
+
+        retaining = not self._delayed_transaction and self.adoConn.Attributes & adXactAbortRetaining
+        try:
+            self._rollback_transaction()
+        except Exception as e:
+            # Some errors make the server roll back the transaction itself.
+            if self._trancount():
+                self._raiseConnectionError(Error, e)
+            self.transaction_level = 0
+            return
+        # If attributes has adXactAbortRetaining it performs retaining aborts that is,
+        # calling RollbackTrans automatically starts a new transaction. Not all providers support this.
+        self._in_transaction = bool(retaining)
+
+    def cursor(self):
+        """Return a new Cursor object using the current connection."""
+        self.messages = []
+        return Cursor(self)
+
+    def printADOerrors(self):
+        print('ADO Errors (%i):' % self.adoConn.Errors.Count)
+        for e in self.adoConn.Errors:
+            print('Description: %s' % e.Description)
+            print('Error: %s %s ' % (e.Number, adoErrors.get(e.Number, "unknown")))
+            if e.Number == ado_error_TIMEOUT:
+                print('Timeout Error: Try using adodbpi.connect(constr,timeout=Nseconds)')
+            print('Source: %s' % e.Source)
+            print('NativeError: %s' % e.NativeError)
+            print('SQL State: %s' % e.SQLState)
+
+    def has_native_error(self, number):
+        """
+        Return True if the errors of the last failed operation include the
+        SQL Server error number.
+        """
+        if self.adoConn is None:
+            return False
+        return any(e.NativeError == number for e in self.adoConn.Errors)
+
+    def _suggest_error_class(self):
+        """
+        Introspect the current ADO Errors and determine an appropriate error class.
+
+        Error.SQLState is a SQL-defined error condition, per the SQL specification:
+        http://www.contrib.andrew.cmu.edu/~shadow/sql/sql1992.txt
+
+        The 23000 class of errors are integrity errors.
+        Error 40002 is a transactional integrity error.
+        """
+        if self.adoConn is not None:
+            for e in self.adoConn.Errors:
+                state = str(e.SQLState)
+                if state.startswith('23') or state == '40002':
+                    return IntegrityError
+
+        return DatabaseError
+
+    def __del__(self):
+        try:
+            self._close_connection()
+        except:
+            pass
+        self.adoConn = None
+        if self._pool is not None:
+            # A borrowed connection was dropped without being returned.
+            self._pool._forget(self)
+
+
+class Cursor(object):
+    # This read-only attribute is a sequence of 7-item sequences.
+    # Each of these sequences contains information describing one result column:
+    #     (name, type_code, display_size, internal_size, precision, scale, null_ok).
+    # This attribute will be None for operations that do not return rows or if the
+    # cursor has not had an operation invoked via the executeXXX() method yet.
+    # The type_code can be interpreted by comparing it to the Type Objects specified in the section below.
+    description = None
+
+    # This read-only attribute specifies the number of rows that the last executeXXX() produced
+    # (for DQL statements like select) or affected (for DML statements like update or insert).
+    # The attribute is -1 in case no executeXXX() has been performed on the cursor or
+    # the rowcount of the last operation is not determinable by the interface.[7]
+    # NOTE: -- adodbapi returns "-1" by default for all select statements
+    rowcount = -1
+
+    # Arraysize specifies the number of rows to fetch at a time with fetchmany().
+    arraysize = 1
+
+    # When set, execute opens a forward-only, read-only server side recordset
+    # that reads this many rows at a time from the server (Recordset.CacheSize),
+    # and rows are fetched from it in chunks of the same size.
+    stream_cache_size = None
+
+    def __init__(self, connection):
+        self.messages = []
+        self.connection = connection
+        self.fetch_buffer_rows = connection.fetch_buffer_rows
+        self.rs = None
+        self.cmd = None
+        # CommandCache key of self.cmd, if it was taken from the cache.
+        self._cmd_key = None
+        self.description = None
+        # Per column conversion functions for the current result set.
+        self._converters = None
+        # Rows read ahead from the current result set, and the next one to return.
+        self._buffer = []
+        self._buffer_pos = 0
+        self.errorhandler = connection.errorhandler
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __enter__(self):
+        "Allow database cursors to be used with context managers."
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        "Allow database cursors to be used with context managers."
+        self.close()
+
+    def __del__(self):
+        try:
+            self.close()
+        except:
+            pass
+
+    def _raiseCursorError(self, errorclass, errorvalue):
+        eh = self.errorhandler
+        if eh is None:
+            eh = standardErrorHandler
+        eh(self.connection, self, errorclass, errorvalue)
+
+    def _description_from_recordset(self, recordset):
+        self._buffer = []
+        self._buffer_pos = 0
+
+        # Abort if closed or no recordset.
+        if (recordset is None) or (recordset.State == adStateClosed):
+            self.rs = None
+            self.description = None
+            self._converters = None
+            return
+
+        # Since we use a forward-only cursor, rowcount will always return -1
+        self.rowcount = -1
+        self.rs = recordset
+        desc = list()
+
+        for f in self.rs.Fields:
+            display_size = None
+            if not(self.rs.EOF or self.rs.BOF):
+                display_size = f.ActualSize
+
+            null_ok = bool(f.Attributes & adFldMayBeNull)
+
+            desc.append(
+                (f.Name, f.Type, display_size, f.DefinedSize, f.Precision, f.NumericScale, null_ok)
+            )
+
+        self.description = desc
+        self._converters = _column_converters(desc)
+
+    def close(self):
+        """Close the cursor."""
+        self.messages = []
+        self._release_command()
+        self.connection = None
+        self._buffer = []
+        if self.rs and self.rs.State != adStateClosed:
+            self.rs.Close()
+            self.rs = None
+
+    def _release_command(self):
+        """Return a cached command to the connection's CommandCache."""
+        if self._cmd_key is None:
+            return
+        key, self._cmd_key = self._cmd_key, None
+        cmd, self.cmd = self.cmd, None
+        # The previous result set must be closed before another cursor may
+        # execute the same command.
+        if self.rs is not None and self.rs.State != adStateClosed:
+            self.rs.Close()
+        self.rs = None
+        if self.connection is not None and self.connection.command_cache is not None:
+            self.connection.command_cache.checkin(key, cmd)
+
+    def _new_command(self, command_type=adCmdText):
+        self._release_command()
+        self.cmd = None
+        self.messages = []
+
+        if self.connection is None:
+            self._raiseCursorError(InterfaceError, None)
+            return
+
+        # Inner import to make this module importable on non-Windows platforms.
+        import win32com.client
+
+        try:
+            self.cmd = win32com.client.Dispatch("ADODB.Command")
+            self.cmd.ActiveConnection = self.connection.adoConn
+            self.cmd.CommandTimeout = self.connection.adoConn.CommandTimeout
+            self.cmd.CommandType = command_type
+        except:
+            self._raiseCursorError(DatabaseError, None)
+
+    def _execute_command(self):
+        # Sprocs may have an integer return value
+        self.return_value = None
+
+        try:
+            self.connection._begin_transaction()
+            self.connection._create_savepoints(self.cmd.CommandText)
+            if self.stream_cache_size:
+                recordset = self._open_stream()
+                self.rowcount = -1
+            else:
+                recordset, self.rowcount = self.cmd.Execute()
+            self._description_from_recordset(recordset)
+        except Exception as e:
+            _message = ""
+            if hasattr(e, 'args'):
+                _message += str(e.args) + "\n"
+            _message += "Command:\n{}\nParameters:\n{}".format(
+                self.cmd.CommandText, format_parameters(self.cmd.Parameters, True)
+            )
+            klass = self.connection._suggest_error_class()
+            self._raiseCursorError(klass, _message)
+
+    def _open_stream(self):
+        """Execute the command as a forward-only, read-only recordset that is
+        read from the server stream_cache_size rows at a time."""
+        # Inner import to make this module importable on non-Windows platforms.
+        import win32com.client
+
+        recordset = win32com.client.Dispatch("ADODB.Recordset")
+        recordset.CursorLocation = adUseServer
+        recordset.CursorType = adOpenForwardOnly
+        recordset.LockType = adLockReadOnly
+        recordset.CacheSize = self.stream_cache_size
+        recordset.Source = self.cmd
+        recordset.Open()
+        return recordset
+
+    def callproc(self, procname, parameters=None):
+        """Call a stored database procedure with the given name.
+
+        The sequence of parameters must contain one entry for each
+        argument that the sproc expects. The result of the
+        call is returned as modified copy of the input
+        sequence. Input parameters are left untouched, output and
+        input/output parameters replaced with possibly new values.
+
+        The sproc may also provide a result set as output,
+        which is available through the standard .fetch*() methods.
+
+        Extension: A "return_value" property may be set on the
+        cursor if the sproc defines an integer return value.
+        """
+        self._new_command(adCmdStoredProc)
+        self.cmd.CommandText = procname
+        self.cmd.Parameters.Refresh()
+
+        try:
+            # Return value is 0th ADO parameter. Skip it.
+            for i, p in enumerate(tuple(self.cmd.Parameters)[1:]):
+                _configure_parameter(p, parameters[i])
+        except:
+            _message = 'Converting Parameter %s: %s, %s\n' %\
+                (p.Name, ado_type_name(p.Type), repr(parameters[i]))
+
+            self._raiseCursorError(DataError, _message)
+
+        self._execute_command()
+
+        p_return_value = self.cmd.Parameters(0)
+        self.return_value = _convert_to_python(p_return_value.Value, p_return_value.Type)
+
+        return [_convert_to_python(p.Value, p.Type)
+            for p in tuple(self.cmd.Parameters)[1:]]
+
+    def execute(self, operation, parameters=None):
+        """Prepare and execute a database operation (query or command).
+
+        Return value is not defined.
+        """
+        if parameters is None:
+            parameters = list()
+
+        typed = self.connection is not None and self.connection.typed_parameters
+        native = self.connection is not None and self.connection.native_parameters
+
+        parameter_replacements = list()
+        bind_values = list()
+        for i, value in enumerate(parameters):
+            # Typed parameter binding sends NULL and '' as parameters too.
+            if not typed:
+                if value is None or isinstance(value, BinaryNull):
+                    parameter_replacements.append('NULL')
+                    continue
+
+                if isinstance(value, six.string_types) and value == "":
+                    parameter_replacements.append("''")
+                    continue
+
+            # Otherwise, process the parameter. Its ADO type takes part in the
+            # prepared command cache key.
+            try:
+                parameter_replacements.append(_ado_type(value, native))
+            except KeyError:
+                _message = 'Failed to map python type "%s" to an ADO type' % (value.__class__.__name__,)
+                self._raiseCursorError(DataError, _message)
+            bind_values.append((i, value))
+
+        # Give back the previous command first, it may be the one needed now.
+        self._release_command()
+
+        if self.connection is not None and self.connection.statement_signatures is not None:
+            self.connection.statement_signatures.add(hash((
+                operation,
+                tuple(parameter_replacements),
+                tuple(_parameter_size(value, typed) for i, value in bind_values),
+            )))
+
+        key = None
+        cache = self.connection.command_cache if self.connection is not None else None
+        # Binary values are sent with AppendChunk, which cannot be rebound.
+        if cache is not None and adBinary not in parameter_replacements:
+            key = (operation, tuple(parameter_replacements))
+            cmd = cache.checkout(key)
+            if cmd is not None:
+                # A prepared command only needs the new parameter values.
+                self.messages = []
+                self.cmd, self._cmd_key = cmd, key
+                for p, (i, value) in zip(self.cmd.Parameters, bind_values):
+                    self._bind_parameter(p, value, typed, native)
+                self._execute_command()
+                return
+
+        self._new_command()
+
+        for i, value in bind_values:
+            try:
+                p = self.cmd.CreateParameter('p%i' % i, parameter_replacements[i])
+            except:
+                _message = 'Creating Parameter p%i, %s' % (i, parameter_replacements[i])
+                self._raiseCursorError(DataError, _message)
+
+            self._bind_parameter(p, value, typed, native)
+            self.cmd.Parameters.Append(p)
+
+        # Replace params with ? or NULL
+        if parameter_replacements:
+            operation = operation % tuple(
+                r if r in ('NULL', "''") else '?' for r in parameter_replacements
+            )
+
+        # Django will pass down many '%%' values. Need to convert these back to
+        # a single '%'. This will break raw SQL that includes '%%' as part of an
+        # inlined value. Those queries should use params.
+        operation = operation.replace('%%', '%')
+
+        self.cmd.CommandText = operation
+        if key is not None:
+            self.cmd.Prepared = True
+            self._cmd_key = key
+        self._execute_command()
+
+    def _bind_parameter(self, p, value, bucket_sizes=False, native=False):
+        try:
+            _configure_parameter(p, value, bucket_sizes, native)
+        except Exception:
+            _message = 'Converting Parameter %s: %s, %s\n' %\
+                (p.Name, ado_type_name(p.Type), repr(value))
+
+            self._raiseCursorError(DataError, _message)
+
+    def executemany(self, operation, seq_of_parameters):
+        """Execute the given command against all parameter sequences or mappings given in seq_of_parameters.
+
+        Single INSERT ... VALUES, UPDATE and DELETE statements are sent in
+        batches of as many rows as SQL Server accepts parameters for.
+        """
+        self.messages = list()
+        total_recordcount = 0
+
+        seq_of_parameters = iter(seq_of_parameters)
+        first = next(seq_of_parameters, None)
+        if first is None:
+            self.rowcount = total_recordcount
+            return
+        seq_of_parameters = itertools.chain([first], seq_of_parameters)
+
+        format_batch = _executemany_batch_formatter(operation)
+        batch_size = 1
+        if format_batch is not None:
+            batch_size = _max_batch_rows
+            if first:
+                batch_size = max(1, min(batch_size, _max_parameters // len(first)))
+
+        while True:
+            batch = list(itertools.islice(seq_of_parameters, batch_size))
+            if not batch:
+                break
+
+            if len(batch) == 1:
+                self.execute(operation, batch[0])
+                rowcount = self.rowcount
+            else:
+                batch_operation, returns_rowcount = format_batch(len(batch))
+                self.execute(batch_operation, [value for params in batch for value in params])
+                rowcount = self.rowcount
+                if returns_rowcount:
+                    rowcount = self.fetchone()[0]
+                    self.rs.Close()
+                    self._description_from_recordset(None)
+
+            if rowcount == -1:
+                total_recordcount = -1
+
+            if total_recordcount != -1:
+                total_recordcount += rowcount
+
+        self.rowcount = total_recordcount
+
+    def _fetch(self, rows=None):
+        """Fetch rows from the current recordset.
+
+        rows -- Number of rows to fetch, or None (default) to fetch all rows.
+        """
+        if rows is None and _fetchall_chunk_rows:
+            results = list()
+            while True:
+                py_columns = self._fetch_columns(_fetchall_chunk_rows)
+                if py_columns is None:
+                    # A tuple of rows, like a single GetRows call
+                    return tuple(results) if results else results
+                results.extend(zip(*py_columns))
+
+        py_columns = self._fetch_columns(rows)
+        if py_columns is None:
+            if rows == 1: # fetchone returns None
+                return None
+            else: # fetchall and fetchmany return empty lists
+                return list()
+        return tuple(zip(*py_columns))
+
+    def _fetch_columns(self, rows=None):
+        """Fetch rows from the current recordset as a list of converted
+        columns, or None if there are no more rows.
+
+        rows -- Number of rows to fetch, or None (default) to fetch all rows.
+        """
+        if self.connection is None or self.rs is None:
+            self._raiseCursorError(FetchFailedError, 'Attempting to fetch from a closed connection or empty record set')
+            return None
+
+        if self.rs.State == adStateClosed or self.rs.BOF or self.rs.EOF:
+            return None
+
+        if rows:
+            ado_results = self.rs.GetRows(rows)
+        else:
+            ado_results = self.rs.GetRows()
+
+        py_columns = list()
+        for converter, column in zip(self._converters, ado_results):
+            if converter is None:
+                py_columns.append(column)
+            else:
+                py_columns.append([None if cell is None else converter(cell) for cell in column])
+        return py_columns
+
+    def _fetch_buffered(self, rows=None):
+        """Fetch rows, reading ahead from the recordset in blocks of
+        fetch_buffer_rows, so that small fetches don't each call GetRows.
+
+        rows -- Number of rows to fetch, or None (default) to fetch all rows.
+        """
+        buffer_rows = self.stream_cache_size or self.fetch_buffer_rows
+        pos = self._buffer_pos
+        if rows is not None and len(self._buffer) - pos >= rows:
+            self._buffer_pos = pos + rows
+            return self._buffer[pos:pos + rows]
+
+        if not (buffer_rows or self._buffer):
+            return self._fetch(rows)
+
+        result = list(self._buffer[pos:])
+        self._buffer = []
+        self._buffer_pos = 0
+
+        if rows is None:
+            more = self._fetch()
+        else:
+            needed = rows - len(result)
+            more = self._fetch(max(needed, buffer_rows))
+            if more and len(more) > needed:
+                self._buffer = more
+                self._buffer_pos = needed
+                more = more[:needed]
+        if more:
+            result.extend(more)
+        # Rows are returned as a tuple, like the unbuffered fetch
+        return tuple(result) if result else result
+
+    def fetch_column_values(self, rows=None):
+        """
+        Like fetch_columns, but returns a list of the columns' values in the
+        order of the result set, for columns that have the same name.
+        """
+        self.messages = list()
+        return self._fetch_column_values(rows)
+
+    def _fetch_column_values(self, rows=None):
+        """Fetch rows as a list of columns, starting with any buffered rows.
+        Numeric columns without NULLs are packed into arrays.
+        """
+        pos = self._buffer_pos
+        buffered = self._buffer[pos:] if rows is None else self._buffer[pos:pos + rows]
+        self._buffer_pos = pos + len(buffered)
+        remaining = None if rows is None else rows - len(buffered)
+
+        columns = None
+        if remaining != 0:
+            columns = self._fetch_columns(remaining)
+        if columns is None:
+            columns = [() for _ in self.description or ()]
+        if buffered:
+            columns = [tuple(b) + tuple(c) for b, c in zip(zip(*buffered), columns)]
+
+        return [_pack_column(column, column_desc[1])
+            for column, column_desc in zip(columns, self.description or ())]
+
+    def fetch_columns(self, n=None):
+        """
+        Fetch up to n rows (all remaining rows if n is None) of the current
+        result set by column, without building a tuple for each row.
+
+        Returns an OrderedDict of column name to the column's values. Integer
+        and float columns without NULLs are returned as numpy arrays if numpy
+        is installed, or array.array otherwise. Other columns are lists.
+        """
+        self.messages = list()
+        columns = self._fetch_column_values(n)
+        return OrderedDict(
+            (column_desc[0], column)
+            for column_desc, column in zip(self.description or (), columns)
+        )
+
+    def fetchone(self):
+        """
+        Fetch the next row of a query result set, returning a single sequence,
+        or None when no more data is available.
+
+        An Error (or subclass) exception is raised if the previous call to executeXXX()
+        did not produce any result set or no call was issued yet.
+        """
+        self.messages = list()
+        result = self._fetch_buffered(1)
+        if result: # return record (not list of records)
+            return result[0]
+        return None
+
+    def fetchmany(self, size=None):
+        """
+        Fetch the next set of rows of a query result, returning a list of
+        tuples. An empty sequence is returned when no more rows are available.
+        """
+        self.messages = list()
+        if size is None:
+            size = self.arraysize
+        return self._fetch_buffered(size)
+
+    def fetchall(self):
+        """Fetch all remaining rows of a query result, returning them as a sequence of sequences."""
+        self.messages = list()
+        return self._fetch_buffered()
+
+    def nextset(self):
+        """Skip to the next available recordset, discarding any remaining rows from the current recordset.
+
+        If there are no more sets, the method returns None. Otherwise, it returns a true
+        value and subsequent calls to the fetch methods will return rows from the next result set.
+        """
+        self.messages = list()
+        if self.connection is None or self.rs is None:
+            self._raiseCursorError(Error, None)
+            return None
+
+        self._buffer = []
+        self._buffer_pos = 0
+        recordset = self.rs.NextRecordset()[0]
+        if recordset is None:
+            return None
+
+        self._description_from_recordset(recordset)
+        return True
+
+    def bulk_copy(self, table, columns, rows, batch_size=None, tablock=False,
+            check_constraints=True, fire_triggers=True, keep_identity=False):
+        """
+        Insert rows into table, consuming rows (any iterable, such as a
+        generator) one batch at a time, so memory use doesn't grow with the
+        number of rows. Returns a BulkCopyResult.
+
+        table -- Name of the table, quoted if not in brackets.
+        columns -- Names of the columns, quoted if not in brackets.
+        rows -- Iterable of sequences of values, in the order of columns.
+        batch_size -- Rows per INSERT statement (default, and at most, as many
+            as fit in SQL Server's parameter limit, up to 1000).
+        tablock -- Take a table lock for each batch, which allows minimal
+            logging when inserting into a heap.
+        check_constraints -- When False, CHECK and FOREIGN KEY constraints
+            are disabled during the load and re-enabled, as not trusted,
+            afterwards.
+        fire_triggers -- When False, the table's triggers are disabled during
+            the load.
+        keep_identity -- Insert the given values into the identity column.
+
+        Disabling constraints or triggers alters the table, which affects
+        other connections until the load completes.
+
+        This is not the bulk load protocol of bcp and BULK INSERT, which ADO
+        doesn't expose. Each batch is a multi-row INSERT ... VALUES, limited
+        like bulk_create by SQL Server's 2100 parameters per statement.
+        """
+        self.messages = list()
+        columns = [_quote_name(column) for column in columns]
+        if not columns:
+            raise ProgrammingError("bulk_copy requires at least one column")
+        max_batch_size = max(1, min(_max_batch_rows, _max_parameters // len(columns)))
+        if batch_size is None:
+            batch_size = max_batch_size
+        elif not 0 < batch_size <= max_batch_size:
+            raise ProgrammingError("batch_size must be between 1 and %d" % max_batch_size)
+
+        table = _quote_name(table)
+        insert = 'INSERT INTO {table}{hint} ({columns}) VALUES '.format(
+            table=table,
+            hint=' WITH (TABLOCK)' if tablock else '',
+            columns=', '.join(columns),
+        ).replace('%', '%%')
+        values = '(%s)' % ', '.join(['%s'] * len(columns))
+
+        before = list()
+        after = list()
+        if not check_constraints:
+            before.append('ALTER TABLE {0} NOCHECK CONSTRAINT ALL')
+            after.append('ALTER TABLE {0} CHECK CONSTRAINT ALL')
+        if not fire_triggers:
+            before.append('DISABLE TRIGGER ALL ON {0}')
+            after.append('ENABLE TRIGGER ALL ON {0}')
+        if keep_identity:
+            before.append('SET IDENTITY_INSERT {0} ON')
+            after.append('SET IDENTITY_INSERT {0} OFF')
+
+        start = time.time()
+        count = 0
+        rows = iter(rows)
+        # The statements that undo the ones in before that were executed
+        undo = list()
+        try:
+            for sql, undo_sql in zip(before, after):
+                self.execute(sql.format(table).replace('%', '%%'))
+                undo.append(undo_sql)
+            while True:
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch:
+                    break
+                self.execute(
+                    insert + ','.join([values] * len(batch)),
+                    [value for row in batch for value in row],
+                )
+                count += len(batch)
+        finally:
+            for sql in reversed(undo):
+                self.execute(sql.format(table).replace('%', '%%'))
+
+        self.rowcount = count
+        return BulkCopyResult(count, time.time() - start)
+
+    def setinputsizes(self, sizes):
+        pass
+
+    def setoutputsize(self, size, column=None):
+        pass
+
+# Type specific constructors as required by the DB-API 2 specification.
+Date = datetime.date
+Time = datetime.time
+Timestamp = datetime.datetime
+Binary = six.memoryview
+
+
+def DateFromTicks(ticks):
+    """Construct an object holding a date value from the given # of ticks."""
+    return Date(*time.localtime(ticks)[:3])
+
+
+def TimeFromTicks(ticks):
+    """Construct an object holding a time value from the given # of ticks."""
+    return Time(*time.localtime(ticks)[3:6])
+
+
+def TimestampFromTicks(ticks):
+    """Construct an object holding a timestamp value from the given # of ticks."""
+    return Timestamp(*time.localtime(ticks)[:6])
+
+adoIntegerTypes = (adInteger, adSmallInt, adTinyInt, adUnsignedInt, adUnsignedSmallInt, adUnsignedTinyInt, adError)
+adoRowIdTypes = (adChapter,)
+adoLongTypes = (adBigInt, adUnsignedBigInt, adFileTime)
+adoExactNumericTypes = (adDecimal, adNumeric, adVarNumeric, adCurrency)
+adoApproximateNumericTypes = (adDouble, adSingle)
+adoStringTypes = (adBSTR, adChar, adLongVarChar, adLongVarWChar, adVarChar, adVarWChar, adWChar, adGUID)
+adoBinaryTypes = (adBinary, adLongVarBinary, adVarBinary)
+adoDateTimeTypes = (adDBTime, adDBTimeStamp, adDate, adDBDate)
+
+# Required DBAPI type specifiers
+STRING = _DbType(adoStringTypes)
+BINARY = _DbType(adoBinaryTypes)
+NUMBER = _DbType((adBoolean,) + adoIntegerTypes + adoLongTypes + adoExactNumericTypes + adoApproximateNumericTypes)
+DATETIME = _DbType(adoDateTimeTypes)
+# Not very useful for SQL Server, as normal row ids are usually just integers.
+ROWID = _DbType(adoRowIdTypes)
+
+
+def _quote_name(name):
+    """Quote a table or column name, unless it is already in brackets."""
+    if name.startswith('[') and name.endswith(']'):
+        return name
+    return '[%s]' % name.replace(']', ']]')
+
+
+def _is_values_list(values):
+    """
+    Whether values is only a list of parenthesised rows, such as
+    '(%s, %s), (%s, %s)', which can be repeated for more rows. The VALUES of
+    a derived table, for example, is followed by more of the statement.
+    """
+    depth = 0
+    expect_row = True
+    for c in _re_quoted.sub('0', values):
+        if depth:
+            depth += {'(': 1, ')': -1}.get(c, 0)
+            if not depth:
+                expect_row = False
+        elif c == '(' and expect_row:
+            depth = 1
+        elif c == ',' and not expect_row:
+            expect_row = True
+        elif not c.isspace():
+            return False
+    return not depth and not expect_row
+
+
+def _executemany_batch_formatter(operation):
+    """
+    Return a function that formats the batch of a number of executions of
+    operation, or None if operation can't be batched. The function returns
+    the batch and whether its result set is the total row count.
+    """
+    operation = operation.rstrip().rstrip(';')
+    # Multiple statements are executed one at a time.
+    if ';' in operation:
+        return None
+
+    match = _re_insert_values.match(operation)
+    if match and '%s' not in match.group('insert') and _is_values_list(match.group('values')):
+        insert, values = match.group('insert', 'values')
+
+        def format_insert(count):
+            return insert + ','.join([values] * count), False
+        return format_insert
+
+    if _re_update_delete.match(operation):
+        statement = _rowcount_statement.format(operation)
+
+        def format_statements(count):
+            return _rowcount_batch.format(statements=';'.join([statement] * count)), True
+        return format_statements
+
+    return None
+
+
+# Mapping ADO data types to Python objects.
+def _convert_to_python(variant, adType):
+    if variant is None:
+        return None
+    return _variantConversions[adType](variant)
+
+
+def _cvtDecimal(variant):
+    return _convertNumberWithCulture(variant, decimal.Decimal)
+
+
+def _cvtFloat(variant):
+    return _convertNumberWithCulture(variant, float)
+
+
+def _convertNumberWithCulture(variant, f):
+    try:
+        return f(variant)
+    except (ValueError, TypeError, decimal.InvalidOperation):
+        try:
+            europeVsUS = str(variant).replace(",", ".")
+            return f(europeVsUS)
+        except (ValueError, TypeError):
+            pass
+
+
+def _com_date_to_datetime(comDate):
+    if type(comDate) is datetime.datetime:
+        return comDate
+
+    import pywintypes
+
+    if isinstance(comDate, pywintypes.TimeType):
+        # Django and everything else expects a datetime.datetime, instead of the
+        # invalid pathed com subclassed "pywintypes.datetime"
+        return datetime.datetime(
+            year=comDate.year,
+            month=comDate.month,
+            day=comDate.day,
+            hour=comDate.hour,
+            minute=comDate.minute,
+            second=comDate.second,
+            microsecond=comDate.microsecond
+        )
+    elif isinstance(comDate, datetime.datetime):
+        return comDate
+
+    date_as_float = float(comDate)
+    day_count = int(date_as_float)
+    fraction_of_day = abs(date_as_float - day_count)
+
+    return (datetime.datetime.fromordinal(day_count + _ordinal_1899_12_31) +
+        datetime.timedelta(milliseconds=fraction_of_day * _milliseconds_per_day))
+
+
+def _cvtComDateUTC(comDate):
+    return _com_date_to_datetime(comDate).replace(tzinfo=timezone.utc)
+
+
+def _cvtComDate(comDate):
+    if getattr(settings, 'USE_TZ', False):
+        return _cvtComDateUTC(comDate)
+    return _com_date_to_datetime(comDate)
+
+_variantConversions = MultiMap(
+    {
+        adoDateTimeTypes: _cvtComDate,
+        adoExactNumericTypes: _cvtDecimal,
+        adoApproximateNumericTypes: _cvtFloat,
+        (adBoolean,): bool,
+        adoLongTypes + adoRowIdTypes: int if six.PY3 else long,
+        adoIntegerTypes: int,
+        adoBinaryTypes: six.memoryview,
+    },
+    lambda x: x)
+
+
+# array.array type codes for numeric columns, which are also numpy dtypes.
+_array_typecodes = dict(
+    [(t, 'l') for t in (adInteger, adSmallInt, adTinyInt, adUnsignedSmallInt, adUnsignedTinyInt)] +
+    [(t, 'd') for t in adoApproximateNumericTypes]
+)
+if six.PY3:
+    _array_typecodes.update((t, 'q') for t in (adBigInt, adUnsignedInt))
+
+# The numpy module once imported, or False if it isn't installed.
+_numpy = None
+
+
+def _pack_column(values, adType):
+    """Return a numeric column as an array, or other columns as a list."""
+    global _numpy
+    typecode = _array_typecodes.get(adType)
+    if typecode is None or None in values:
+        return list(values)
+    if _numpy is None:
+        try:
+            import numpy as _numpy
+        except ImportError:
+            _numpy = False
+    if _numpy:
+        return _numpy.array(values, dtype=typecode)
+    return array.array(str(typecode), values)
+
+
+def _column_converters(description):
+    """
+    Return the conversion function for each column of a result set, or None
+    for columns whose values are used as returned by ADO.
+    """
+    use_tz = getattr(settings, 'USE_TZ', False)
+    converters = []
+    for column_desc in description:
+        ado_type = column_desc[1]
+        if ado_type in adoDateTimeTypes:
+            # Decide once per result set instead of once per value.
+            converter = _cvtComDateUTC if use_tz else _com_date_to_datetime
+        else:
+            converter = _variantConversions[ado_type]
+            if converter is _variantConversions.default:
+                converter = None
+        converters.append(converter)
+    return converters
+
+
+# Mapping Python data types to ADO type codes
+def _ado_type(data, native=False):
+    if isinstance(data, AnsiString):
+        return adVarChar
+    if isinstance(data, BinaryNull):
+        return adVarBinary
+    if isinstance(data, six.string_types):
+        return adVarWChar
+    if native:
+        ado_type = _native_ado_type(data)
+        if ado_type is not None:
+            return ado_type
+    return _map_to_adotype[type(data)]
+
+
+def _native_ado_type(data):
+    """
+    Return the native ADO type code for values that are otherwise sent as
+    strings, or None if the value must be sent as a string.
+
+    Dates and times are always sent as strings. adDBDate and adDBTimeStamp
+    are bound as the legacy 'datetime' type, which can't hold dates before
+    1753 or microseconds, and binding some values of a column natively and
+    others as strings makes a multi-row VALUES list convert the strings.
+    """
+    ado_type = _map_to_native_adotype.get(type(data))
+    if ado_type is None:
+        return None
+    if ado_type == adNumeric:
+        if not data.is_finite() or _decimal_precision_scale(data)[0] > _numeric_max_precision:
+            return None
+    return ado_type
+
+_map_to_native_adotype = {
+    decimal.Decimal: adNumeric,
+    uuid.UUID: adGUID,
+}
+
+_native_ado_types = frozenset(_map_to_native_adotype.values())
+
+_map_to_adotype = {
+    # NULL is only bound as a parameter by typed parameter binding.
+    type(None): adVarWChar,
+    six.memoryview: adBinary,
+    float: adDouble,
+    int: adInteger if six.PY2 else adBigInt,
+    bool: adBoolean,
+    decimal.Decimal: adDecimal,
+    datetime.date: adDate,
+    datetime.datetime: adDate,
+    datetime.time: adDate,
+    uuid.UUID: adGUID,
+}
+
+if six.PY3:
+    _map_to_adotype[bytes] = adBinary
+
+if six.PY2:
+    _map_to_adotype[long] = adBigInt
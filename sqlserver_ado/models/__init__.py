@@ -1,3 +1,3 @@
-from __future__ import unicode_literals
-from sqlserver_ado.models.manager import RawStoredProcedureManager  # NOQA
-from sqlserver_ado.models.query import RawStoredProcedureQuerySet  # NOQA
+from __future__ import unicode_literals
+from sqlserver_ado.models.manager import RawStoredProcedureManager, SqlServerManager  # NOQA
+from sqlserver_ado.models.query import RawStoredProcedureQuerySet, SqlServerQuerySet  # NOQA
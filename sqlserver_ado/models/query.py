@@ -1,85 +1,477 @@
-from __future__ import unicode_literals
-
-from django.db import connections
-from django.db.models import sql
-from django.db.models.query import RawQuerySet
-
-from sqlserver_ado.dbapi import FetchFailedError
-
-__all__ = [
-    'RawStoredProcedureQuery',
-    'RawStoredProcedureQuerySet',
-]
-
-
-class RawStoredProcedureQuery(sql.RawQuery):
-    """
-    A single raw SQL stored procedure query
-    """
-    def clone(self, using):
-        return RawStoredProcedureQuery(self.sql, using, params=self.params)
-
-    def __repr__(self):
-        return "<RawStoredProcedureQuery: %r %r>" % (self.sql, self.params)
-
-    def _execute_query(self):
-        """
-        Execute the stored procedure using callproc, instead of execute.
-        """
-        self.cursor = connections[self.using].cursor()
-        self.cursor.callproc(self.sql, self.params)
-
-
-class RawStoredProcedureQuerySet(RawQuerySet):
-    """
-    Provides an iterator which converts the results of raw SQL queries into
-    annotated model instances.
-
-    raw_query should only be the name of the stored procedure.
-    """
-    def __init__(self, raw_query, model=None, query=None, params=None,
-            translations=None, using=None, hints=None):
-        self.raw_query = raw_query
-        self.model = model
-        self._db = using
-        self._hints = hints or {}
-        self.query = query or RawStoredProcedureQuery(sql=raw_query, using=self.db, params=params)
-        self.params = params or ()
-        self.translations = translations or {}
-
-    def __iter__(self):
-        try:
-            for x in super(RawStoredProcedureQuerySet, self).__iter__():
-                yield x
-        except FetchFailedError:
-            # Stored procedure didn't return a record set
-            pass
-
-    def __repr__(self):
-        return "<RawStoredProcedureQuerySet: %r %r>" % (self.raw_query, self.params)
-
-    @property
-    def columns(self):
-        """
-        A list of model field names in the order they'll appear in the
-        query results.
-        """
-        if not hasattr(self, '_columns'):
-            try:
-                self._columns = self.query.get_columns()
-            except TypeError:
-                # "'NoneType' object is not iterable" thrown when stored procedure
-                # doesn't return a result set.
-                # no result means no column names, so grab them from the model
-                self._columns = [self.model._meta.pk.db_column]  # [x.db_column for x in self.model._meta.fields]
-
-            # Adjust any column names which don't match field names
-            for (query_name, model_name) in self.translations.items():
-                try:
-                    index = self._columns.index(query_name)
-                    self._columns[index] = model_name
-                except ValueError:
-                    # Ignore translations for non-existant column names
-                    pass
-
-        return self._columns
+from __future__ import unicode_literals
+
+import itertools
+from collections import OrderedDict
+
+from django.core.exceptions import EmptyResultSet, FieldDoesNotExist
+from django.db import DatabaseError, connections, transaction
+from django.db.models import AutoField, Model, Q, sql
+from django.db.models.query import QuerySet, RawQuerySet
+from django.utils import six
+
+from sqlserver_ado.compiler import OPTION_HINTS, TABLE_HINTS, _re_data_type_terminator
+from sqlserver_ado.dbapi import BulkCopyResult, FetchFailedError
+
+__all__ = [
+    'RawStoredProcedureQuery',
+    'RawStoredProcedureQuerySet',
+    'SqlServerQuerySet',
+]
+
+
+class RawStoredProcedureQuery(sql.RawQuery):
+    """
+    A single raw SQL stored procedure query
+    """
+    def clone(self, using):
+        return RawStoredProcedureQuery(self.sql, using, params=self.params)
+
+    def __repr__(self):
+        return "<RawStoredProcedureQuery: %r %r>" % (self.sql, self.params)
+
+    def _execute_query(self):
+        """
+        Execute the stored procedure using callproc, instead of execute.
+        """
+        self.cursor = connections[self.using].cursor()
+        self.cursor.callproc(self.sql, self.params)
+
+
+class RawStoredProcedureQuerySet(RawQuerySet):
+    """
+    Provides an iterator which converts the results of raw SQL queries into
+    annotated model instances.
+
+    raw_query should only be the name of the stored procedure.
+    """
+    def __init__(self, raw_query, model=None, query=None, params=None,
+            translations=None, using=None, hints=None):
+        self.raw_query = raw_query
+        self.model = model
+        self._db = using
+        self._hints = hints or {}
+        self.query = query or RawStoredProcedureQuery(sql=raw_query, using=self.db, params=params)
+        self.params = params or ()
+        self.translations = translations or {}
+
+    def __iter__(self):
+        try:
+            for x in super(RawStoredProcedureQuerySet, self).__iter__():
+                yield x
+        except FetchFailedError:
+            # Stored procedure didn't return a record set
+            pass
+
+    def __repr__(self):
+        return "<RawStoredProcedureQuerySet: %r %r>" % (self.raw_query, self.params)
+
+    @property
+    def columns(self):
+        """
+        A list of model field names in the order they'll appear in the
+        query results.
+        """
+        if not hasattr(self, '_columns'):
+            try:
+                self._columns = self.query.get_columns()
+            except TypeError:
+                # "'NoneType' object is not iterable" thrown when stored procedure
+                # doesn't return a result set.
+                # no result means no column names, so grab them from the model
+                self._columns = [self.model._meta.pk.db_column]  # [x.db_column for x in self.model._meta.fields]
+
+            # Adjust any column names which don't match field names
+            for (query_name, model_name) in self.translations.items():
+                try:
+                    index = self._columns.index(query_name)
+                    self._columns[index] = model_name
+                except ValueError:
+                    # Ignore translations for non-existant column names
+                    pass
+
+        return self._columns
+
+
+def _hints(hints):
+    """A tuple of hints, from a single hint or a sequence of them."""
+    if isinstance(hints, six.string_types):
+        return (hints,)
+    return tuple(hints)
+
+
+class SqlServerQuerySet(QuerySet):
+    """
+    QuerySet with additional methods for SQL Server.
+    """
+    def iterator(self, chunk_size=None):
+        """
+        An iterator over the results, streamed from the server chunk_size
+        rows at a time. When chunk_size is None, the results are only
+        streamed if the stream_cache_size option is set.
+        """
+        if chunk_size is None:
+            return super(SqlServerQuerySet, self).iterator()
+        if chunk_size <= 0:
+            raise ValueError('Chunk size must be strictly positive.')
+        qs = self._clone()
+        qs.query.stream_chunk_size = chunk_size
+        return super(SqlServerQuerySet, qs).iterator()
+
+    def with_hints(self, table=None, option=None):
+        """
+        Add table hints, such as 'NOLOCK' or 'INDEX(ix_name)', and query
+        hints of the OPTION clause, such as 'RECOMPILE' or 'MAXDOP 1'. Each
+        is a hint or a sequence of hints. The hints are SQL and are not
+        escaped.
+
+        table -- Hints for the table of the model, or a dict of model or
+            table name to the hints of that table, for joined tables. They
+            aren't added to the tables of subqueries made from other
+            querysets, which keep their own hints.
+        option -- Query hints. These are ignored when the queryset is a
+            subquery of another query.
+        """
+        clone = self._clone()
+        context = clone.query.context
+        if table:
+            if not isinstance(table, dict):
+                table = {self.model: table}
+            table_hints = dict(context.get(TABLE_HINTS, {}))
+            for key, hints in table.items():
+                name = key if isinstance(key, six.string_types) else key._meta.db_table
+                table_hints[name] = table_hints.get(name, ()) + _hints(hints)
+            context[TABLE_HINTS] = table_hints
+        if option:
+            context[OPTION_HINTS] = context.get(OPTION_HINTS, ()) + _hints(option)
+        return clone
+
+    def seek_after(self, *values):
+        """
+        Filter to the rows after the given values of the ordering fields,
+        for keyset pagination. Pass one value per ordering field, or the last
+        object of the previous page. The ordering must be unique, for example
+        by ending with 'pk', and by the model's own fields. A relation is
+        only allowed when the query orders by its column, which is the case
+        when it is named by its attname or the related model has no ordering.
+
+        Comparing (a, b) > (x, y) is written as a >= x AND (a > x OR (a = x
+        AND b > y)), so that an index on the ordering fields is sought.
+        """
+        query = self.query
+        ordering = query.order_by or (query.default_ordering and self.model._meta.ordering)
+        if not ordering:
+            raise ValueError("seek_after requires an ordered query")
+        opts = self.model._meta
+        keys = []
+        fields = []
+        for name in ordering:
+            field = None
+            if isinstance(name, six.string_types) and name != '?':
+                field_name = name.lstrip('-')
+                try:
+                    field = opts.pk if field_name == 'pk' else opts.get_field(field_name)
+                except FieldDoesNotExist:
+                    pass
+            # The rows must be compared on the same column as the ORDER BY,
+            # which for a relation is the ordering of the related model.
+            if field is None or not field.concrete or (
+                    field.is_relation and field.related_model._meta.ordering and field_name != field.attname):
+                raise ValueError("seek_after can only seek on the columns of the model's fields, not %r" % (name,))
+            keys.append((field_name, name.startswith('-')))
+            fields.append(field)
+
+        if len(values) == 1 and isinstance(values[0], Model):
+            values = [getattr(values[0], field.attname) for field in fields]
+        if len(values) != len(keys):
+            raise ValueError("seek_after requires a value for each of %s" % ', '.join(ordering))
+        if any(v is None for v in values):
+            raise ValueError("seek_after can't seek after NULL values")
+
+        after = None
+        for i, (name, descending) in enumerate(keys):
+            condition = Q(**dict((previous, values[j]) for j, (previous, _) in enumerate(keys[:i])))
+            condition &= Q(**{name + ('__lt' if descending else '__gt'): values[i]})
+            after = condition if after is None else after | condition
+        if len(keys) > 1:
+            name, descending = keys[0]
+            after = Q(**{name + ('__lte' if descending else '__gte'): values[0]}) & after
+        return self.filter(after)
+
+    def values_columns(self, *fields, **expressions):
+        """
+        Return the result of values(*fields, **expressions) by column, as an
+        OrderedDict of name to the column's values. See Cursor.fetch_columns.
+        """
+        qs = self.values(*fields, **expressions)
+        query = qs.query
+        # extra(select=...) cols are always at the start of the row.
+        names = list(query.extra_select) + list(query.values_select) + list(query.annotation_select)
+
+        compiler = query.get_compiler(qs.db)
+        # Executed here instead of by execute_sql, which adds the OPTION clause
+        compiler._executing = True
+        try:
+            sql, params = compiler.as_sql()
+        except EmptyResultSet:
+            return OrderedDict((name, []) for name in names)
+
+        with compiler.connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            columns = cursor.fetch_column_values()
+
+        converters = compiler.get_converters([s[0] for s in compiler.select[0:compiler.col_count]])
+        for pos, (convs, expression) in converters.items():
+            values = columns[pos]
+            for converter in convs:
+                values = [converter(value, expression, compiler.connection, query.context)
+                    for value in values]
+            columns[pos] = values
+
+        return OrderedDict(zip(names, columns))
+
+    def bulk_load(self, objs, batch_size=None, **options):
+        """
+        Insert objs (any iterable, such as a generator) with
+        Cursor.bulk_copy, one batch at a time. Like bulk_create, save() isn't
+        called, no signals are sent and primary keys are not set. The keyword
+        options of bulk_copy are accepted. Returns a BulkCopyResult.
+
+        The primary keys of objects that have one are inserted. Consecutive
+        objects with and without a primary key are loaded separately.
+        """
+        for parent in self.model._meta.get_parent_list():
+            if parent._meta.concrete_model is not self.model._meta.concrete_model:
+                raise ValueError("Can't bulk load a multi-table inherited model")
+        self._for_write = True
+        connection = connections[self.db]
+        opts = self.model._meta
+        pk = opts.pk
+        quote_name = connection.ops.quote_name
+
+        def has_pk(obj):
+            if obj.pk is None:
+                obj.pk = pk.get_pk_value_on_save(obj)
+            return obj.pk is not None
+
+        def rows(fields, group):
+            for obj in group:
+                row = [
+                    connection.ops.field_params(
+                        field, [field.get_db_prep_save(field.pre_save(obj, True), connection)])[0]
+                    for field in fields
+                ]
+                obj._state.adding = False
+                obj._state.db = self.db
+                yield row
+
+        result = BulkCopyResult(0, 0)
+        with transaction.atomic(using=self.db, savepoint=False):
+            with connection.cursor() as cursor:
+                # Like bulk_create, objects without a primary key leave out
+                # the identity column, instead of inserting NULL into it.
+                for with_pk, group in itertools.groupby(objs, has_pk):
+                    group_options = dict(options)
+                    fields = opts.concrete_fields
+                    if not with_pk:
+                        fields = [f for f in fields if not isinstance(f, AutoField)]
+                    elif isinstance(pk, AutoField):
+                        group_options.setdefault('keep_identity', True)
+                    loaded = cursor.bulk_copy(
+                        quote_name(opts.db_table),
+                        [quote_name(f.column) for f in fields],
+                        rows(fields, group),
+                        batch_size=batch_size,
+                        **group_options
+                    )
+                    result = BulkCopyResult(result.rows + loaded.rows, result.seconds + loaded.seconds)
+        return result
+
+    def bulk_upsert(self, objs, unique_fields, update_fields=None, batch_size=None, return_pks=False):
+        """
+        Insert objs, or update the rows that have the same values for
+        unique_fields, with one MERGE statement per batch. Like bulk_create,
+        save() isn't called and no signals are sent.
+
+        unique_fields -- Names of the fields that identify a row.
+        update_fields -- Names of the fields to update in existing rows
+            (default all inserted fields, except unique_fields).
+        return_pks -- Set the primary keys of objs and return them, in the
+            order of objs, instead of the number of rows.
+        """
+        assert batch_size is None or batch_size > 0
+        for parent in self.model._meta.get_parent_list():
+            if parent._meta.concrete_model is not self.model._meta.concrete_model:
+                raise ValueError("Can't bulk upsert a multi-table inherited model")
+        if not unique_fields:
+            raise ValueError("bulk_upsert requires unique_fields")
+        objs = list(objs)
+        if not objs:
+            return [] if return_pks else 0
+        self._for_write = True
+        connection = connections[self.db]
+        opts = self.model._meta
+
+        def get_field(name):
+            return opts.pk if name == 'pk' else opts.get_field(name)
+
+        unique_fields = [get_field(name) for name in unique_fields]
+        # Primary keys are only inserted when they identify the rows.
+        fields = [
+            f for f in opts.concrete_fields
+            if not isinstance(f, AutoField) or f in unique_fields
+        ]
+        if update_fields is None:
+            update_fields = [f for f in fields if f not in unique_fields and not f.primary_key]
+        else:
+            update_fields = [get_field(name) for name in update_fields]
+
+        # A MERGE statement can have at most 2100 parameters
+        max_batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+        batch_size = min(batch_size, max_batch_size) if batch_size else max_batch_size
+        pks = []
+        rowcount = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for batch in [objs[i:i + batch_size] for i in range(0, len(objs), batch_size)]:
+                query = sql.InsertQuery(self.model)
+                query.insert_values(fields, batch)
+                compiler = query.get_compiler(using=self.db)
+                merge_sql, params = compiler.as_upsert_sql(unique_fields, update_fields, return_pks)
+                with connection.cursor() as cursor:
+                    cursor.execute(merge_sql, params)
+                    if return_pks:
+                        pks.extend(connection.ops.fetch_returned_insert_ids(cursor))
+                    else:
+                        rowcount += cursor.rowcount
+
+        if not return_pks:
+            return rowcount
+        for obj, pk in zip(objs, pks):
+            obj.pk = pk
+            obj._state.adding = False
+            obj._state.db = self.db
+        return pks
+
+    def bulk_update(self, objs, fields, batch_size=None):
+        """
+        Update the given fields of objs with one UPDATE statement per batch,
+        which joins the table to the values of the objects on the primary
+        key. Like bulk_create, save() isn't called and no signals are sent.
+        Returns the number of updated rows.
+        """
+        assert batch_size is None or batch_size > 0
+        if not fields:
+            raise ValueError("bulk_update requires fields")
+        opts = self.model._meta
+        fields = [opts.get_field(name) for name in fields]
+        if any(not f.concrete or f.many_to_many for f in fields):
+            raise ValueError("bulk_update can only update concrete fields")
+        if any(f.primary_key for f in fields):
+            raise ValueError("bulk_update can't update primary keys")
+        objs = list(objs)
+        if any(obj.pk is None for obj in objs):
+            raise ValueError("bulk_update requires objects with a primary key")
+        if not objs:
+            return 0
+        self._for_write = True
+        connection = connections[self.db]
+
+        # Fields of multi-table inherited parents are updated in their table.
+        model_fields = OrderedDict()
+        for field in fields:
+            model_fields.setdefault(field.model._meta.concrete_model, []).append(field)
+
+        rowcount = 0
+        with transaction.atomic(using=self.db, savepoint=False):
+            for model, update_fields in model_fields.items():
+                fields = [model._meta.pk] + update_fields
+                # A statement can have at most 2100 parameters
+                size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+                if batch_size:
+                    size = min(batch_size, size)
+                for batch in [objs[i:i + size] for i in range(0, len(objs), size)]:
+                    query = sql.InsertQuery(model)
+                    # raw to update the values of the objects, without pre_save
+                    query.insert_values(fields, batch, raw=True)
+                    update_sql, params = query.get_compiler(using=self.db).as_update_sql()
+                    with connection.cursor() as cursor:
+                        cursor.execute(update_sql, params)
+                        rowcount += cursor.rowcount
+        return rowcount
+
+    def dequeue(self, n=1):
+        """
+        Delete and return the first n objects of the queryset with a single
+        DELETE ... OUTPUT statement. Rows that are locked by other
+        transactions are skipped, so that concurrent workers neither block
+        each other nor get the same objects. The objects are returned in no
+        particular order. Unlike delete(), no signals are sent and related
+        objects are not collected.
+        """
+        assert n > 0
+        assert self.query.can_filter(), "Cannot use 'limit' or 'offset' with dequeue."
+        for parent in self.model._meta.get_parent_list():
+            if parent._meta.concrete_model is not self.model._meta.concrete_model:
+                raise ValueError("Can't dequeue a multi-table inherited model")
+        self._for_write = True
+        connection = connections[self.db]
+        opts = self.model._meta
+        qn = connection.ops.quote_name
+
+        # The keys of the first n rows that aren't locked, which stay locked
+        # by this statement until they are deleted.
+        keys = self.values('pk').with_hints(('ROWLOCK', 'READPAST', 'UPDLOCK'))[:n]
+        try:
+            keys_sql, params = keys.query.get_compiler(self.db).as_sql()
+        except EmptyResultSet:
+            return []
+
+        query = sql.Query(self.model)
+        compiler = query.get_compiler(self.db)
+        compiler.setup_query()
+        columns = [s[0] for s in compiler.select]
+        table = qn(opts.db_table)
+        output = ', '.join('DELETED.' + qn(col.target.column) for col in columns)
+
+        def dequeue_sql():
+            delete_sql = (
+                'DELETE FROM {table} WITH (ROWLOCK, READPAST) OUTPUT {output} '
+                'WHERE {table}.{pk} IN ({keys})'
+            )
+            if not connection.ops.has_triggers(opts.db_table):
+                return delete_sql.format(table=table, output=output,
+                    pk=qn(opts.pk.column), keys=keys_sql)
+            # The rows of a table with triggers can only be output INTO a
+            # table variable. NOCOUNT ON to prevent additional trigger
+            # related resultsets.
+            return 'SET NOCOUNT ON;{declare_table_var};{sql};{select}'.format(
+                declare_table_var='DECLARE @sqlserver_ado_dequeued table ({0})'.format(', '.join(
+                    '{0} {1}'.format(
+                        qn(col.target.column),
+                        _re_data_type_terminator.split(col.target.db_type(connection))[0],
+                    )
+                    for col in columns
+                )),
+                sql=delete_sql.format(table=table, output=output + ' INTO @sqlserver_ado_dequeued',
+                    pk=qn(opts.pk.column), keys=keys_sql),
+                select='SELECT * FROM @sqlserver_ado_dequeued',
+            )
+
+        with connection.cursor() as cursor:
+            try:
+                cursor.execute(dequeue_sql(), params)
+            except DatabaseError:
+                if not connection.ops.triggers_created(opts.db_table):
+                    raise
+                # Retry with OUTPUT INTO a table variable
+                cursor.execute(dequeue_sql(), params)
+            rows = cursor.fetchall()
+
+        converters = compiler.get_converters(columns)
+        names = [col.target.attname for col in columns]
+        objs = []
+        for row in rows:
+            if converters:
+                row = compiler.apply_converters(row, converters)
+            objs.append(self.model.from_db(self.db, names, row))
+        return objs
+
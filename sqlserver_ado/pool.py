@@ -0,0 +1,311 @@
+"""
+Process-wide pool of open ADO connections.
+
+Opening an ADO connection initializes COM, dispatches a new
+``ADODB.Connection``, performs the login handshake and introspects the
+connection properties. The pool keeps a set of live ``dbapi.Connection``
+objects per connection string so that ``DatabaseWrapper`` can borrow an
+already open connection instead of paying that cost on every request.
+
+Pooled connections are created in the COM multithreaded apartment so that
+they may be handed to any thread of the process. ADO registers its objects
+with the "Both" threading model, which allows this. Threads that already
+joined a single-threaded apartment can't use the pool.
+"""
+from __future__ import absolute_import, unicode_literals
+
+import collections
+import threading
+import time
+
+from . import dbapi
+from .ado_consts import adStateOpen
+
+__all__ = [
+    'ConnectionPool',
+    'PoolTimeout',
+    'close_all',
+    'get_pool',
+]
+
+# COM error raised by CoInitializeEx when the thread has already joined a
+# different apartment.
+RPC_E_CHANGED_MODE = -2147417850
+
+
+class PoolTimeout(dbapi.OperationalError):
+    """Raised when no connection could be borrowed before the wait timeout."""
+    pass
+
+
+_com_initialized = threading.local()
+
+
+def _ensure_com_initialized():
+    """
+    Initialize COM once for the calling thread, in the multithreaded
+    apartment. Raises InterfaceError if the thread already joined a
+    single-threaded apartment, whose connections can't be shared with other
+    threads.
+    """
+    if getattr(_com_initialized, 'value', False):
+        return
+    # Inner import to make this module importable on non-Windows platforms.
+    import pythoncom
+    try:
+        pythoncom.CoInitializeEx(pythoncom.COINIT_MULTITHREADED)
+    except pythoncom.com_error as e:
+        if e.args[0] != RPC_E_CHANGED_MODE:
+            raise
+        raise dbapi.InterfaceError(
+            "Connection pooling can't be used from a thread in a COM "
+            "single-threaded apartment")
+    _com_initialized.value = True
+
+
+class ConnectionPool(object):
+    """
+    A bounded pool of ``dbapi.Connection`` objects for a single connection
+    string.
+
+    min_size -- Number of connections kept open even when idle.
+    max_size -- Maximum number of connections, borrowed or idle.
+    max_idle -- Seconds an idle connection is kept before it is closed
+        (None to never close idle connections).
+    max_lifetime -- Seconds after which a connection is closed instead of
+        being returned to the pool (None for no limit).
+    health_check -- When True, run a trivial query on checkout and discard
+        the connection if it fails.
+    wait_timeout -- Seconds to wait for a connection when the pool is
+        exhausted before raising PoolTimeout.
+
+    Any other keyword arguments are passed to dbapi.connect.
+    """
+    def __init__(self, connection_string, min_size=0, max_size=10, max_idle=300,
+            max_lifetime=3600, health_check=True, wait_timeout=30, **connect_kwargs):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        if min_size > max_size:
+            raise ValueError("min_size cannot be larger than max_size")
+
+        self.connection_string = connection_string
+        self.connect_kwargs = connect_kwargs
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self.max_lifetime = max_lifetime
+        self.health_check = health_check
+        self.wait_timeout = wait_timeout
+
+        # Idle connections, most recently returned on the right.
+        self._idle = collections.deque()
+        # Number of open connections owned by the pool, borrowed or idle.
+        self._size = 0
+        self._cond = threading.Condition(threading.Lock())
+
+    def __repr__(self):
+        return '<ConnectionPool: %s size=%d idle=%d>' % (
+            dbapi.mask_connection_string_password(self.connection_string),
+            self._size, len(self._idle))
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def _open(self):
+        _ensure_com_initialized()
+        conn = dbapi.connect(self.connection_string, com_init=False, **self.connect_kwargs)
+        conn._pool = self
+        conn._pool_created_at = time.time()
+        return conn
+
+    def _discard(self, conn):
+        """Close a connection that is no longer wanted by the pool."""
+        conn._pool = None
+        try:
+            conn._close_connection()
+        except Exception:
+            pass
+        conn.adoConn = None
+
+    def _expired(self, conn, now):
+        return (self.max_lifetime is not None and
+            now - conn._pool_created_at > self.max_lifetime)
+
+    def _is_healthy(self, conn):
+        if conn.adoConn is None or conn.adoConn.State != adStateOpen:
+            return False
+        if not self.health_check:
+            return True
+        try:
+            conn.adoConn.Execute('SELECT 1')
+        except Exception:
+            return False
+        return True
+
+    def _evict_idle(self, now):
+        """Remove idle connections that exceeded max_idle or max_lifetime."""
+        evicted = []
+        keep = collections.deque()
+        while self._idle:
+            conn, returned_at = self._idle.popleft()
+            too_idle = (self.max_idle is not None and
+                now - returned_at > self.max_idle and
+                self._size - len(evicted) > self.min_size)
+            if too_idle or self._expired(conn, now):
+                evicted.append(conn)
+            else:
+                keep.append((conn, returned_at))
+        self._idle = keep
+        self._size -= len(evicted)
+        return evicted
+
+    def acquire(self):
+        """Borrow a connection from the pool, opening a new one if needed."""
+        deadline = None
+        while True:
+            with self._cond:
+                evicted = self._evict_idle(time.time())
+                conn = None
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                elif self._size < self.max_size:
+                    # Reserve the slot before opening outside of the lock.
+                    self._size += 1
+                else:
+                    if deadline is None and self.wait_timeout is not None:
+                        deadline = time.time() + self.wait_timeout
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise PoolTimeout(
+                            "Timed out waiting for a connection from %r" % self)
+                    self._cond.wait(remaining)
+                    continue
+
+            for old in evicted:
+                self._discard(old)
+
+            if conn is None:
+                try:
+                    conn = self._open()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                conn._pool_borrowed = True
+                return conn
+
+            try:
+                _ensure_com_initialized()
+            except Exception:
+                self._return_idle(conn)
+                raise
+            if self._is_healthy(conn):
+                conn._pool_borrowed = True
+                return conn
+
+            # Stale connection, drop it and try again.
+            with self._cond:
+                self._size -= 1
+            self._discard(conn)
+
+    def _return_idle(self, conn):
+        with self._cond:
+            self._idle.append((conn, time.time()))
+            self._cond.notify()
+
+    def release(self, conn):
+        """
+        Return a borrowed connection to the pool. Any open transaction is
+        rolled back and the connection's original transaction mode restored.
+        Connections that cannot be reset, or have exceeded max_lifetime, are
+        closed.
+        """
+        if conn._pool is not self:
+            raise dbapi.InterfaceError("Connection does not belong to %r" % self)
+        if not conn._pool_borrowed:
+            raise dbapi.InterfaceError("Connection was already returned to %r" % self)
+        conn._pool_borrowed = False
+
+        now = time.time()
+        keep = not self._expired(conn, now)
+        if keep:
+            try:
+                conn.reset()
+            except Exception:
+                keep = False
+
+        with self._cond:
+            if keep:
+                self._idle.append((conn, now))
+            else:
+                self._size -= 1
+            self._cond.notify()
+
+        if not keep:
+            self._discard(conn)
+
+    def _forget(self, conn):
+        """Account for a borrowed connection that was garbage collected."""
+        conn._pool = None
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    def fill(self):
+        """Open connections until the pool holds at least min_size."""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            self._return_idle(conn)
+
+    def close(self):
+        """Close all idle connections. Borrowed connections are closed when returned."""
+        with self._cond:
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self.min_size = 0
+        for conn in idle:
+            self._discard(conn)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_string, **kwargs):
+    """
+    Return the process-wide pool for connection_string and the given keyword
+    arguments, creating it if it does not already exist. Callers that pass
+    different arguments, such as the options of another database alias, get
+    different pools.
+    """
+    key = (connection_string, frozenset(kwargs.items()))
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ConnectionPool(connection_string, **kwargs)
+    return pool
+
+
+def close_all():
+    """Close the idle connections of every pool and forget the pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
@@ -0,0 +1,88 @@
+"""
+Delayed durability transactions.
+
+A transaction that is committed with delayed durability returns as soon as
+its log records are in the log buffer, instead of waiting for them to be
+written to disk. A crash can lose the most recent of these transactions, so
+they should only be used for data that can be written again, such as bulk
+loads. Delayed durability requires SQL Server 2014 and a database whose
+DELAYED_DURABILITY setting is ALLOWED.
+"""
+from __future__ import absolute_import, unicode_literals
+
+from django.db import transaction
+from django.db.transaction import TransactionManagementError
+from django.utils.decorators import ContextDecorator
+
+__all__ = [
+    'database_durability',
+    'delayed_durability',
+]
+
+
+def database_durability(using=None):
+    """
+    Return the DELAYED_DURABILITY setting of the database: 'DISABLED' when
+    all transactions are fully durable, 'ALLOWED' when a commit can ask for
+    delayed durability, or 'FORCED' when all transactions use it.
+    """
+    connection = transaction.get_connection(using)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT delayed_durability_desc FROM sys.databases WHERE database_id = DB_ID()")
+        return cursor.fetchone()[0]
+
+
+class DelayedDurability(ContextDecorator):
+    """
+    Atomic block whose transaction is committed with delayed durability.
+    Nested in another atomic block, it creates a savepoint and the outer
+    transaction determines the durability. Raises TransactionManagementError
+    when a transaction that was begun outside of atomic blocks is open,
+    because that transaction can't be committed with delayed durability.
+    """
+    def __init__(self, using):
+        self.using = using
+        self.atomics = []
+
+    def __enter__(self):
+        connection = transaction.get_connection(self.using)
+        atomic = transaction.atomic(self.using)
+        previous = None
+        if not connection.in_atomic_block:
+            # The DB-API connection begins the transaction with BEGIN
+            # TRANSACTION when delayed_durability is set.
+            connection.ensure_connection()
+            if connection.connection._in_transaction and not connection.connection._delayed_transaction:
+                raise TransactionManagementError(
+                    "delayed_durability can't be used in a transaction that is already open.")
+            previous = connection.connection.delayed_durability
+            connection.connection.delayed_durability = True
+        self.atomics.append((atomic, connection, previous))
+        try:
+            atomic.__enter__()
+        except Exception:
+            self._restore()
+            raise
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            return self.atomics[-1][0].__exit__(exc_type, exc_value, traceback)
+        finally:
+            self._restore()
+
+    def _restore(self):
+        _, connection, previous = self.atomics.pop()
+        if previous is not None and connection.connection is not None:
+            connection.connection.delayed_durability = previous
+
+
+def delayed_durability(using=None):
+    """
+    Like django.db.transaction.atomic, but the transaction is committed with
+    delayed durability. Can be used as a decorator or a context manager.
+    """
+    # Bare decorator: @delayed_durability
+    if callable(using):
+        return DelayedDurability(None)(using)
+    return DelayedDurability(using)
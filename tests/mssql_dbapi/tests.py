@@ -1,175 +1,552 @@
-from __future__ import absolute_import
-
-import unittest
-
-# Base is used to get connection string using Django settings
-from sqlserver_ado import base
-# Internal dbapi module
-from sqlserver_ado import dbapi
-
-# Base unit test
-from . import dbapi20
-
-class DbApiTest(dbapi20.DatabaseAPI20Test):
-    driver = dbapi
-    connect_args = [ base.connection_string_from_settings() ]
-
-    def _try_run(self, *args):
-        con = self._connect()
-        cur = None
-        try:
-            cur = con.cursor()
-            for arg in args:
-                cur.execute(arg)
-        finally:
-            try:
-                if cur is not None:
-                    cur.close()
-            except: pass
-            con.close()
-
-    def _try_run2(self, cur, *args):
-        for arg in args:
-            cur.execute(arg)
-
-    # This should create the "lower" sproc.
-    def _callproc_setup(self, cur):
-        self.lower_func = self.lowerfunc = 'to_lower'
-        self._try_run2(cur,
-            """IF OBJECT_ID(N'[dbo].[to_lower]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[to_lower]""",
-            """
-CREATE PROCEDURE to_lower
-    @input nvarchar(max)
-AS
-BEGIN
-    select LOWER(@input)
-END
-""",
-            )
-
-    # This should create a sproc with a return value.
-    def _retval_setup(self, cur):
-        self._try_run2(cur,
-            """IF OBJECT_ID(N'[dbo].[add_one]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[add_one]""",
-            """
-CREATE PROCEDURE add_one (@input int)
-AS
-BEGIN
-    return @input+1
-END
-""",
-            )
-
-    def test_retval(self):
-        con = self._connect()
-        try:
-            cur = con.cursor()
-            self._retval_setup(cur)
-            values = cur.callproc('add_one',(1,))
-            self.assertEqual(values[0], 1, 'input parameter should be left unchanged: %s' % (values[0],))
-
-            self.assertEqual(cur.description, None,"No resultset was expected.")
-            self.assertEqual(cur.return_value, 2, "Invalid return value: %s" % (cur.return_value,))
-
-        finally:
-            con.close()
-
-    # This should create a sproc with an output parameter.
-    def _outparam_setup(self, cur):
-        self._try_run2(cur,
-            """IF OBJECT_ID(N'[dbo].[add_one_out]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[add_one_out]""",
-            """
-CREATE PROCEDURE add_one_out (@input int, @output int OUTPUT)
-AS
-BEGIN
-    SET @output = @input+1
-END
-""",
-            )
-
-    def test_outparam(self):
-        con = self._connect()
-        try:
-            cur = con.cursor()
-            self._outparam_setup(cur)
-            values = cur.callproc('add_one_out',(1,None))
-            self.assertEqual(len(values), 2, 'expected 2 parameters')
-            self.assertEqual(values[0], 1, 'input parameter should be unchanged')
-            self.assertEqual(values[1], 2, 'output parameter should get new values')
-        finally:
-            con.close()
-
-    # Don't need setoutputsize tests.
-    def test_setoutputsize(self):
-        pass
-
-    def help_nextset_setUp(self,cur):
-        self._try_run2(cur,
-            """IF OBJECT_ID(N'[dbo].[more_than_one]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[more_than_one]""",
-            """
-create procedure more_than_one
-as
-begin
-    select 1,2,3
-    select 4,5,6
-end
-""",
-            )
-
-    def help_nextset_tearDown(self,cur):
-        pass
-
-    def test_ExceptionsAsConnectionAttributes(self):
-        pass
-
-    def test_select_decimal_zero(self):
-        from decimal import Decimal
-
-        con = self._connect()
-        try:
-            expected = (
-                Decimal('0.00'),
-                Decimal('0.0'),
-                Decimal('-0.00'))
-
-            cur = con.cursor()
-            cur.execute("SELECT %s as A, %s as B, %s as C", expected)
-
-            result = cur.fetchall()
-            self.assertEqual(result[0], expected)
-        finally:
-            con.close()
-
-class MaskConnectionStringPasswordTest(unittest.TestCase):
-
-    def test_mask(self):
-        """
-        Ensure the mask function does the proper substitution.
-        """
-        base_conn_string = 'SOURCE=127.0.0.1\\ss2008;Initial Catalog=MyDatabase;UID=testuser;%s=%s;PROVIDER=SQLNCLI10;DataTypeCompatibility=80;MARS Connection=True;DataTypeCompatibility=80;MARS Connection=True;'
-        names = ['pwd', 'Pwd', 'PWD', 'password', 'PASSWORD', 'Password']
-        passwords = ['', '12345', 'SLDFKJD**$#$', 'asd asdf']
-        for n in names:
-            for p in passwords:
-                conn_str = dbapi.mask_connection_string_password(
-                    base_conn_string % (n, p), mask='*')
-                self.assertNotIn('%s=%s;' % (n,p), conn_str)
-                self.assertIn('%s=*;' % n, conn_str)
-
-    def test_connection_error(self):
-        """
-        Attempt an invalid connection and check the error for a password.
-        """
-        from django.conf import settings
-
-        databases = {}
-        databases.update(settings.DATABASES['default'])
-        databases['USER'] = 'user'
-        databases['PASSWORD'] = 'myPass'
-
-        connection_string = base.make_connection_string(databases)
-
-        with self.assertRaises(dbapi.OperationalError) as err:
-            dbapi.connect(connection_string)
-        self.assertNotIn('PWD=myPass;', str(err.exception))
-        self.assertIn('PWD=******;', str(err.exception))
+from __future__ import absolute_import
+
+import unittest
+
+# Base is used to get connection string using Django settings
+from sqlserver_ado import base
+# Internal dbapi module
+from sqlserver_ado import dbapi
+from sqlserver_ado import pool
+
+# Base unit test
+from . import dbapi20
+
+class DbApiTest(dbapi20.DatabaseAPI20Test):
+    driver = dbapi
+    connect_args = [ base.connection_string_from_settings() ]
+
+    def _try_run(self, *args):
+        con = self._connect()
+        cur = None
+        try:
+            cur = con.cursor()
+            for arg in args:
+                cur.execute(arg)
+        finally:
+            try:
+                if cur is not None:
+                    cur.close()
+            except: pass
+            con.close()
+
+    def _try_run2(self, cur, *args):
+        for arg in args:
+            cur.execute(arg)
+
+    # This should create the "lower" sproc.
+    def _callproc_setup(self, cur):
+        self.lower_func = self.lowerfunc = 'to_lower'
+        self._try_run2(cur,
+            """IF OBJECT_ID(N'[dbo].[to_lower]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[to_lower]""",
+            """
+CREATE PROCEDURE to_lower
+    @input nvarchar(max)
+AS
+BEGIN
+    select LOWER(@input)
+END
+""",
+            )
+
+    # This should create a sproc with a return value.
+    def _retval_setup(self, cur):
+        self._try_run2(cur,
+            """IF OBJECT_ID(N'[dbo].[add_one]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[add_one]""",
+            """
+CREATE PROCEDURE add_one (@input int)
+AS
+BEGIN
+    return @input+1
+END
+""",
+            )
+
+    def test_retval(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self._retval_setup(cur)
+            values = cur.callproc('add_one',(1,))
+            self.assertEqual(values[0], 1, 'input parameter should be left unchanged: %s' % (values[0],))
+
+            self.assertEqual(cur.description, None,"No resultset was expected.")
+            self.assertEqual(cur.return_value, 2, "Invalid return value: %s" % (cur.return_value,))
+
+        finally:
+            con.close()
+
+    # This should create a sproc with an output parameter.
+    def _outparam_setup(self, cur):
+        self._try_run2(cur,
+            """IF OBJECT_ID(N'[dbo].[add_one_out]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[add_one_out]""",
+            """
+CREATE PROCEDURE add_one_out (@input int, @output int OUTPUT)
+AS
+BEGIN
+    SET @output = @input+1
+END
+""",
+            )
+
+    def test_outparam(self):
+        con = self._connect()
+        try:
+            cur = con.cursor()
+            self._outparam_setup(cur)
+            values = cur.callproc('add_one_out',(1,None))
+            self.assertEqual(len(values), 2, 'expected 2 parameters')
+            self.assertEqual(values[0], 1, 'input parameter should be unchanged')
+            self.assertEqual(values[1], 2, 'output parameter should get new values')
+        finally:
+            con.close()
+
+    # Don't need setoutputsize tests.
+    def test_setoutputsize(self):
+        pass
+
+    def help_nextset_setUp(self,cur):
+        self._try_run2(cur,
+            """IF OBJECT_ID(N'[dbo].[more_than_one]', N'P') IS NOT NULL DROP PROCEDURE [dbo].[more_than_one]""",
+            """
+create procedure more_than_one
+as
+begin
+    select 1,2,3
+    select 4,5,6
+end
+""",
+            )
+
+    def help_nextset_tearDown(self,cur):
+        pass
+
+    def test_ExceptionsAsConnectionAttributes(self):
+        pass
+
+    def test_select_decimal_zero(self):
+        from decimal import Decimal
+
+        con = self._connect()
+        try:
+            expected = (
+                Decimal('0.00'),
+                Decimal('0.0'),
+                Decimal('-0.00'))
+
+            cur = con.cursor()
+            cur.execute("SELECT %s as A, %s as B, %s as C", expected)
+
+            result = cur.fetchall()
+            self.assertEqual(result[0], expected)
+        finally:
+            con.close()
+
+class MaskConnectionStringPasswordTest(unittest.TestCase):
+
+    def test_mask(self):
+        """
+        Ensure the mask function does the proper substitution.
+        """
+        base_conn_string = 'SOURCE=127.0.0.1\\ss2008;Initial Catalog=MyDatabase;UID=testuser;%s=%s;PROVIDER=SQLNCLI10;DataTypeCompatibility=80;MARS Connection=True;DataTypeCompatibility=80;MARS Connection=True;'
+        names = ['pwd', 'Pwd', 'PWD', 'password', 'PASSWORD', 'Password']
+        passwords = ['', '12345', 'SLDFKJD**$#$', 'asd asdf']
+        for n in names:
+            for p in passwords:
+                conn_str = dbapi.mask_connection_string_password(
+                    base_conn_string % (n, p), mask='*')
+                self.assertNotIn('%s=%s;' % (n,p), conn_str)
+                self.assertIn('%s=*;' % n, conn_str)
+
+    def test_connection_error(self):
+        """
+        Attempt an invalid connection and check the error for a password.
+        """
+        from django.conf import settings
+
+        databases = {}
+        databases.update(settings.DATABASES['default'])
+        databases['USER'] = 'user'
+        databases['PASSWORD'] = 'myPass'
+
+        connection_string = base.make_connection_string(databases)
+
+        with self.assertRaises(dbapi.OperationalError) as err:
+            dbapi.connect(connection_string)
+        self.assertNotIn('PWD=myPass;', str(err.exception))
+        self.assertIn('PWD=******;', str(err.exception))
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.pool = pool.ConnectionPool(base.connection_string_from_settings(),
+            max_size=2, wait_timeout=0)
+
+    def tearDown(self):
+        self.pool.close()
+
+    def test_reuse(self):
+        con = self.pool.acquire()
+        con.close()
+        self.assertEqual(self.pool.idle, 1)
+        self.assertIs(self.pool.acquire(), con)
+        self.assertEqual(self.pool.size, 1)
+
+    def test_max_size(self):
+        cons = [self.pool.acquire(), self.pool.acquire()]
+        with self.assertRaises(pool.PoolTimeout):
+            self.pool.acquire()
+        cons[0].close()
+        self.assertIs(self.pool.acquire(), cons[0])
+
+    def test_release_twice(self):
+        con = self.pool.acquire()
+        con.close()
+        with self.assertRaises(dbapi.InterfaceError):
+            con.close()
+        self.assertEqual(self.pool.idle, 1)
+
+    def test_get_pool_by_options(self):
+        connection_string = base.connection_string_from_settings()
+        try:
+            self.assertIs(pool.get_pool(connection_string, max_size=2),
+                pool.get_pool(connection_string, max_size=2))
+            self.assertIsNot(pool.get_pool(connection_string, use_transactions=True),
+                pool.get_pool(connection_string, use_transactions=False))
+        finally:
+            pool.close_all()
+
+    def test_max_lifetime(self):
+        self.pool.max_lifetime = 0
+        con = self.pool.acquire()
+        con.close()
+        self.assertEqual(self.pool.size, 0)
+        self.assertIsNone(con.adoConn)
+
+    def test_release_rolls_back(self):
+        con = self.pool.acquire()
+        con.set_autocommit(False)
+        cur = con.cursor()
+        cur.execute("CREATE TABLE #pool_test (id int)")
+        cur.execute("INSERT INTO #pool_test VALUES (1)")
+        con.close()
+
+        con = self.pool.acquire()
+        self.assertEqual(con.supportsTransactions, con.useTransactions)
+        cur = con.cursor()
+        cur.execute("SELECT @@TRANCOUNT")
+        self.assertEqual(cur.fetchone()[0], 1 if con.useTransactions else 0)
+        con.close()
+
+
+class CommandCacheTest(unittest.TestCase):
+    def test_lru(self):
+        cache = dbapi.CommandCache(2)
+        self.assertIsNone(cache.checkout('a'))
+        cache.checkin('a', 1)
+        cache.checkin('b', 2)
+        cache.checkin('c', 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.checkout('a'))
+        self.assertEqual(cache.checkout('b'), 2)
+        self.assertEqual(cache.stats(), {
+            'size': 1, 'maxsize': 2, 'hits': 1, 'misses': 2, 'evictions': 1,
+        })
+
+    def test_execute_reuses_command(self):
+        con = dbapi.connect(base.connection_string_from_settings(), command_cache_size=10)
+        try:
+            cur = con.cursor()
+            for i in range(3):
+                cur.execute("SELECT %s + 1", [i])
+                self.assertEqual(cur.fetchone()[0], i + 1)
+            # A different parameter type is a different prepared command.
+            cur.execute("SELECT %s + 1", [1.5])
+            cur.close()
+            self.assertEqual(con.command_cache.hits, 2)
+            self.assertEqual(con.command_cache.misses, 2)
+            self.assertEqual(len(con.command_cache), 2)
+        finally:
+            con.close()
+
+
+class TypedParametersTest(unittest.TestCase):
+    def test_bucketed_sizes(self):
+        self.assertEqual(dbapi._parameter_size('abc'), 3)
+        self.assertEqual(dbapi._parameter_size('abc', True), 4000)
+        self.assertEqual(dbapi._parameter_size('', True), 4000)
+        self.assertEqual(dbapi._parameter_size(None, True), 4000)
+        self.assertEqual(dbapi._parameter_size(dbapi.BinaryNull(), True), 8000)
+        self.assertEqual(dbapi._parameter_size('a' * 4001, True), dbapi._nvarchar_max_size)
+        self.assertEqual(dbapi._parameter_size(b'a' * 8000, True), 8000)
+        self.assertIsNone(dbapi._parameter_size(1, True))
+
+    def test_stable_signature(self):
+        con = dbapi.connect(base.connection_string_from_settings(),
+            typed_parameters=True, track_statement_signatures=True)
+        try:
+            cur = con.cursor()
+            for value in ['a', 'abc', '', None]:
+                cur.execute("SELECT %s", [value])
+                self.assertEqual(cur.fetchone()[0], value)
+            self.assertEqual(len(con.statement_signatures), 1)
+        finally:
+            con.close()
+
+
+class NativeParametersTest(unittest.TestCase):
+    def test_native_ado_type(self):
+        import datetime
+        import uuid
+        from decimal import Decimal
+
+        self.assertEqual(dbapi._native_ado_type(Decimal('1.5')), dbapi.adNumeric)
+        self.assertEqual(dbapi._native_ado_type(uuid.uuid4()), dbapi.adGUID)
+        # Dates and times are always sent as strings
+        self.assertIsNone(dbapi._native_ado_type(datetime.date(2016, 1, 2)))
+        self.assertIsNone(dbapi._native_ado_type(datetime.datetime(2016, 1, 2)))
+        self.assertIsNone(dbapi._native_ado_type(datetime.time(1, 2)))
+        # Values that would lose precision use the string fallback
+        self.assertIsNone(dbapi._native_ado_type(Decimal('NaN')))
+        self.assertIsNone(dbapi._native_ado_type(Decimal('1E+40')))
+        self.assertIsNone(dbapi._native_ado_type(1))
+
+    def test_decimal_precision_scale(self):
+        from decimal import Decimal
+
+        pairs = [
+            (Decimal('123.4500'), (7, 4)),
+            (Decimal('-0.00'), (2, 2)),
+            (Decimal('0.001'), (3, 3)),
+            (Decimal('2.82E+3'), (4, 0)),
+            (Decimal('42'), (2, 0)),
+        ]
+        for value, expected in pairs:
+            self.assertEqual(dbapi._decimal_precision_scale(value), expected)
+        self.assertEqual(dbapi._decimal_precision_scale(Decimal('1.25'), True), (38, 2))
+
+    def test_roundtrip(self):
+        import datetime
+        import uuid
+        from decimal import Decimal
+
+        values = [
+            Decimal('123.4500'),
+            datetime.datetime(2016, 1, 2, 3, 4, 5),
+        ]
+        con = dbapi.connect(base.connection_string_from_settings(), native_parameters=True)
+        try:
+            cur = con.cursor()
+            # The datetime is sent as a string, which is only converted
+            # back to a datetime by a typed expression.
+            cur.execute("SELECT %s, CAST(%s AS datetime2)", values)
+            row = cur.fetchone()
+            self.assertEqual(row[0], values[0])
+            self.assertEqual(row[1], values[1])
+
+            value = uuid.uuid4()
+            cur.execute("SELECT CAST(%s AS nvarchar(40))", [value])
+            self.assertEqual(uuid.UUID(cur.fetchone()[0]), value)
+        finally:
+            con.close()
+
+
+class ColumnConvertersTest(unittest.TestCase):
+    def test_column_converters(self):
+        from decimal import Decimal
+
+        description = [
+            ('s', dbapi.adVarWChar, None, 10, 0, 0, True),
+            ('i', dbapi.adInteger, None, 4, 10, 0, True),
+            ('d', dbapi.adNumeric, None, 19, 10, 2, True),
+            ('t', dbapi.adDBTimeStamp, None, 16, 27, 7, True),
+        ]
+        converters = dbapi._column_converters(description)
+        # Strings are used as returned by ADO
+        self.assertIsNone(converters[0])
+        self.assertEqual(converters[1]('12'), 12)
+        self.assertEqual(converters[2]('1.50'), Decimal('1.50'))
+        self.assertIn(converters[3], (dbapi._cvtComDateUTC, dbapi._com_date_to_datetime))
+
+    def test_fetch_converts_columns(self):
+        from decimal import Decimal
+
+        con = dbapi.connect(base.connection_string_from_settings())
+        try:
+            cur = con.cursor()
+            cur.execute("SELECT N'a', CAST(1.50 AS decimal(5, 2)), NULL UNION ALL "
+                "SELECT N'b', NULL, 2")
+            self.assertEqual(cur.fetchall(), (
+                ('a', Decimal('1.50'), None),
+                ('b', None, 2),
+            ))
+        finally:
+            con.close()
+
+
+class FetchBufferTest(unittest.TestCase):
+    def test_buffered_fetch(self):
+        con = dbapi.connect(base.connection_string_from_settings(), fetch_buffer_rows=3)
+        try:
+            cur = con.cursor()
+            cur.execute("SELECT TOP 7 number FROM master..spt_values "
+                "WHERE type = 'P' ORDER BY number; SELECT 42")
+            self.assertEqual(cur.fetchone(), (0,))
+            self.assertEqual(cur.fetchmany(2), ((1,), (2,)))
+            self.assertEqual([row[0] for row in cur], [3, 4, 5, 6])
+            self.assertIsNone(cur.fetchone())
+            self.assertEqual(list(cur.fetchall()), [])
+
+            # Buffered rows of the first result set are discarded.
+            self.assertTrue(cur.nextset())
+            self.assertEqual(cur.fetchone(), (42,))
+        finally:
+            con.close()
+
+    def test_stream(self):
+        con = dbapi.connect(base.connection_string_from_settings())
+        try:
+            cur = con.cursor()
+            cur.stream_cache_size = 2
+            cur.execute("SELECT TOP 5 number FROM master..spt_values "
+                "WHERE type = 'P' ORDER BY number")
+            self.assertEqual(cur.rs.CacheSize, 2)
+            self.assertEqual([row[0] for row in cur], [0, 1, 2, 3, 4])
+        finally:
+            con.close()
+
+
+class ExecuteManyTest(unittest.TestCase):
+    def test_batched_rowcount(self):
+        con = dbapi.connect(base.connection_string_from_settings())
+        try:
+            cur = con.cursor()
+            cur.execute("CREATE TABLE #executemany (id int, a nvarchar(10))")
+            cur.executemany("INSERT INTO #executemany (id, a) VALUES (%s, %s)",
+                [(i, 'a') for i in range(1500)])
+            self.assertEqual(cur.rowcount, 1500)
+            cur.executemany("UPDATE #executemany SET a = %s WHERE id = %s",
+                (('b', i) for i in range(1200)))
+            self.assertEqual(cur.rowcount, 1200)
+            cur.executemany("DELETE FROM #executemany WHERE id = %s",
+                [(i,) for i in range(10)] + [(-1,)])
+            self.assertEqual(cur.rowcount, 10)
+            self.assertIsNone(cur.description)
+            cur.execute("SELECT COUNT(*) FROM #executemany WHERE a = 'b'")
+            self.assertEqual(cur.fetchone()[0], 1190)
+        finally:
+            con.close()
+
+    def test_derived_table_values(self):
+        con = dbapi.connect(base.connection_string_from_settings())
+        try:
+            cur = con.cursor()
+            cur.execute("CREATE TABLE #executemany (id int)")
+            cur.executemany("INSERT INTO #executemany (id) SELECT x FROM (VALUES (%s)) v(x)",
+                [(i,) for i in range(3)])
+            cur.execute("SELECT COUNT(*) FROM #executemany")
+            self.assertEqual(cur.fetchone()[0], 3)
+        finally:
+            con.close()
+
+    def test_batch_formatter(self):
+        def batch(operation):
+            formatter = dbapi._executemany_batch_formatter(operation)
+            return formatter and formatter(2)[0]
+
+        self.assertEqual(batch("INSERT INTO t (a, b) VALUES (%s, ')')"),
+            "INSERT INTO t (a, b) VALUES (%s, ')'),(%s, ')')")
+        self.assertEqual(batch("INSERT INTO t (a) VALUES (%s), (%s)"),
+            "INSERT INTO t (a) VALUES (%s), (%s),(%s), (%s)")
+        self.assertIsNone(batch("INSERT INTO t (a) SELECT x FROM (VALUES (%s)) v(x)"))
+        self.assertIsNone(batch("INSERT INTO t (a) VALUES (%s) (%s)"))
+
+
+class BulkCopyTest(unittest.TestCase):
+    def test_bulk_copy(self):
+        con = dbapi.connect(base.connection_string_from_settings())
+        try:
+            cur = con.cursor()
+            cur.execute("CREATE TABLE #bulk_copy (id int IDENTITY, a nvarchar(10) CHECK (a <> 'x'))")
+            result = cur.bulk_copy('#bulk_copy', ['a'], (('v%d' % i,) for i in range(10)), batch_size=3)
+            self.assertEqual(result.rows, 10)
+            self.assertEqual(cur.rowcount, 10)
+
+            cur.bulk_copy('#bulk_copy', ['id', 'a'], [(100, 'x')],
+                check_constraints=False, keep_identity=True)
+            cur.execute("SELECT COUNT(*), MAX(id) FROM #bulk_copy")
+            self.assertEqual(cur.fetchone(), (11, 100))
+
+            with self.assertRaises(dbapi.ProgrammingError):
+                cur.bulk_copy('#bulk_copy', ['a'], [], batch_size=0)
+        finally:
+            con.close()
+
+
+class LazyTransactionTest(unittest.TestCase):
+    def test_begin_on_first_statement(self):
+        con = dbapi.connect(base.connection_string_from_settings(), use_transactions=True)
+        try:
+            self.assertFalse(con._in_transaction)
+            # Nothing to commit or roll back
+            con.commit()
+            con.rollback()
+            self.assertFalse(con._in_transaction)
+
+            cur = con.cursor()
+            cur.execute("SELECT @@TRANCOUNT")
+            self.assertEqual(cur.fetchone()[0], 1)
+            self.assertTrue(con._in_transaction)
+            con.commit()
+            self.assertEqual(con._trancount(), 0)
+
+            cur.execute("CREATE TABLE #lazy_transaction (id int)")
+            con.commit()
+            cur.execute("INSERT INTO #lazy_transaction VALUES (1)")
+            con.rollback()
+            self.assertFalse(con._in_transaction)
+            cur.execute("SELECT COUNT(*) FROM #lazy_transaction")
+            self.assertEqual(cur.fetchone()[0], 0)
+        finally:
+            con.close()
+
+    def test_rollback_after_server_rollback(self):
+        con = dbapi.connect(base.connection_string_from_settings(), use_transactions=True)
+        try:
+            cur = con.cursor()
+            cur.execute("SELECT 1")
+            # The server rolls back the transaction without ADO knowing.
+            cur.execute("IF @@TRANCOUNT > 0 ROLLBACK")
+            con.rollback()
+            self.assertFalse(con._in_transaction)
+        finally:
+            con.close()
+
+    def test_lazy_savepoints(self):
+        con = dbapi.connect(base.connection_string_from_settings(), use_transactions=True)
+        try:
+            cur = con.cursor()
+            cur.execute("CREATE TABLE #lazy_savepoint (id int)")
+            con.savepoint('[a]')
+            con.savepoint('[b]')
+            cur.execute("SELECT COUNT(*) FROM #lazy_savepoint")
+            self.assertEqual(con.pending_savepoints, ['[a]', '[b]'])
+            # Rolling back to a savepoint that wasn't created
+            self.assertTrue(con.discard_savepoint('[b]'))
+            self.assertEqual(con.pending_savepoints, ['[a]'])
+
+            cur.execute("INSERT INTO #lazy_savepoint VALUES (1)")
+            self.assertEqual(con.pending_savepoints, [])
+            self.assertFalse(con.discard_savepoint('[a]'))
+            cur.execute("ROLLBACK TRANSACTION [a]")
+            cur.execute("SELECT COUNT(*) FROM #lazy_savepoint")
+            self.assertEqual(cur.fetchone()[0], 0)
+        finally:
+            con.close()
+
+    def test_read_only(self):
+        self.assertTrue(dbapi._re_read_only.match("SELECT 1"))
+        self.assertTrue(dbapi._re_read_only.match("SELECT [a] FROM [t] WHERE [b] = ?;"))
+        self.assertFalse(dbapi._re_read_only.match("SELECT [a] INTO #t FROM [t]"))
+        self.assertFalse(dbapi._re_read_only.match("SELECT 1; UPDATE [t] SET [a] = 1"))
+        self.assertFalse(dbapi._re_read_only.match("SELECT 1 DELETE FROM [t]"))
+        self.assertFalse(dbapi._re_read_only.match("UPDATE [t] SET [a] = 1"))
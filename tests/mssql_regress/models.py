@@ -1,13 +1,42 @@
-from django.db import models
-
-class AutoPkPlusOne(models.Model):
-    id = models.AutoField(primary_key=True)
-    a = models.IntegerField(null=True)
-
-class PkPlusOne(models.Model):
-    id = models.IntegerField(primary_key=True)
-    a = models.IntegerField(null=True)
-
-class TextPkPlusOne(models.Model):
-    id = models.CharField(primary_key=True, max_length=10)
-    a = models.IntegerField(null=True)
+from django.db import models
+
+from sqlserver_ado.fields import VarCharField
+from sqlserver_ado.models import SqlServerManager
+
+class AutoPkPlusOne(models.Model):
+    id = models.AutoField(primary_key=True)
+    a = models.IntegerField(null=True)
+
+class PkPlusOne(models.Model):
+    id = models.IntegerField(primary_key=True)
+    a = models.IntegerField(null=True)
+
+class TextPkPlusOne(models.Model):
+    id = models.CharField(primary_key=True, max_length=10)
+    a = models.IntegerField(null=True)
+
+class VarCharCode(models.Model):
+    code = VarCharField(max_length=10)
+    name = models.CharField(max_length=10)
+
+class Reading(models.Model):
+    sensor = models.CharField(max_length=20, unique=True)
+    value = models.IntegerField(null=True)
+    score = models.FloatField(default=0)
+
+    objects = SqlServerManager()
+
+class Sensor(models.Model):
+    name = models.CharField(max_length=20)
+
+    class Meta:
+        ordering = ['name']
+
+class SensorReading(models.Model):
+    sensor = models.ForeignKey(Sensor, on_delete=models.CASCADE)
+    value = models.IntegerField()
+
+    objects = SqlServerManager()
+
+class BinaryData(models.Model):
+    data = models.BinaryField(null=True)
@@ -1,134 +1,557 @@
-from __future__ import absolute_import
-
-from django.core.exceptions import ImproperlyConfigured
-from django.db import connection
-from django.test import TestCase
-
-from .models import AutoPkPlusOne, PkPlusOne, TextPkPlusOne
-
-
-class ConnectionStringTestCase(TestCase):
-    def assertInString(self, conn_string, pattern):
-        """
-        Asserts that the pattern is found in the string.
-        """
-        found = conn_string.find(pattern) != -1
-        self.assertTrue(found,
-            "pattern \"%s\" was not found in connection string \"%s\"" % (pattern, conn_string))
-
-    def assertNotInString(self, conn_string, pattern):
-        """
-        Asserts that the pattern is found in the string.
-        """
-        found = conn_string.find(pattern) != -1
-        self.assertFalse(found,
-            "pattern \"%s\" was found in connection string \"%s\"" % (pattern, conn_string))
-
-    def get_conn_string(self, data={}):
-        db_settings = {
-           'NAME': 'db_name',
-           'ENGINE': 'sqlserver_ado',
-           'HOST': 'myhost',
-           'PORT': '',
-           'USER': '',
-           'PASSWORD': '',
-           'OPTIONS' : {
-               'provider': 'SQLOLEDB',
-               'use_mars': True,
-           },
-        }
-        db_settings.update(data)
-        from sqlserver_ado.base import make_connection_string
-        return make_connection_string(db_settings)
-
-    def test_default(self):
-        conn_string = self.get_conn_string()
-        self.assertInString(conn_string, 'Initial Catalog=db_name')
-        self.assertInString(conn_string, '=myhost;')
-        self.assertInString(conn_string, 'Integrated Security=SSPI')
-        self.assertInString(conn_string, 'PROVIDER=SQLOLEDB')
-        self.assertNotInString(conn_string, 'UID=')
-        self.assertNotInString(conn_string, 'PWD=')
-        self.assertInString(conn_string, 'MARS Connection=True')
-
-    def test_require_database_name(self):
-        """Database NAME setting is required"""
-        self.assertRaises(ImproperlyConfigured, self.get_conn_string, {'NAME': ''})
-
-    def test_user_pass(self):
-        """Validate username and password in connection string"""
-        conn_string = self.get_conn_string({'USER': 'myuser', 'PASSWORD': 'mypass'})
-        self.assertInString(conn_string, 'UID=myuser;')
-        self.assertInString(conn_string, 'PWD=mypass;')
-        self.assertNotInString(conn_string, 'Integrated Security=SSPI')
-
-    def test_port_with_host(self):
-        """Test the PORT setting to make sure it properly updates the connection string"""
-        self.assertRaises(ImproperlyConfigured, self.get_conn_string,
-            {'HOST': 'myhost', 'PORT': 1433})
-        self.assertRaises(ImproperlyConfigured, self.get_conn_string, {'HOST': 'myhost', 'PORT': 'a'})
-
-        conn_string = self.get_conn_string({'HOST': '127.0.0.1', 'PORT': 1433})
-        self.assertInString(conn_string, '=127.0.0.1,1433;')
-
-    def test_extra_params(self):
-        """Test extra_params OPTIONS"""
-        extras = 'Some=Extra;Stuff Goes=here'
-        conn_string = self.get_conn_string({'OPTIONS': {'extra_params': extras}})
-        self.assertInString(conn_string, extras)
-
-    def test_host_fqdn_with_port(self):
-        """
-        Issue 21 - FQDN crashed on IP address detection.
-        """
-        with self.assertRaisesRegexp(ImproperlyConfigured, 'DATABASE HOST must be an IP address'):
-            self.get_conn_string(data={
-                'HOST': 'my.fqdn.com',
-                'PORT': '1433',
-            })
-
-class ReturnIdOnInsertWithTriggersTestCase(TestCase):
-    def create_trigger(self, model):
-        """Create a trigger for the provided model"""
-        qn = connection.ops.quote_name
-        table_name = qn(model._meta.db_table)
-        trigger_name = qn('test_trigger_%s' % model._meta.db_table)
-
-        with connection.cursor() as cur:
-            # drop trigger if it exists
-            drop_sql = """
-IF OBJECT_ID(N'[dbo].{trigger}') IS NOT NULL
-    DROP TRIGGER [dbo].{trigger}
-""".format(trigger=trigger_name)
-
-            create_sql = """
-CREATE TRIGGER [dbo].{trigger} ON {tbl} FOR INSERT
-AS UPDATE {tbl} set [a] = 100""".format(
-                trigger=trigger_name,
-                tbl=table_name,
-            )
-
-            cur.execute(drop_sql)
-            cur.execute(create_sql)
-
-    def test_pk(self):
-        self.create_trigger(PkPlusOne)
-        id = 1
-        obj = PkPlusOne.objects.create(id=id)
-        self.assertEqual(obj.pk, id)
-        self.assertEqual(PkPlusOne.objects.get(pk=id).a, 100)
-
-    def test_auto_pk(self):
-        self.create_trigger(AutoPkPlusOne)
-        id = 1
-        obj = AutoPkPlusOne.objects.create()
-        self.assertEqual(obj.pk, id)
-        self.assertEqual(AutoPkPlusOne.objects.get(pk=id).a, 100)
-
-    def test_text_pk(self):
-        self.create_trigger(TextPkPlusOne)
-        id = 'asdf'
-        obj = TextPkPlusOne.objects.create(id=id)
-        self.assertEqual(obj.pk, id)
-        self.assertEqual(TextPkPlusOne.objects.get(pk=id).a, 100)
-
+from __future__ import absolute_import
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.transaction import TransactionManagementError
+from django.db.models import F
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from sqlserver_ado.compiler import TABLE_HINTS
+from sqlserver_ado.dbapi import AnsiString
+from sqlserver_ado.transaction import database_durability, delayed_durability
+
+from .models import (
+    AutoPkPlusOne, BinaryData, PkPlusOne, Reading, Sensor, SensorReading,
+    TextPkPlusOne, VarCharCode,
+)
+
+
+class ConnectionStringTestCase(TestCase):
+    def assertInString(self, conn_string, pattern):
+        """
+        Asserts that the pattern is found in the string.
+        """
+        found = conn_string.find(pattern) != -1
+        self.assertTrue(found,
+            "pattern \"%s\" was not found in connection string \"%s\"" % (pattern, conn_string))
+
+    def assertNotInString(self, conn_string, pattern):
+        """
+        Asserts that the pattern is found in the string.
+        """
+        found = conn_string.find(pattern) != -1
+        self.assertFalse(found,
+            "pattern \"%s\" was found in connection string \"%s\"" % (pattern, conn_string))
+
+    def get_conn_string(self, data={}):
+        db_settings = {
+           'NAME': 'db_name',
+           'ENGINE': 'sqlserver_ado',
+           'HOST': 'myhost',
+           'PORT': '',
+           'USER': '',
+           'PASSWORD': '',
+           'OPTIONS' : {
+               'provider': 'SQLOLEDB',
+               'use_mars': True,
+           },
+        }
+        db_settings.update(data)
+        from sqlserver_ado.base import make_connection_string
+        return make_connection_string(db_settings)
+
+    def test_default(self):
+        conn_string = self.get_conn_string()
+        self.assertInString(conn_string, 'Initial Catalog=db_name')
+        self.assertInString(conn_string, '=myhost;')
+        self.assertInString(conn_string, 'Integrated Security=SSPI')
+        self.assertInString(conn_string, 'PROVIDER=SQLOLEDB')
+        self.assertNotInString(conn_string, 'UID=')
+        self.assertNotInString(conn_string, 'PWD=')
+        self.assertInString(conn_string, 'MARS Connection=True')
+
+    def test_require_database_name(self):
+        """Database NAME setting is required"""
+        self.assertRaises(ImproperlyConfigured, self.get_conn_string, {'NAME': ''})
+
+    def test_user_pass(self):
+        """Validate username and password in connection string"""
+        conn_string = self.get_conn_string({'USER': 'myuser', 'PASSWORD': 'mypass'})
+        self.assertInString(conn_string, 'UID=myuser;')
+        self.assertInString(conn_string, 'PWD=mypass;')
+        self.assertNotInString(conn_string, 'Integrated Security=SSPI')
+
+    def test_port_with_host(self):
+        """Test the PORT setting to make sure it properly updates the connection string"""
+        self.assertRaises(ImproperlyConfigured, self.get_conn_string,
+            {'HOST': 'myhost', 'PORT': 1433})
+        self.assertRaises(ImproperlyConfigured, self.get_conn_string, {'HOST': 'myhost', 'PORT': 'a'})
+
+        conn_string = self.get_conn_string({'HOST': '127.0.0.1', 'PORT': 1433})
+        self.assertInString(conn_string, '=127.0.0.1,1433;')
+
+    def test_extra_params(self):
+        """Test extra_params OPTIONS"""
+        extras = 'Some=Extra;Stuff Goes=here'
+        conn_string = self.get_conn_string({'OPTIONS': {'extra_params': extras}})
+        self.assertInString(conn_string, extras)
+
+    def test_host_fqdn_with_port(self):
+        """
+        Issue 21 - FQDN crashed on IP address detection.
+        """
+        with self.assertRaisesRegexp(ImproperlyConfigured, 'DATABASE HOST must be an IP address'):
+            self.get_conn_string(data={
+                'HOST': 'my.fqdn.com',
+                'PORT': '1433',
+            })
+
+class ReturnIdOnInsertWithTriggersTestCase(TestCase):
+    def create_trigger(self, model):
+        """Create a trigger for the provided model"""
+        qn = connection.ops.quote_name
+        table_name = qn(model._meta.db_table)
+        trigger_name = qn('test_trigger_%s' % model._meta.db_table)
+
+        with connection.cursor() as cur:
+            # drop trigger if it exists
+            drop_sql = """
+IF OBJECT_ID(N'[dbo].{trigger}') IS NOT NULL
+    DROP TRIGGER [dbo].{trigger}
+""".format(trigger=trigger_name)
+
+            create_sql = """
+CREATE TRIGGER [dbo].{trigger} ON {tbl} FOR INSERT
+AS UPDATE {tbl} set [a] = 100""".format(
+                trigger=trigger_name,
+                tbl=table_name,
+            )
+
+            cur.execute(drop_sql)
+            cur.execute(create_sql)
+
+    def test_pk(self):
+        self.create_trigger(PkPlusOne)
+        id = 1
+        obj = PkPlusOne.objects.create(id=id)
+        self.assertEqual(obj.pk, id)
+        self.assertEqual(PkPlusOne.objects.get(pk=id).a, 100)
+
+    def test_auto_pk(self):
+        self.create_trigger(AutoPkPlusOne)
+        id = 1
+        obj = AutoPkPlusOne.objects.create()
+        self.assertEqual(obj.pk, id)
+        self.assertEqual(AutoPkPlusOne.objects.get(pk=id).a, 100)
+
+    def test_text_pk(self):
+        self.create_trigger(TextPkPlusOne)
+        id = 'asdf'
+        obj = TextPkPlusOne.objects.create(id=id)
+        self.assertEqual(obj.pk, id)
+        self.assertEqual(TextPkPlusOne.objects.get(pk=id).a, 100)
+
+
+
+class AnsiStringParamsTestCase(TestCase):
+    def test_lookup_params(self):
+        qs = VarCharCode.objects.filter(code='a', name='b', code__in=['c', 'd'])
+        sql, params = qs.query.get_compiler(connection=connection).as_sql()
+        self.assertEqual(
+            [isinstance(p, AnsiString) for p in params],
+            [True, False, True, True])
+
+    def test_subquery_params_unchanged(self):
+        qs = VarCharCode.objects.filter(code__in=VarCharCode.objects.filter(name='x').values('code'))
+        sql, params = qs.query.get_compiler(connection=connection).as_sql()
+        self.assertNotIsInstance(params[0], AnsiString)
+
+    def test_roundtrip(self):
+        VarCharCode.objects.create(code='abc', name='def')
+        obj = VarCharCode.objects.get(code='abc')
+        self.assertEqual(obj.name, 'def')
+        self.assertEqual(VarCharCode.objects.filter(code='abc').update(code='xyz'), 1)
+        self.assertTrue(VarCharCode.objects.filter(code='xyz').exists())
+
+
+class TypedParametersTestCase(TestCase):
+    def setUp(self):
+        connection.ensure_connection()
+        self.addCleanup(setattr, connection.connection, 'typed_parameters',
+            connection.connection.typed_parameters)
+        connection.connection.typed_parameters = True
+
+    def test_null_binary(self):
+        obj = BinaryData.objects.create(data=None)
+        BinaryData.objects.filter(pk=obj.pk).update(data=b'abc')
+        BinaryData.objects.filter(pk=obj.pk).update(data=None)
+        self.assertIsNone(BinaryData.objects.get().data)
+
+    def test_save_null_binary(self):
+        obj = BinaryData.objects.create(data=b'abc')
+        obj.data = None
+        obj.save()
+        self.assertIsNone(BinaryData.objects.get().data)
+        obj.data = b'def'
+        obj.save()
+        self.assertEqual(bytes(BinaryData.objects.get().data), b'def')
+
+
+class ValuesColumnsTestCase(TestCase):
+    def setUp(self):
+        Reading.objects.create(sensor='a', value=1, score=0.5)
+        Reading.objects.create(sensor='b', value=None, score=1.5)
+
+    def test_values_columns(self):
+        columns = Reading.objects.order_by('sensor').values_columns('sensor', 'value', 'score')
+        self.assertEqual(list(columns), ['sensor', 'value', 'score'])
+        self.assertEqual(list(columns['sensor']), ['a', 'b'])
+        # Columns with NULLs are lists, other numeric columns are arrays
+        self.assertEqual(columns['value'], [1, None])
+        self.assertEqual(list(columns['score']), [0.5, 1.5])
+        self.assertNotIsInstance(columns['score'], list)
+
+    def test_values_columns_option_hints(self):
+        with CaptureQueriesContext(connection) as captured:
+            columns = Reading.objects.with_hints(option='MAXDOP 1').order_by('sensor').values_columns('sensor')
+        self.assertEqual(list(columns['sensor']), ['a', 'b'])
+        self.assertIn('OPTION (MAXDOP 1)', captured.captured_queries[0]['sql'])
+
+    def test_values_columns_empty(self):
+        columns = Reading.objects.filter(pk__in=[]).values_columns('sensor')
+        self.assertEqual(dict(columns), {'sensor': []})
+
+
+class IteratorTestCase(TestCase):
+    def test_iterator_chunk_size(self):
+        for i in range(5):
+            Reading.objects.create(sensor='s%d' % i, value=i)
+        values = [r.value for r in Reading.objects.order_by('value').iterator(chunk_size=2)]
+        self.assertEqual(values, [0, 1, 2, 3, 4])
+
+    def test_iterator_not_streamed_by_default(self):
+        with connection.chunked_cursor() as cursor:
+            self.assertIsNone(cursor.cursor.stream_cache_size)
+
+    def test_iterator_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            Reading.objects.iterator(chunk_size=0)
+
+
+class BulkLoadTestCase(TestCase):
+    def test_bulk_load_generator(self):
+        objs = (Reading(sensor='s%d' % i, value=i) for i in range(2500))
+        result = Reading.objects.bulk_load(objs, tablock=True)
+        self.assertEqual(result.rows, 2500)
+        self.assertGreater(result.rows_per_second, 0)
+        self.assertEqual(Reading.objects.count(), 2500)
+        self.assertEqual(Reading.objects.get(sensor='s42').value, 42)
+
+    def test_bulk_load_with_pk(self):
+        Reading.objects.bulk_load([Reading(pk=100, sensor='a'), Reading(pk=200, sensor='b')])
+        self.assertEqual(
+            list(Reading.objects.order_by('pk').values_list('pk', 'sensor')),
+            [(100, 'a'), (200, 'b')],
+        )
+
+    def test_bulk_load_mixed_pks(self):
+        objs = [Reading(sensor='a'), Reading(pk=100, sensor='b'), Reading(sensor='c')]
+        self.assertEqual(Reading.objects.bulk_load(objs).rows, 3)
+        self.assertEqual(Reading.objects.get(sensor='b').pk, 100)
+        self.assertEqual(Reading.objects.filter(sensor__in=['a', 'c']).count(), 2)
+
+    def test_bulk_load_empty(self):
+        self.assertEqual(Reading.objects.bulk_load(iter([])).rows, 0)
+
+
+class BulkCreateReturnIdsTestCase(TestCase):
+    def test_pks_in_input_order(self):
+        objs = AutoPkPlusOne.objects.bulk_create([AutoPkPlusOne(a=i) for i in range(2500)])
+        self.assertTrue(all(obj.pk is not None for obj in objs))
+        self.assertEqual(
+            dict(AutoPkPlusOne.objects.values_list('pk', 'a')),
+            dict((obj.pk, obj.a) for obj in objs),
+        )
+
+    def test_null_column(self):
+        objs = AutoPkPlusOne.objects.bulk_create([AutoPkPlusOne(), AutoPkPlusOne()])
+        self.assertEqual(len(set(obj.pk for obj in objs)), 2)
+        self.assertEqual(AutoPkPlusOne.objects.filter(a__isnull=True).count(), 2)
+
+
+class BulkUpsertTestCase(TestCase):
+    def test_bulk_upsert(self):
+        existing = Reading.objects.create(sensor='a', value=1, score=0.5)
+        objs = [Reading(sensor='b', value=20), Reading(sensor='a', value=10, score=2)]
+        pks = Reading.objects.bulk_upsert(objs, ['sensor'], ['value'], return_pks=True)
+        self.assertEqual(pks, [Reading.objects.get(sensor='b').pk, existing.pk])
+        self.assertEqual([obj.pk for obj in objs], pks)
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.value, 10)
+        # Only update_fields are updated
+        self.assertEqual(existing.score, 0.5)
+
+    def test_bulk_upsert_without_update_fields(self):
+        existing = Reading.objects.create(sensor='a', value=1)
+        objs = [Reading(sensor='b', value=20), Reading(sensor='a', value=10)]
+        pks = Reading.objects.bulk_upsert(objs, ['sensor'], [], return_pks=True)
+        self.assertEqual(pks, [Reading.objects.get(sensor='b').pk, existing.pk])
+        self.assertEqual([obj.pk for obj in objs], pks)
+        self.assertEqual(Reading.objects.get(sensor='a').value, 1)
+
+    def test_bulk_upsert_batches(self):
+        Reading.objects.create(sensor='s0', value=-1)
+        objs = [Reading(sensor='s%d' % i, value=i) for i in range(1500)]
+        self.assertEqual(Reading.objects.bulk_upsert(objs, ['sensor'], batch_size=400), 1500)
+        self.assertEqual(Reading.objects.count(), 1500)
+        self.assertEqual(Reading.objects.get(sensor='s0').value, 0)
+
+    def test_bulk_upsert_batch_size_over_parameter_limit(self):
+        objs = [Reading(sensor='s%d' % i, value=i) for i in range(1500)]
+        # One batch of 1500 objects would have 4500 parameters
+        self.assertEqual(Reading.objects.bulk_upsert(objs, ['sensor'], batch_size=1500), 1500)
+        self.assertEqual(Reading.objects.count(), 1500)
+
+
+class BulkUpdateTestCase(TestCase):
+    def test_bulk_update(self):
+        readings = [Reading.objects.create(sensor='s%d' % i, value=i) for i in range(5)]
+        for reading in readings:
+            reading.value = None if reading.value == 0 else reading.value * 10
+            reading.score = 1.5
+        self.assertEqual(Reading.objects.bulk_update(readings, ['value', 'score'], batch_size=2), 5)
+        self.assertEqual(
+            list(Reading.objects.order_by('sensor').values_list('value', 'score')),
+            [(None, 1.5), (10, 1.5), (20, 1.5), (30, 1.5), (40, 1.5)],
+        )
+
+    def test_bulk_update_only_fields(self):
+        reading = Reading.objects.create(sensor='a', value=1)
+        reading.value = 2
+        reading.sensor = 'b'
+        self.assertEqual(Reading.objects.bulk_update([reading], ['value']), 1)
+        self.assertEqual(Reading.objects.values_list('sensor', 'value').get(), ('a', 2))
+
+    def test_bulk_update_errors(self):
+        with self.assertRaises(ValueError):
+            Reading.objects.bulk_update([Reading(sensor='a')], ['value'])
+        with self.assertRaises(ValueError):
+            Reading.objects.bulk_update([], ['id'])
+
+
+class SeekAfterTestCase(TestCase):
+    def setUp(self):
+        for i, value in enumerate([3, 1, 2, 1, 3, 2, 1]):
+            Reading.objects.create(sensor='s%d' % i, value=value)
+
+    def test_seek_after(self):
+        qs = Reading.objects.order_by('value', '-sensor')
+        expected = list(qs.values_list('sensor', flat=True))
+        pages = []
+        page = list(qs[:3])
+        while page:
+            pages.append([r.sensor for r in page])
+            page = list(qs.seek_after(page[-1])[:3])
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_seek_after_values(self):
+        qs = Reading.objects.order_by('-value', 'pk')
+        last = qs[1]
+        self.assertEqual(list(qs.seek_after(last.value, last.pk)), list(qs[2:]))
+
+    def test_seek_after_errors(self):
+        with self.assertRaises(ValueError):
+            Reading.objects.all().seek_after(1)
+        with self.assertRaises(ValueError):
+            Reading.objects.order_by('value', 'pk').seek_after(1)
+        with self.assertRaises(ValueError):
+            Reading.objects.order_by('value', 'pk').seek_after(None, 1)
+
+    def test_seek_after_columns_only(self):
+        sensor = Sensor.objects.create(name='b')
+        reading = SensorReading.objects.create(sensor=sensor, value=1)
+        # Ordered by the related model's ordering, not the sensor_id column
+        with self.assertRaises(ValueError):
+            SensorReading.objects.order_by('sensor', 'pk').seek_after(reading)
+        with self.assertRaises(ValueError):
+            SensorReading.objects.order_by('sensor__name', 'pk').seek_after(reading)
+        with self.assertRaises(ValueError):
+            SensorReading.objects.order_by(F('value').asc(), 'pk').seek_after(reading)
+        qs = SensorReading.objects.order_by('sensor_id', 'pk')
+        self.assertEqual(list(qs.seek_after(sensor.pk, 0)), [reading])
+        self.assertEqual(list(qs.seek_after(reading)), [])
+
+
+class WithHintsTestCase(TestCase):
+    def test_table_and_option_hints(self):
+        Reading.objects.create(sensor='a', value=1)
+        qs = Reading.objects.with_hints('NOLOCK', option=['RECOMPILE', 'MAXDOP 1'])
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual([r.sensor for r in qs.filter(value=1)], ['a'])
+        sql = captured.captured_queries[0]['sql']
+        self.assertIn('[%s] WITH (NOLOCK)' % Reading._meta.db_table, sql)
+        self.assertTrue(sql.endswith(' OPTION (RECOMPILE, MAXDOP 1)'), sql)
+
+    def test_subquery_hints(self):
+        Reading.objects.create(sensor='a', value=1)
+        inner = Reading.objects.with_hints({Reading: 'NOLOCK'}, option='RECOMPILE')
+        qs = Reading.objects.filter(pk__in=inner.values('pk')).order_by('sensor')[:1]
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(len(qs), 1)
+        sql = captured.captured_queries[0]['sql']
+        self.assertEqual(sql.count('WITH (NOLOCK)'), 1)
+        # OPTION is only valid at the end of the statement
+        self.assertNotIn('OPTION', sql)
+
+    def test_outer_hints_not_in_subquery(self):
+        Reading.objects.create(sensor='a', value=1)
+        inner = Reading.objects.values('pk')
+        qs = Reading.objects.with_hints({Reading: 'NOLOCK'}).filter(pk__in=inner)
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(len(qs), 1)
+        sql = captured.captured_queries[0]['sql']
+        self.assertEqual(sql.count('WITH (NOLOCK)'), 1)
+        self.assertLess(sql.index('WITH (NOLOCK)'), sql.index('IN (SELECT'))
+
+    def test_hints_are_cloned(self):
+        qs = Reading.objects.with_hints('NOLOCK')
+        self.assertEqual(qs.with_hints('FORCESEEK').filter(value=1).query.context[TABLE_HINTS],
+            {Reading._meta.db_table: ('NOLOCK', 'FORCESEEK')})
+        self.assertEqual(qs.query.context[TABLE_HINTS], {Reading._meta.db_table: ('NOLOCK',)})
+
+
+class SelectForUpdateTestCase(TestCase):
+    def assertLockHints(self, qs, hints):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual([r.sensor for r in qs], ['a'])
+        self.assertIn('[%s] WITH (%s)' % (Reading._meta.db_table, hints),
+            captured.captured_queries[0]['sql'])
+
+    def test_select_for_update(self):
+        Reading.objects.create(sensor='a', value=1)
+        self.assertLockHints(Reading.objects.select_for_update(), 'UPDLOCK, ROWLOCK')
+        self.assertLockHints(Reading.objects.select_for_update(skip_locked=True)[:1],
+            'UPDLOCK, ROWLOCK, READPAST')
+        self.assertLockHints(Reading.objects.select_for_update(nowait=True).filter(value=1),
+            'UPDLOCK, ROWLOCK, NOWAIT')
+
+
+class DequeueTestCase(TestCase):
+    def test_dequeue(self):
+        for i, value in enumerate([5, 3, 4, 1, 2]):
+            Reading.objects.create(sensor='s%d' % i, value=value, score=i)
+        readings = Reading.objects.filter(value__gt=1).order_by('value').dequeue(2)
+        self.assertEqual(sorted((r.sensor, r.value, r.score) for r in readings),
+            [('s1', 3, 1.0), ('s4', 2, 4.0)])
+        self.assertFalse(any(r._state.adding for r in readings))
+        self.assertEqual(sorted(Reading.objects.values_list('value', flat=True)), [1, 4, 5])
+
+        self.assertEqual(len(Reading.objects.dequeue()), 1)
+        self.assertEqual(Reading.objects.count(), 2)
+        self.assertEqual(Reading.objects.filter(value__gt=10).dequeue(5), [])
+        self.assertEqual(Reading.objects.none().dequeue(5), [])
+
+    def test_with_triggers(self):
+        connection.ops.table_triggers.clear()
+        self.addCleanup(connection.ops.table_triggers.clear)
+        table = connection.ops.quote_name(Reading._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TRIGGER [regress_reading_trigger] ON %s AFTER DELETE AS '
+                'UPDATE %s SET [value] = [value] WHERE 1 = 0' % (table, table))
+        Reading.objects.create(sensor='a', value=1, score=2)
+        with CaptureQueriesContext(connection) as captured:
+            readings = Reading.objects.dequeue()
+        self.assertEqual([(r.sensor, r.value, r.score) for r in readings], [('a', 1, 2.0)])
+        self.assertIn('@sqlserver_ado_dequeued', captured.captured_queries[0]['sql'])
+        self.assertFalse(Reading.objects.exists())
+
+    def test_select_for_update(self):
+        Reading.objects.create(sensor='a', value=1)
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(len(Reading.objects.select_for_update(skip_locked=True).dequeue()), 1)
+        sql = captured.captured_queries[-1]['sql']
+        self.assertEqual(sql.count('UPDLOCK'), 1)
+        self.assertEqual(sql.count('READPAST'), 2)
+
+
+class InsertReturnIdTestCase(TestCase):
+    def setUp(self):
+        connection.ops.table_triggers.clear()
+        self.addCleanup(connection.ops.table_triggers.clear)
+
+    def create(self):
+        with CaptureQueriesContext(connection) as captured:
+            obj = AutoPkPlusOne.objects.create(a=1)
+        self.assertEqual(AutoPkPlusOne.objects.get(a=1).pk, obj.pk)
+        AutoPkPlusOne.objects.all().delete()
+        self.assertEqual(len(captured.captured_queries), 1)
+        return captured.captured_queries[0]['sql']
+
+    def test_without_triggers(self):
+        self.assertNotIn('@sqlserver_ado_return_id', self.create())
+        self.assertFalse(connection.ops.table_triggers[AutoPkPlusOne._meta.db_table])
+
+    def test_with_triggers(self):
+        table = connection.ops.quote_name(AutoPkPlusOne._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TRIGGER [regress_autopk_trigger] ON %s AFTER INSERT AS '
+                'UPDATE %s SET [a] = [a] WHERE 1 = 0' % (table, table))
+        self.assertIn('@sqlserver_ado_return_id', self.create())
+
+    def test_trigger_created_after_cache(self):
+        self.create()
+        self.assertFalse(connection.ops.table_triggers[AutoPkPlusOne._meta.db_table])
+        table = connection.ops.quote_name(AutoPkPlusOne._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'CREATE TRIGGER [regress_autopk_trigger] ON %s AFTER INSERT AS '
+                'UPDATE %s SET [a] = [a] WHERE 1 = 0' % (table, table))
+        obj = AutoPkPlusOne.objects.create(a=2)
+        self.assertEqual(AutoPkPlusOne.objects.get(a=2).pk, obj.pk)
+        self.assertTrue(connection.ops.table_triggers[AutoPkPlusOne._meta.db_table])
+
+
+class DelayedDurabilityTestCase(TransactionTestCase):
+    available_apps = ['mssql_regress']
+
+    def test_database_durability(self):
+        self.assertIn(database_durability(), ['DISABLED', 'ALLOWED', 'FORCED'])
+
+    def test_commit(self):
+        with delayed_durability():
+            Reading.objects.create(sensor='a', value=1)
+            self.assertTrue(connection.connection._delayed_transaction)
+        self.assertFalse(connection.connection._in_transaction)
+        self.assertFalse(connection.connection.delayed_durability)
+        self.assertEqual(Reading.objects.get().value, 1)
+
+    def test_rollback(self):
+        with self.assertRaises(ValueError):
+            with delayed_durability():
+                Reading.objects.create(sensor='a', value=1)
+                raise ValueError
+        self.assertFalse(Reading.objects.exists())
+
+    def test_open_transaction(self):
+        transaction.set_autocommit(False)
+        try:
+            Reading.objects.create(sensor='a', value=1)
+            with self.assertRaises(TransactionManagementError):
+                with delayed_durability():
+                    pass
+            self.assertFalse(connection.connection.delayed_durability)
+        finally:
+            transaction.rollback()
+            transaction.set_autocommit(True)
+        self.assertFalse(Reading.objects.exists())
+
+
+class LazySavepointTestCase(TestCase):
+    def test_num_queries(self):
+        # SAVE TRANSACTION, SELECT and RELEASE, as if the savepoint was created
+        with self.assertNumQueries(3):
+            with transaction.atomic():
+                Reading.objects.count()
+        # ROLLBACK TRANSACTION too
+        with self.assertNumQueries(4):
+            try:
+                with transaction.atomic():
+                    Reading.objects.count()
+                    raise ValueError
+            except ValueError:
+                pass
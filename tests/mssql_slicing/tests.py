@@ -1,87 +1,149 @@
-from __future__ import absolute_import
-
-from django.core.paginator import Paginator
-from django.db.models import Q
-from django.test import TestCase
-
-from .models import DistinctTable, ItemGroup, Item
-
-class DistinctTestCase(TestCase):
-    def setUp(self):
-        DistinctTable(s='abc').save()
-        DistinctTable(s='abc').save()
-        DistinctTable(s='abc').save()
-        DistinctTable(s='def').save()
-        DistinctTable(s='def').save()
-        DistinctTable(s='fgh').save()
-        DistinctTable(s='fgh').save()
-        DistinctTable(s='fgh').save()
-        DistinctTable(s='fgh').save()
-        DistinctTable(s='ijk').save()
-        DistinctTable(s='ijk').save()
-        DistinctTable(s='xyz').save()
-
-    def testLimitDistinct(self):
-
-        baseQ = DistinctTable.objects.values_list('s', flat=True).distinct()
-
-        stuff = list(baseQ)
-        self.assertEquals(len(stuff), 5)
-
-        stuff = list(baseQ[:2])
-        self.assertEquals(stuff, ['abc', 'def'])
-
-        stuff = list(baseQ[3:])
-        self.assertEquals(stuff, ['ijk', 'xyz'])
-
-        stuff = list(baseQ[2:4])
-        self.assertEquals(stuff, ['fgh', 'ijk'])
-
-    def testUnusedDistinct(self):
-
-        baseQ = DistinctTable.objects.distinct()
-
-        stuff = list(baseQ)
-        self.assertEquals(len(stuff), 12)
-
-        stuff = list(baseQ[:2])
-        self.assertEquals(
-            [o.s for o in stuff],
-            ['abc', 'abc'])
-
-        stuff = list(baseQ[3:])
-        self.assertEquals(
-            [o.s for o in stuff],
-            ['def', 'def', 'fgh', 'fgh', 'fgh', 'fgh', 'ijk', 'ijk', 'xyz'])
-
-        stuff = list(baseQ[2:4])
-        self.assertEquals(
-            [o.s for o in stuff],
-            ['abc', 'def'])
-
-
-class SlicingRegressionTests(TestCase):
-    def test_order_from_foreign_key(self):
-        """
-        Page a query that is ordered by a column from the foreign key.
-        """
-        group1 = ItemGroup.objects.create(name='group1')
-        group1.items.create(name='g1 item1')
-        group1.items.create(name='g1 item2')
-        group1.items.create(name='g1 item3')
-        group2 = ItemGroup.objects.create(name='group2')
-        group2.items.create(name='g2 item1')
-        group2.items.create(name='g2 item2')
-        group3 = ItemGroup.objects.create(name='group3')
-        group3.items.create(name='g3 item1')
-        group3.items.create(name='g3 item1')
-
-        qs = Item.objects.filter(
-            Q(name__icontains='item')
-        )[5:7]
-
-
-        self.assertEqual(2, len(qs))
-        for item in qs:
-            self.assertTrue(item.name.startswith('g3'))
-
+from __future__ import absolute_import
+
+from django.core.paginator import Paginator
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase
+
+from .models import DistinctTable, ItemGroup, Item
+
+class DistinctTestCase(TestCase):
+    def setUp(self):
+        DistinctTable(s='abc').save()
+        DistinctTable(s='abc').save()
+        DistinctTable(s='abc').save()
+        DistinctTable(s='def').save()
+        DistinctTable(s='def').save()
+        DistinctTable(s='fgh').save()
+        DistinctTable(s='fgh').save()
+        DistinctTable(s='fgh').save()
+        DistinctTable(s='fgh').save()
+        DistinctTable(s='ijk').save()
+        DistinctTable(s='ijk').save()
+        DistinctTable(s='xyz').save()
+
+    def testLimitDistinct(self):
+
+        baseQ = DistinctTable.objects.values_list('s', flat=True).distinct()
+
+        stuff = list(baseQ)
+        self.assertEquals(len(stuff), 5)
+
+        stuff = list(baseQ[:2])
+        self.assertEquals(stuff, ['abc', 'def'])
+
+        stuff = list(baseQ[3:])
+        self.assertEquals(stuff, ['ijk', 'xyz'])
+
+        stuff = list(baseQ[2:4])
+        self.assertEquals(stuff, ['fgh', 'ijk'])
+
+    def testUnusedDistinct(self):
+
+        baseQ = DistinctTable.objects.distinct()
+
+        stuff = list(baseQ)
+        self.assertEquals(len(stuff), 12)
+
+        stuff = list(baseQ[:2])
+        self.assertEquals(
+            [o.s for o in stuff],
+            ['abc', 'abc'])
+
+        stuff = list(baseQ[3:])
+        self.assertEquals(
+            [o.s for o in stuff],
+            ['def', 'def', 'fgh', 'fgh', 'fgh', 'fgh', 'ijk', 'ijk', 'xyz'])
+
+        stuff = list(baseQ[2:4])
+        self.assertEquals(
+            [o.s for o in stuff],
+            ['abc', 'def'])
+
+
+class SlicingRegressionTests(TestCase):
+    def test_order_from_foreign_key(self):
+        """
+        Page a query that is ordered by a column from the foreign key.
+        """
+        group1 = ItemGroup.objects.create(name='group1')
+        group1.items.create(name='g1 item1')
+        group1.items.create(name='g1 item2')
+        group1.items.create(name='g1 item3')
+        group2 = ItemGroup.objects.create(name='group2')
+        group2.items.create(name='g2 item1')
+        group2.items.create(name='g2 item2')
+        group3 = ItemGroup.objects.create(name='group3')
+        group3.items.create(name='g3 item1')
+        group3.items.create(name='g3 item1')
+
+        qs = Item.objects.filter(
+            Q(name__icontains='item')
+        )[5:7]
+
+
+        self.assertEqual(2, len(qs))
+        for item in qs:
+            self.assertTrue(item.name.startswith('g3'))
+
+
+class TopTestCase(TestCase):
+    def sql(self, qs):
+        return qs.query.get_compiler(connection=connection).as_sql()[0]
+
+    def test_unordered_slice_uses_top(self):
+        sql = self.sql(DistinctTable.objects.all()[:2])
+        self.assertTrue(sql.startswith('SELECT TOP (%s) '), sql)
+        self.assertNotIn('ORDER BY', sql)
+
+        sql = self.sql(DistinctTable.objects.values('s').distinct()[:2])
+        self.assertTrue(sql.startswith('SELECT DISTINCT TOP (%s) '), sql)
+
+    def test_top_parameter(self):
+        qs = DistinctTable.objects.filter(s__gt='a')
+        sql2, params2 = qs[:2].query.get_compiler(connection=connection).as_sql()
+        sql5, params5 = qs[:5].query.get_compiler(connection=connection).as_sql()
+        self.assertEqual(sql2, sql5)
+        self.assertEqual(params2, (2, 'a'))
+        self.assertEqual(params5, (5, 'a'))
+
+    def test_ordered_or_offset_slice_uses_offset(self):
+        sql = self.sql(DistinctTable.objects.order_by('s')[:2])
+        self.assertIn('OFFSET %s ROWS FETCH NEXT %s ROWS ONLY', sql)
+        self.assertNotIn('TOP', sql)
+
+        sql = self.sql(DistinctTable.objects.all()[1:3])
+        self.assertIn('ORDER BY 1 OFFSET %s ROWS FETCH NEXT %s ROWS ONLY', sql)
+
+    def test_top_results(self):
+        for s in 'abc':
+            DistinctTable.objects.create(s=s)
+        self.assertEqual(len(DistinctTable.objects.all()[:2]), 2)
+        self.assertTrue(DistinctTable.objects.filter(s='b').exists())
+        self.assertFalse(DistinctTable.objects.filter(s='z').exists())
+
+
+class OffsetParametersTestCase(TestCase):
+    def setUp(self):
+        for s in 'abcdef':
+            DistinctTable.objects.create(s=s)
+
+    def test_pages_share_statement(self):
+        qs = DistinctTable.objects.order_by('s')
+        page1 = qs[1:3].query.get_compiler(connection=connection).as_sql()
+        page2 = qs[3:6].query.get_compiler(connection=connection).as_sql()
+        self.assertEqual(page1[0], page2[0])
+        self.assertEqual(page1[1][-2:], (1, 2))
+        self.assertEqual(page2[1][-2:], (3, 3))
+        self.assertEqual([o.s for o in qs[3:6]], ['d', 'e', 'f'])
+        self.assertEqual([o.s for o in qs[4:]], ['e', 'f'])
+
+    def test_optimize_paging_for_unknown(self):
+        qs = DistinctTable.objects.filter(
+            pk__in=DistinctTable.objects.order_by('s').values('pk')[1:5]
+        ).order_by('-s')[1:3]
+        connection.optimize_paging_for_unknown = True
+        try:
+            self.assertEqual([o.s for o in qs], ['d', 'c'])
+        finally:
+            connection.optimize_paging_for_unknown = False